@@ -0,0 +1,65 @@
+"""Compare namespace lookups per second of a linear prefix scan and `PrefixTrie`.
+
+Usage:
+
+    python benchmarks/curie_lookup.py [prefixes]
+"""
+import random
+import sys
+import time
+
+from linkeddata_api.domain.prefix_trie import PrefixTrie
+
+
+def make_prefixes(count: int) -> dict[str, str]:
+    prefixes = {}
+    for i in range(count):
+        host = f"https://vocab{i % 200}.example.org/"
+        prefixes[f"{host}def/{i}/"] = f"p{i}"
+        if i % 10 == 0:
+            # A shorter namespace that would also match the longer one.
+            prefixes[host] = f"h{i}"
+    return prefixes
+
+
+def linear_scan(prefixes: dict[str, str], uri: str):
+    # The lookup of `domain.curie.get` before the trie.
+    for namespace, prefix in prefixes.items():
+        if uri.startswith(namespace):
+            return namespace, prefix
+    return None
+
+
+def lookups_per_second(func, uris: list[str], seconds: float = 1.0) -> float:
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        for uri in uris:
+            func(uri)
+        count += len(uris)
+    return count / (time.perf_counter() - start)
+
+
+def main(count: int) -> None:
+    prefixes = make_prefixes(count)
+    trie = PrefixTrie(prefixes)
+
+    random.seed(1)
+    namespaces = list(prefixes)
+    uris = [f"{random.choice(namespaces)}Term{i}" for i in range(1000)]
+    uris += [f"https://unknown.example.net/def/Term{i}" for i in range(100)]
+
+    wrong = sum(
+        linear_scan(prefixes, uri) != trie.longest_match(uri) for uri in uris
+    )
+
+    print(f"{len(prefixes)} prefixes, {len(uris)} URIs")
+    scan_rate = lookups_per_second(lambda uri: linear_scan(prefixes, uri), uris)
+    trie_rate = lookups_per_second(trie.longest_match, uris)
+    print(f"linear scan: {scan_rate:>12,.0f} lookups/s")
+    print(f"trie:        {trie_rate:>12,.0f} lookups/s")
+    print(f"linear scan returned a shorter namespace for {wrong} URIs")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
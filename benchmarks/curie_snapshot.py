@@ -0,0 +1,52 @@
+"""Compare shortening URIs with the bundled prefix snapshot to the external service.
+
+Times loading the snapshot, lookups of namespaces that are only in the snapshot,
+and one call to the external service that was made in the request before.
+
+Usage:
+
+    python benchmarks/curie_snapshot.py
+"""
+import time
+
+import requests
+
+from linkeddata_api.domain import curie
+from linkeddata_api.domain.prefix_trie import PrefixTrie
+
+
+def main() -> None:
+    start = time.perf_counter()
+    snapshot = curie.read_snapshot(curie.snapshot_path)
+    trie = PrefixTrie(snapshot)
+    load_ms = (time.perf_counter() - start) * 1000
+    print(f"snapshot: {len(trie)} prefixes loaded in {load_ms:.1f}ms")
+
+    uris = [f"{namespace}Term" for namespace in snapshot]
+    start = time.perf_counter()
+    rounds = 0
+    while time.perf_counter() - start < 1:
+        for uri in uris:
+            curie.get(uri)
+        rounds += 1
+    elapsed = time.perf_counter() - start
+    print(f"snapshot lookup: {elapsed / (rounds * len(uris)) * 1e6:.2f}us per URI")
+
+    namespace = "http://www.w3.org/ns/dcat#"
+    start = time.perf_counter()
+    try:
+        response = requests.post(
+            "https://prefix.zazuko.com/api/v1/shrink",
+            params={"q": namespace},
+            timeout=10,
+        )
+        response.raise_for_status()
+        external = f"{(time.perf_counter() - start) * 1000:.1f}ms"
+    except requests.exceptions.RequestException as err:
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        external = f"failed after {elapsed_ms:.1f}ms ({err.__class__.__name__})"
+    print(f"external lookup: {external} per namespace")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Compare SPARQL result formats by bytes on the wire and parse time.
+
+Generates a result set shaped like the properties query of a large resource
+and parses it with each parser in `linkeddata_api.data.results.parsers`.
+
+Usage:
+
+    python benchmarks/results_formats.py [rows]
+"""
+import gzip
+import io
+import json
+import sys
+import time
+
+from linkeddata_api.data.results import iter_json_rows, iter_tsv_rows, term_from_json
+
+XSD = "http://www.w3.org/2001/XMLSchema#"
+
+
+def make_rows(count: int) -> list[dict]:
+    rows = []
+    for i in range(count):
+        if i % 3:
+            o = {"type": "uri", "value": f"https://example.com/resource/{i}"}
+        else:
+            o = {"type": "literal", "xml:lang": "en", "value": f"Value number {i}"}
+        rows.append(
+            {
+                "p": {"type": "uri", "value": f"https://example.com/property/{i % 50}"},
+                "o": o,
+                "listItem": {"type": "literal", "datatype": XSD + "boolean", "value": "false"},
+                "listItemNumber": {"type": "literal", "datatype": XSD + "integer", "value": "0"},
+            }
+        )
+    return rows
+
+
+def to_json(rows: list[dict]) -> bytes:
+    result = {
+        "head": {"vars": ["p", "o", "listItem", "listItemNumber"]},
+        "results": {"bindings": rows},
+    }
+    return json.dumps(result).encode()
+
+
+def _tsv_term(term: dict) -> str:
+    if term["type"] == "uri":
+        return f"<{term['value']}>"
+    value = json.dumps(term["value"], ensure_ascii=False)
+    if "xml:lang" in term:
+        return f"{value}@{term['xml:lang']}"
+    if term.get("datatype") == XSD + "integer":
+        return term["value"]
+    if "datatype" in term:
+        return f"{value}^^<{term['datatype']}>"
+    return value
+
+
+def to_tsv(rows: list[dict]) -> bytes:
+    variables = ["p", "o", "listItem", "listItemNumber"]
+    lines = ["\t".join(f"?{variable}" for variable in variables)]
+    for row in rows:
+        lines.append("\t".join(_tsv_term(row[variable]) for variable in variables))
+    return ("\n".join(lines) + "\n").encode()
+
+
+def timeit(func, body: bytes, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(body)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def parse_json(body: bytes) -> list[dict]:
+    """The whole document is decoded before the first row is available."""
+    return [
+        {variable: term_from_json(value) for variable, value in binding.items()}
+        for binding in json.loads(body)["results"]["bindings"]
+    ]
+
+
+def main(count: int) -> None:
+    rows = make_rows(count)
+    json_body = to_json(rows)
+    tsv_body = to_tsv(rows)
+
+    assert list(iter_json_rows(io.BytesIO(json_body))) == list(
+        iter_tsv_rows(io.BytesIO(tsv_body))
+    )
+
+    cases = [
+        ("json (json.loads)", json_body, parse_json),
+        ("json (streaming)", json_body, lambda body: list(iter_json_rows(io.BytesIO(body)))),
+        ("tsv (streaming)", tsv_body, lambda body: list(iter_tsv_rows(io.BytesIO(body)))),
+    ]
+
+    print(f"{count} rows")
+    print(f"{'format':<20} {'bytes':>12} {'gzip bytes':>12} {'parse ms':>10}")
+    for name, body, func in cases:
+        print(
+            f"{name:<20} {len(body):>12} {len(gzip.compress(body)):>12} "
+            f"{timeit(func, body) * 1000:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
@@ -0,0 +1,81 @@
+"""Compare VALUES chunk sizes of the label and existence lookups.
+
+Loads a concept scheme into an in-memory rdflib graph as a stand-in for the
+triplestore, then runs the label and existence queries of `domain.label` and
+`domain.internal_resource` over all members, split into chunks of each size.
+
+rdflib evaluates queries under the GIL, so the chunks are timed one after the
+other. The concurrent time is estimated as the chunks spread over the workers
+of `data.sparql_async`, each running as long as the slowest chunk, which is
+what a triplestore answering queries in parallel does.
+
+Usage:
+
+    python benchmarks/values_chunk_size.py [members] [workers]
+"""
+import math
+import sys
+import time
+
+from rdflib import Graph, Literal, Namespace
+from rdflib.namespace import RDF, SKOS
+
+from linkeddata_api.domain import internal_resource, label
+
+EX = Namespace("https://example.com/concept/")
+
+
+def make_graph(count: int) -> tuple[Graph, list[str]]:
+    graph = Graph()
+    uris = []
+    for i in range(count):
+        uri = EX[str(i)]
+        graph.add((uri, RDF.type, SKOS.Concept))
+        graph.add((uri, SKOS.prefLabel, Literal(f"Concept {i}", lang="en")))
+        uris.append(str(uri))
+    # Members referenced by the scheme but not described in the repository.
+    uris.extend(f"https://example.com/external/{i}" for i in range(count // 10))
+    return graph, uris
+
+
+def time_chunks(graph: Graph, make_query, uris: list[str], size: int) -> list[float]:
+    times = []
+    for i in range(0, len(uris), size):
+        query = make_query(uris[i : i + size])
+        start = time.perf_counter()
+        list(graph.query(query))
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def main(count: int, workers: int) -> None:
+    graph, uris = make_graph(count)
+    sizes = [len(uris), 500, 200, 100, 50]
+
+    print(f"{len(uris)} uris, {workers} workers")
+    for name, make_query in [
+        ("label", lambda uris: label.get_from_list_query(uris, label.default_languages)),
+        ("exists", internal_resource._get_from_list_query),
+    ]:
+        print(name)
+        print(
+            f"{'chunk size':>10} {'queries':>8} {'query KB':>9} "
+            f"{'serial ms':>10} {'concurrent ms':>14}"
+        )
+        for size in sizes:
+            if size > len(uris):
+                continue
+            times = time_chunks(graph, make_query, uris, size)
+            query_size = len(make_query(uris[:size]).encode())
+            concurrent = math.ceil(len(times) / workers) * max(times)
+            print(
+                f"{size:>10} {len(times):>8} {query_size / 1024:>9.1f} "
+                f"{sum(times) * 1000:>10.1f} {concurrent * 1000:>14.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 1000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 8,
+    )
@@ -13,6 +13,7 @@ requires = [
     "pydantic",
     "flask_migrate",
     "itsdangerous==2.0.1",
+    "ijson",
 ]
 
 tests_require = [
@@ -36,6 +36,27 @@ def create_app(config=None) -> Flask:
     ################################################################
     init_app(app)
 
+    ################################################################
+    # Configure data layer
+    ################################################################
+    from linkeddata_api import data
+
+    data.init_app(app)
+
+    from linkeddata_api.domain import curie, internal_resource, label
+
+    curie.init_app(app)
+    label.init_app(app)
+    internal_resource.init_app(app)
+
+    from linkeddata_api.domain.viewer.resource.json.profiles import custom_profiles
+
+    custom_profiles.init_app(app)
+
+    from linkeddata_api.views import compression
+
+    compression.init_app(app)
+
     ##############################################
     # Register routes and views
     ##############################################
@@ -45,9 +66,10 @@ def create_app(config=None) -> Flask:
     app.register_blueprint(oidc_login, url_prefix="/api/oidc")
 
     # register api blueprints
-    from linkeddata_api.views import api_v1, api_v2, home
+    from linkeddata_api.views import admin, api_v1, api_v2, home
 
     app.register_blueprint(home.bp, url_prefix="/api")
+    app.register_blueprint(admin.bp, url_prefix="/api/admin")
     app.register_blueprint(api_v1.bp, url_prefix="/api/v1.0")
     app.register_blueprint(api_v2.bp, url_prefix="/api/v2.0")
 
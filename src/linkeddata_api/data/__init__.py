@@ -1,2 +1,21 @@
 from . import exceptions
+from . import accounting
+from . import cache
+from . import client
+from . import dialects
+from . import health
+from . import results
+from . import singleflight
 from . import sparql
+from . import sparql_async
+
+
+def init_app(app) -> None:
+    """Configure the data layer from the Flask app config."""
+    client.init_app(app)
+    health.init_app(app)
+    cache.init_app(app)
+    dialects.init_app(app)
+    singleflight.init_app(app)
+    sparql_async.init_app(app)
+    accounting.init_app(app)
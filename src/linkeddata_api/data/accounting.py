@@ -0,0 +1,127 @@
+import logging
+import threading
+import time
+from typing import Optional
+
+from flask import g, has_app_context, request
+
+logger = logging.getLogger(__name__)
+
+
+class RequestStats:
+    """SPARQL usage of one API request.
+
+    Queries of a request can run concurrently in worker threads, see `data.sparql_async`,
+    so updates are guarded by a lock.
+    """
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.cache_hits = 0
+        # Summed over queries, so it can exceed the request's duration if queries ran concurrently.
+        self.upstream_time = 0.0
+        self.bytes_received = 0
+        self._lock = threading.Lock()
+
+    def record_query(self, duration: float, size: int) -> None:
+        with self._lock:
+            self.queries += 1
+            self.upstream_time += duration
+            self.bytes_received += size
+
+    def record_cache_hit(self) -> None:
+        with self._lock:
+            self.cache_hits += 1
+
+    def as_dict(self) -> dict:
+        return {
+            "duration_ms": round((time.perf_counter() - self.started) * 1000, 1),
+            "sparql_queries": self.queries,
+            "sparql_cache_hits": self.cache_hits,
+            "sparql_time_ms": round(self.upstream_time * 1000, 1),
+            "sparql_bytes": self.bytes_received,
+        }
+
+    def server_timing(self) -> str:
+        """Value of the Server-Timing response header."""
+        stats = self.as_dict()
+        return ", ".join(
+            [
+                f'sparql;dur={stats["sparql_time_ms"]};desc="{self.queries} queries"',
+                f'sparql-cache;desc="{self.cache_hits} hits"',
+                f'sparql-bytes;desc="{self.bytes_received}"',
+                f'app;dur={stats["duration_ms"]}',
+            ]
+        )
+
+
+# Configured by `linkeddata_api.data.init_app`.
+server_timing = True
+
+
+def current() -> Optional[RequestStats]:
+    """SPARQL usage of the current request, or None outside of a request."""
+    if not has_app_context():
+        return None
+    return g.get("sparql_stats")
+
+
+def record_query(duration: float, size: int) -> None:
+    """Record a query sent to a SPARQL endpoint by the current request.
+
+    :param duration: Seconds until the response was read
+    :param size: Bytes received
+    """
+    stats = current()
+    if stats is not None:
+        stats.record_query(duration, size)
+
+
+def record_cache_hit() -> None:
+    """Record a query of the current request that was answered from the SPARQL cache."""
+    stats = current()
+    if stats is not None:
+        stats.record_cache_hit()
+
+
+def _start_request() -> None:
+    g.sparql_stats = RequestStats()
+
+
+def _finish_request(response):
+    stats = current()
+    if stats is None or not (stats.queries or stats.cache_hits):
+        return response
+
+    if server_timing:
+        response.headers["Server-Timing"] = stats.server_timing()
+
+    fields = stats.as_dict()
+    logger.info(
+        "%s %s %s: %s SPARQL queries in %sms, %s bytes, %s cache hits",
+        request.method,
+        request.path,
+        response.status_code,
+        fields["sparql_queries"],
+        fields["sparql_time_ms"],
+        fields["sparql_bytes"],
+        fields["sparql_cache_hits"],
+        extra={
+            "sparql": {
+                "method": request.method,
+                "path": request.path,
+                "status": response.status_code,
+                **fields,
+            }
+        },
+    )
+    return response
+
+
+def init_app(app) -> None:
+    global server_timing
+
+    server_timing = app.config["SPARQL_SERVER_TIMING"]
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
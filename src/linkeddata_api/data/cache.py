@@ -0,0 +1,171 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+from flask import has_app_context
+from flask_tern.cache import cache as shared_cache
+
+
+class LRUCache:
+    """A thread-safe in-process LRU cache where each item has its own time-to-live.
+
+    `on_evict(key, value)` is called for items removed because they expired or were the least
+    recently used, while the cache's lock is held.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        on_evict: Optional[Callable[[str, Any], None]] = None,
+    ) -> None:
+        self.maxsize = maxsize
+        self.on_evict = on_evict
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._items: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                self.misses += 1
+                return default
+
+            expires, value = item
+            if expires < time.monotonic():
+                del self._items[key]
+                self.misses += 1
+                if self.on_evict is not None:
+                    self.on_evict(key, value)
+                return default
+
+            self._items.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._items[key] = (time.monotonic() + ttl, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                evicted_key, (_, evicted) = self._items.popitem(last=False)
+                self.evictions += 1
+                if self.on_evict is not None:
+                    self.on_evict(evicted_key, evicted)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._items.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+    def items(self) -> list[tuple[str, Any, float]]:
+        """Items that have not expired as (key, value, seconds to live), least recently used first."""
+        now = time.monotonic()
+        with self._lock:
+            return [
+                (key, value, expires - now)
+                for key, (expires, value) in self._items.items()
+                if expires >= now
+            ]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": len(self._items),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+# SPARQL result cache settings. Configured by `linkeddata_api.data.init_app`.
+enabled = True
+# Also store results in the flask_tern cache backend so that all workers share them.
+shared = False
+# Responses larger than this many bytes are not cached.
+max_item_size = 1024 * 1024
+# Time-to-live in seconds per class of query. See `ttl()`.
+ttls = {"default": 300}
+
+local = LRUCache()
+shared_hits = 0
+shared_misses = 0
+
+
+def ttl(query_class: str) -> int:
+    """Get the configured time-to-live for a class of query, e.g. "label" or "entrypoint".
+
+    Pass the value to `data.sparql.post` at the call site. Returns 0, meaning don't
+    cache, if caching is disabled.
+    """
+    if not enabled:
+        return 0
+    return ttls.get(query_class, ttls["default"])
+
+
+def make_key(query: str, sparql_endpoint: str, accept: str) -> str:
+    """Cache key for the result of `query` on `sparql_endpoint` in the `accept` format.
+
+    Whitespace is collapsed so that differently indented renderings of the same
+    template share the same key.
+    """
+    normalized_query = " ".join(query.split())
+    digest = hashlib.sha256(
+        "\n".join((sparql_endpoint, accept, normalized_query)).encode("utf-8")
+    ).hexdigest()
+    return f"sparql:{digest}"
+
+
+def get(key: str, ttl: int) -> Optional[Any]:
+    global shared_hits, shared_misses
+
+    value = local.get(key)
+    if value is not None or not (shared and has_app_context()):
+        return value
+
+    value = shared_cache.get(key)
+    if value is None:
+        shared_misses += 1
+    else:
+        shared_hits += 1
+        local.set(key, value, ttl)
+    return value
+
+
+def set(key: str, value: Any, ttl: int, size: int = 0) -> None:
+    if not ttl or size > max_item_size:
+        return
+
+    local.set(key, value, ttl)
+    if shared and has_app_context():
+        shared_cache.set(key, value, timeout=ttl)
+
+
+def stats() -> dict[str, Any]:
+    return {
+        **local.stats(),
+        "shared": shared,
+        "shared_hits": shared_hits,
+        "shared_misses": shared_misses,
+    }
+
+
+def init_app(app) -> None:
+    global enabled, shared, max_item_size, ttls
+
+    enabled = app.config["SPARQL_CACHE_ENABLED"]
+    shared = app.config["SPARQL_CACHE_SHARED"]
+    max_item_size = app.config["SPARQL_CACHE_MAX_ITEM_SIZE"]
+    ttls = {"default": 300, **app.config["SPARQL_CACHE_TTL"]}
+    local.maxsize = app.config["SPARQL_CACHE_MAXSIZE"]
+    local.clear()
@@ -0,0 +1,109 @@
+import threading
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+
+
+class SPARQLClient:
+    """A thread-safe HTTP client that reuses keep-alive connections to SPARQL endpoints.
+
+    One `requests.Session` with its own connection pool is kept per endpoint origin
+    (scheme, host and port), so repositories on the same triplestore share connections.
+    Since `sparql_endpoint` is a free query parameter, the sessions are kept in a bounded
+    LRU and the least recently used session is closed when the bound is reached.
+    """
+
+    def __init__(
+        self,
+        max_endpoints: int = 32,
+        pool_maxsize: int = 10,
+        connect_timeout: float = 5,
+        read_timeout: float = 60,
+    ) -> None:
+        self.max_endpoints = max_endpoints
+        self.pool_maxsize = pool_maxsize
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self._sessions: OrderedDict[str, requests.Session] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def configure(
+        self,
+        max_endpoints: int,
+        pool_maxsize: int,
+        connect_timeout: float,
+        read_timeout: float,
+    ) -> None:
+        """Apply new settings and drop the existing sessions so new pools pick them up."""
+        with self._lock:
+            self.max_endpoints = max_endpoints
+            self.pool_maxsize = pool_maxsize
+            self.connect_timeout = connect_timeout
+            self.read_timeout = read_timeout
+            self._close_sessions()
+
+    @property
+    def timeout(self) -> tuple[float, float]:
+        return self.connect_timeout, self.read_timeout
+
+    def _create_session(self) -> requests.Session:
+        session = requests.Session()
+        # Every encoding urllib3 can decode, including br and zstd if their packages are installed.
+        # Responses are decoded while they are read, see `data.sparql.select`.
+        session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_maxsize)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def session(self, url: str) -> requests.Session:
+        """Get the pooled session for the origin of `url`, creating it if needed."""
+        parts = urlsplit(url)
+        key = f"{parts.scheme}://{parts.netloc}"
+
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is not None:
+                self._sessions.move_to_end(key)
+                return session
+
+            session = self._create_session()
+            self._sessions[key] = session
+            while len(self._sessions) > self.max_endpoints:
+                _, evicted = self._sessions.popitem(last=False)
+                evicted.close()
+            return session
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session(url).post(url, **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session(url).get(url, **kwargs)
+
+    def _close_sessions(self) -> None:
+        while self._sessions:
+            _, session = self._sessions.popitem()
+            session.close()
+
+    def close(self) -> None:
+        """Close all pooled sessions."""
+        with self._lock:
+            self._close_sessions()
+
+
+# Shared by all threads of a worker process. Configured by `linkeddata_api.data.init_app`.
+client = SPARQLClient()
+
+
+def init_app(app) -> None:
+    client.configure(
+        max_endpoints=app.config["SPARQL_CLIENT_MAX_ENDPOINTS"],
+        pool_maxsize=app.config["SPARQL_CLIENT_POOL_MAXSIZE"],
+        connect_timeout=app.config["SPARQL_CLIENT_CONNECT_TIMEOUT"],
+        read_timeout=app.config["SPARQL_CLIENT_READ_TIMEOUT"],
+    )
@@ -0,0 +1,108 @@
+from typing import Optional
+from urllib.parse import urlsplit
+
+import requests
+
+from .cache import LRUCache
+
+
+class Dialect:
+    """Transport choice and query variants that a SPARQL backend executes best.
+
+    Queries are written once and use the attributes of the endpoint's dialect where
+    backends differ. Get the dialect of an endpoint with `get()`.
+    """
+
+    name = "generic"
+    # Send the query as a URL parameter of a form POST instead of in the request body.
+    query_as_parameter = False
+    # Preferred result format of SELECT queries, one of `data.results.parsers`.
+    results_format = "application/sparql-results+json"
+    # Whether BIND can set the predicate of a following triple pattern.
+    # If not, queries use a VALUES clause instead.
+    bind_predicate = True
+    # Value of the ?listItemNumber placeholder binding.
+    list_item_number_placeholder = 0
+    # Whether projected aggregates must also be listed in GROUP BY.
+    group_by_aggregates = False
+    # Graph that holds only the explicit (not inferred) statements, if the backend has one.
+    explicit_graph: Optional[str] = None
+
+
+class GraphDB(Dialect):
+    name = "graphdb"
+    results_format = "text/tab-separated-values"
+    explicit_graph = "http://www.ontotext.com/explicit"
+
+
+class Virtuoso(Dialect):
+    name = "virtuoso"
+    query_as_parameter = True
+    # Virtuoso does not work with the BIND clause for predicate, using VALUES instead.
+    bind_predicate = False
+    # BIND 0 causes a "out of index error", so we start list with 1
+    list_item_number_placeholder = 1
+    # Also requires to have the ?label in the GROUP BY
+    group_by_aggregates = True
+
+
+class Fuseki(Dialect):
+    name = "fuseki"
+    results_format = "text/tab-separated-values"
+
+
+dialects = {
+    dialect.name: dialect for dialect in (Dialect(), GraphDB(), Virtuoso(), Fuseki())
+}
+
+# Endpoint URL prefix to dialect name. Configured by `linkeddata_api.data.init_app`.
+configured: dict[str, str] = {}
+
+# Dialects detected from the responses of endpoints that are not configured.
+_detected = LRUCache(maxsize=256)
+_detected_ttl = 24 * 60 * 60
+
+
+def _guess(sparql_endpoint: str) -> Dialect:
+    parts = urlsplit(sparql_endpoint)
+    if "virtuoso" in parts.netloc:
+        return dialects["virtuoso"]
+    if "graphdb" in parts.netloc:
+        return dialects["graphdb"]
+    return dialects["generic"]
+
+
+def get(sparql_endpoint: str) -> Dialect:
+    """Get the dialect of a SPARQL endpoint.
+
+    In order, it is the configured dialect, the dialect detected from earlier
+    responses of the endpoint, or a guess from the endpoint's URL.
+    """
+    for prefix, name in configured.items():
+        if sparql_endpoint.startswith(prefix):
+            return dialects[name]
+
+    dialect = _detected.get(sparql_endpoint)
+    if dialect is not None:
+        return dialect
+
+    return _guess(sparql_endpoint)
+
+
+def detect(sparql_endpoint: str, response: requests.Response) -> None:
+    """Detect the dialect of an endpoint from the Server header of its response."""
+    if any(sparql_endpoint.startswith(prefix) for prefix in configured):
+        return
+
+    server = response.headers.get("server", "").lower()
+    for name in ("virtuoso", "graphdb", "fuseki"):
+        if name in server:
+            _detected.set(sparql_endpoint, dialects[name], _detected_ttl)
+            return
+
+
+def init_app(app) -> None:
+    global configured
+
+    configured = dict(app.config["SPARQL_DIALECTS"])
+    _detected.clear()
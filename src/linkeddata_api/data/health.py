@@ -0,0 +1,190 @@
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any
+
+
+class EndpointHealth:
+    """Latency and error tracking with a circuit breaker for one SPARQL endpoint.
+
+    The breaker opens after `failure_threshold` consecutive failures, or when the error
+    rate over the last `window` requests reaches `error_rate_threshold`. While open,
+    requests fail fast. After `reset_timeout` seconds a single probe request is let
+    through (half-open); its outcome closes or re-opens the breaker.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(
+        self,
+        window: int = 100,
+        failure_threshold: int = 5,
+        error_rate_threshold: float = 0.5,
+        min_requests: int = 20,
+        reset_timeout: float = 30,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.error_rate_threshold = error_rate_threshold
+        self.min_requests = min_requests
+        self.reset_timeout = reset_timeout
+
+        self.state = self.CLOSED
+        self.opened_at = 0.0
+        self.consecutive_failures = 0
+        self.requests = 0
+        self.failures = 0
+        self.rejected = 0
+        # Latencies of successful requests and outcomes (True if failed) of recent requests.
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._outcomes: deque[bool] = deque(maxlen=window)
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+
+            if (
+                self.state == self.OPEN
+                and time.monotonic() - self.opened_at >= self.reset_timeout
+            ):
+                self.state = self.HALF_OPEN
+
+            if self.state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+
+            self.rejected += 1
+            return False
+
+    def record_success(self, latency: float) -> None:
+        with self._lock:
+            self.requests += 1
+            self.consecutive_failures = 0
+            self._latencies.append(latency)
+            self._outcomes.append(False)
+            self._probe_in_flight = False
+            self.state = self.CLOSED
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.requests += 1
+            self.failures += 1
+            self.consecutive_failures += 1
+            self._outcomes.append(True)
+            self._probe_in_flight = False
+
+            if (
+                self.state == self.HALF_OPEN
+                or self.consecutive_failures >= self.failure_threshold
+                or (
+                    len(self._outcomes) >= self.min_requests
+                    and self._error_rate() >= self.error_rate_threshold
+                )
+            ):
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+    def _error_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return sum(self._outcomes) / len(self._outcomes)
+
+    def error_rate(self) -> float:
+        """Error rate over the recent requests window."""
+        with self._lock:
+            return self._error_rate()
+
+    def percentile(self, percent: float) -> float | None:
+        """Latency percentile in seconds of the recent successful requests, or None if there are none."""
+        with self._lock:
+            latencies = sorted(self._latencies)
+        if not latencies:
+            return None
+        index = min(len(latencies) - 1, int(len(latencies) * percent / 100))
+        return latencies[index]
+
+    def read_timeout(
+        self, multiplier: float, minimum: float, maximum: float
+    ) -> float:
+        """Read timeout derived from the observed p99 latency.
+
+        Returns `maximum` until `min_requests` successful requests have been observed.
+        """
+        if len(self._latencies) < self.min_requests:
+            return maximum
+        return max(minimum, min(maximum, self.percentile(99) * multiplier))
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "state": self.state,
+            "requests": self.requests,
+            "failures": self.failures,
+            "rejected": self.rejected,
+            "consecutive_failures": self.consecutive_failures,
+            "error_rate": round(self.error_rate(), 3),
+            "latency_p50": self.percentile(50),
+            "latency_p90": self.percentile(90),
+            "latency_p99": self.percentile(99),
+        }
+
+
+class Registry:
+    """Health of each SPARQL endpoint, bounded to the most recently used endpoints."""
+
+    def __init__(self, max_endpoints: int = 32, **health_options) -> None:
+        self.max_endpoints = max_endpoints
+        self.health_options = health_options
+        self._endpoints: OrderedDict[str, EndpointHealth] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, sparql_endpoint: str) -> EndpointHealth:
+        with self._lock:
+            health = self._endpoints.get(sparql_endpoint)
+            if health is None:
+                health = EndpointHealth(**self.health_options)
+                self._endpoints[sparql_endpoint] = health
+                while len(self._endpoints) > self.max_endpoints:
+                    self._endpoints.popitem(last=False)
+            else:
+                self._endpoints.move_to_end(sparql_endpoint)
+            return health
+
+    def clear(self) -> None:
+        with self._lock:
+            self._endpoints.clear()
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            endpoints = list(self._endpoints.items())
+        return {sparql_endpoint: health.stats() for sparql_endpoint, health in endpoints}
+
+
+# Adaptive timeout settings. Configured by `linkeddata_api.data.init_app`.
+adaptive_timeout = True
+# The read timeout is this multiple of the endpoint's p99 latency,
+# bounded by `min_timeout` and the client's read timeout.
+timeout_multiplier = 3.0
+min_timeout = 10.0
+
+registry = Registry()
+
+
+def init_app(app) -> None:
+    global adaptive_timeout, timeout_multiplier, min_timeout
+
+    adaptive_timeout = app.config["SPARQL_ADAPTIVE_TIMEOUT"]
+    timeout_multiplier = app.config["SPARQL_ADAPTIVE_TIMEOUT_MULTIPLIER"]
+    min_timeout = app.config["SPARQL_ADAPTIVE_TIMEOUT_MIN"]
+    registry.max_endpoints = app.config["SPARQL_CLIENT_MAX_ENDPOINTS"]
+    registry.health_options = {
+        "window": app.config["SPARQL_HEALTH_WINDOW"],
+        "failure_threshold": app.config["SPARQL_BREAKER_FAILURE_THRESHOLD"],
+        "error_rate_threshold": app.config["SPARQL_BREAKER_ERROR_RATE"],
+        "min_requests": app.config["SPARQL_BREAKER_MIN_REQUESTS"],
+        "reset_timeout": app.config["SPARQL_BREAKER_RESET_TIMEOUT"],
+    }
+    registry.clear()
@@ -0,0 +1,176 @@
+import io
+import re
+from typing import BinaryIO, Callable, Iterator, NamedTuple, Optional
+
+import ijson
+
+XSD = "http://www.w3.org/2001/XMLSchema#"
+
+
+class Term(NamedTuple):
+    """An RDF term bound to a variable in a SPARQL result row."""
+
+    # One of "uri", "literal" or "bnode".
+    type: str
+    value: str
+    datatype: Optional[str] = None
+    language: Optional[str] = None
+
+
+# A SPARQL result row. Unbound variables are not in the dict.
+Row = dict[str, Term]
+
+
+def term_from_json(binding: dict) -> Term:
+    """Create a Term from a binding value of the SPARQL 1.1 Query Results JSON Format."""
+    type_ = binding["type"]
+    if type_ == "typed-literal":
+        # Virtuoso uses the SPARQL 1.0 term type for literals with a datatype.
+        type_ = "literal"
+    return Term(
+        type_, binding["value"], binding.get("datatype"), binding.get("xml:lang")
+    )
+
+
+def iter_json_rows(stream: BinaryIO) -> Iterator[Row]:
+    """Yield result rows one at a time while reading a SPARQL JSON results stream.
+
+    The whole document is never held in memory, only the row being parsed.
+
+    :param stream: A file-like object of the SPARQL 1.1 Query Results JSON Format
+    :raises ijson.JSONError: The stream is not valid JSON
+    """
+    for binding in ijson.items(stream, "results.bindings.item"):
+        yield {
+            variable: term_from_json(value) for variable, value in binding.items()
+        }
+
+
+_escape = re.compile(r"\\(?:u([0-9A-Fa-f]{4})|U([0-9A-Fa-f]{8})|(.))")
+_escapes = {"t": "\t", "b": "\b", "n": "\n", "r": "\r", "f": "\f"}
+
+
+def _unescape_match(match: re.Match) -> str:
+    code = match.group(1) or match.group(2)
+    if code:
+        return chr(int(code, 16))
+    char = match.group(3)
+    return _escapes.get(char, char)
+
+
+def _unescape(value: str) -> str:
+    if "\\" not in value:
+        return value
+    return _escape.sub(_unescape_match, value)
+
+
+def term_from_tsv(cell: str) -> Optional[Term]:
+    """Create a Term from a cell of the SPARQL 1.1 Query Results TSV Format.
+
+    Returns None for an empty cell, which is an unbound variable.
+
+    :raises ValueError: The cell is not an RDF term.
+    """
+    if not cell:
+        return None
+
+    first = cell[0]
+    if first == "<":
+        return Term("uri", _unescape(cell[1:-1]))
+
+    if first == '"' or first == "'":
+        end = cell.rfind(first)
+        if end < 1:
+            raise ValueError(f"Unterminated literal {cell}")
+        value = _unescape(cell[1:end])
+        suffix = cell[end + 1 :]
+        if not suffix:
+            return Term("literal", value)
+        if suffix[0] == "@":
+            return Term("literal", value, language=suffix[1:])
+        if suffix.startswith("^^<") and suffix[-1] == ">":
+            return Term("literal", value, _unescape(suffix[3:-1]))
+        raise ValueError(f"Unexpected literal suffix in {cell}")
+
+    if cell.startswith("_:"):
+        return Term("bnode", cell[2:])
+
+    # Numbers and booleans may be written without quotes or a datatype.
+    if cell == "true" or cell == "false":
+        return Term("literal", cell, XSD + "boolean")
+    if "e" in cell or "E" in cell:
+        datatype = XSD + "double"
+    elif "." in cell:
+        datatype = XSD + "decimal"
+    else:
+        datatype = XSD + "integer"
+    # Raises ValueError for anything else.
+    float(cell)
+    return Term("literal", cell, datatype)
+
+
+_tsv_terms_size = 4096
+
+
+def iter_tsv_rows(stream: BinaryIO) -> Iterator[Row]:
+    """Yield result rows one at a time while reading a SPARQL TSV results stream.
+
+    Cells are RDF terms in SPARQL syntax, so the term types are kept, unlike the CSV format.
+
+    :param stream: A file-like object of the SPARQL 1.1 Query Results TSV Format
+    :raises ValueError: The stream is not a SPARQL TSV result set
+    """
+    lines = io.TextIOWrapper(stream, encoding="utf-8", newline="")
+
+    header = lines.readline().rstrip("\r\n")
+    if not header:
+        return
+    variables = [variable[1:] for variable in header.split("\t")]
+
+    # Predicates, types and flags repeat across rows, so parse each distinct cell once.
+    # Cleared when full to keep the memory of a streamed result set bounded.
+    terms: dict[str, Term] = {}
+
+    for line in lines:
+        line = line.rstrip("\r\n")
+        cells = line.split("\t")
+        if len(cells) != len(variables):
+            if not line:
+                continue
+            raise ValueError(
+                f"Expected {len(variables)} values in result row but got {len(cells)}"
+            )
+
+        row = {}
+        for variable, cell in zip(variables, cells):
+            if not cell:
+                continue
+            term = terms.get(cell)
+            if term is None:
+                if len(terms) >= _tsv_terms_size:
+                    terms.clear()
+                term = terms[cell] = term_from_tsv(cell)
+            row[variable] = term
+        yield row
+
+
+# Result row parsers by media type, in order of preference.
+parsers: dict[str, Callable[[BinaryIO], Iterator[Row]]] = {
+    "text/tab-separated-values": iter_tsv_rows,
+    "application/sparql-results+json": iter_json_rows,
+    "application/json": iter_json_rows,
+}
+
+
+def iter_rows(stream: BinaryIO, content_type: str) -> Iterator[Row]:
+    """Yield result rows of a stream in one of the formats in `parsers`.
+
+    :param stream: A file-like object of SPARQL results
+    :param content_type: Content-Type header of the response
+    :raises ValueError: The stream is not in the format or the format is not supported
+    """
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    parser = parsers.get(media_type)
+    if parser is None:
+        raise ValueError(f"Unsupported SPARQL result format {content_type}")
+    return parser(stream)
@@ -0,0 +1,144 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, Optional
+
+from flask import has_app_context
+from flask_tern.cache import cache as shared_cache
+
+from . import cache
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class Group:
+    """Coalesce concurrent calls that have the same key into a single call.
+
+    The first caller of a key runs the function. Callers that arrive while it is
+    still running wait for it and get the same result, or the same exception.
+    """
+
+    def __init__(self) -> None:
+        self.coalesced = 0
+        self._calls: dict[str, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, func: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+        except BaseException as err:
+            call.error = err
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        return call.result
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+
+# Single-flight settings. Configured by `linkeddata_api.data.init_app`.
+enabled = True
+# Also coalesce across workers with a lock in the flask_tern cache backend.
+# Only applies to cached queries, since waiting workers read the result from the shared cache.
+shared = False
+# Seconds between checks of the shared cache while another worker runs the query.
+poll_interval = 0.05
+# Seconds before a shared lock expires, e.g. if the worker holding it died.
+lock_timeout = 60
+
+group = Group()
+shared_coalesced = 0
+
+
+def _wait_for_shared_result(key: str, ttl: int) -> Optional[Any]:
+    """Wait for the worker holding the shared lock of `key` to cache its result.
+
+    Returns None if the lock is released or expires without a result being cached.
+    """
+    global shared_coalesced
+
+    lock_key = f"{key}:lock"
+    deadline = time.monotonic() + lock_timeout
+    while time.monotonic() < deadline:
+        time.sleep(poll_interval)
+        value = cache.get(key, ttl)
+        if value is not None:
+            shared_coalesced += 1
+            return value
+        if shared_cache.get(lock_key) is None:
+            return None
+    return None
+
+
+def do(key: str, func: Callable[[], Any], ttl: int = 0) -> Any:
+    """Call `func` unless an identical call is already in flight, then wait for its result.
+
+    :param key: Identifies identical calls, see `data.cache.make_key()`
+    :param func: Makes the call and caches the result for `ttl` seconds
+    :param ttl: Time-to-live of the cached result. Workers coalesce only if it is not 0.
+    """
+    if not enabled:
+        return func()
+
+    if not (shared and ttl and cache.shared and has_app_context()):
+        return group.do(key, func)
+
+    def _shared_func() -> Any:
+        lock_key = f"{key}:lock"
+        if not shared_cache.add(lock_key, 1, timeout=lock_timeout):
+            value = _wait_for_shared_result(key, ttl)
+            if value is not None:
+                return value
+            logger.info("Shared lock of %s released without a result, querying.", key)
+            return func()
+
+        try:
+            return func()
+        finally:
+            shared_cache.delete(lock_key)
+
+    return group.do(key, _shared_func)
+
+
+def stats() -> dict[str, Any]:
+    return {
+        "in_flight": group.in_flight(),
+        "coalesced": group.coalesced,
+        "shared": shared,
+        "shared_coalesced": shared_coalesced,
+    }
+
+
+def init_app(app) -> None:
+    global enabled, shared, poll_interval, lock_timeout
+
+    enabled = app.config["SPARQL_SINGLEFLIGHT_ENABLED"]
+    shared = app.config["SPARQL_SINGLEFLIGHT_SHARED"]
+    poll_interval = app.config["SPARQL_SINGLEFLIGHT_POLL_INTERVAL"]
+    lock_timeout = app.config["SPARQL_SINGLEFLIGHT_LOCK_TIMEOUT"]
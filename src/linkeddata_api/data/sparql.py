@@ -1,36 +1,69 @@
+import io
+import time
+from typing import Iterator, Optional
+
+import ijson
 import requests
+import urllib3
 
-from . import exceptions
+from . import accounting, cache, dialects, exceptions, health, singleflight
+from .client import client
+from .results import Row, iter_rows
 
+JSON = "application/sparql-results+json"
 
-def post(
-    query: str, sparql_endpoint: str, accept: str = "application/sparql-results+json"
-) -> requests.Response:
-    """Make a SPARQL POST request
 
-    If the response is JSON, use `response.json()` to get the Python dict.
+def _bytes_received(response: requests.Response) -> int:
+    # Bytes read from the connection, before any content-encoding is decoded.
+    size = getattr(response.raw, "tell", lambda: None)()
+    return size if isinstance(size, int) else 0
 
-    :param query: SPARQL query
-    :param sparql_endpoint: SPARQL endpoint to query
-    :param accept: The mimetype of the response value
-    :return: Response object
-    :raises exceptions.RequestError: An error occurred and the response status code is not in the 200 range.
+
+def _send(
+    method, sparql_endpoint: str, bulk: bool = False, **kwargs
+) -> requests.Response:
+    """Send a request through the endpoint's circuit breaker and record its outcome.
+
+    Bulk requests, such as loading a whole repository in the background, are much slower
+    than the requests of users. They bypass the circuit breaker and the adaptive timeout,
+    and their latency and failures are not recorded in the endpoint's health.
     """
-    headers = {
-        "accept": accept,
-        "content-type": "application/x-www-form-urlencoded"
-        if "virtuoso.tern" in sparql_endpoint
-        else "application/sparql-query",
-    }
+    endpoint_health = health.registry.get(sparql_endpoint)
+    if not bulk and not endpoint_health.allow_request():
+        raise exceptions.RequestError(
+            f"SPARQL endpoint {sparql_endpoint} is unhealthy, not sending request. "
+            f"Retrying in {endpoint_health.reset_timeout} seconds."
+        )
 
-    if "virtuoso.tern" in sparql_endpoint:
-        response = requests.post(
-            url=sparql_endpoint, headers=headers, params={"query": query}, timeout=60
+    read_timeout = client.read_timeout
+    if health.adaptive_timeout and not bulk:
+        read_timeout = endpoint_health.read_timeout(
+            health.timeout_multiplier, health.min_timeout, client.read_timeout
         )
-    else:
-        response = requests.post(
-            url=sparql_endpoint, headers=headers, data=query, timeout=60
+
+    start = time.perf_counter()
+    try:
+        response = method(
+            sparql_endpoint, timeout=(client.connect_timeout, read_timeout), **kwargs
         )
+    except requests.exceptions.RequestException as err:
+        if not bulk:
+            endpoint_health.record_failure()
+        accounting.record_query(time.perf_counter() - start, 0)
+        raise exceptions.RequestError(str(err)) from err
+
+    if not kwargs.get("stream"):
+        # Streamed responses are recorded once they have been read, see `_iter_rows`.
+        accounting.record_query(time.perf_counter() - start, _bytes_received(response))
+
+    if bulk:
+        if response.status_code < 500:
+            dialects.detect(sparql_endpoint, response)
+    elif response.status_code >= 500:
+        endpoint_health.record_failure()
+    else:
+        endpoint_health.record_success(time.perf_counter() - start)
+        dialects.detect(sparql_endpoint, response)
 
     try:
         response.raise_for_status()
@@ -42,8 +75,92 @@ def post(
     return response
 
 
+def _post(
+    query: str,
+    sparql_endpoint: str,
+    accept: str,
+    stream: bool = False,
+    bulk: bool = False,
+) -> requests.Response:
+    query_as_parameter = dialects.get(sparql_endpoint).query_as_parameter
+    headers = {
+        "accept": accept,
+        "content-type": "application/x-www-form-urlencoded"
+        if query_as_parameter
+        else "application/sparql-query",
+    }
+
+    if query_as_parameter:
+        return _send(
+            client.post,
+            sparql_endpoint,
+            headers=headers,
+            params={"query": query},
+            stream=stream,
+            bulk=bulk,
+        )
+    return _send(
+        client.post,
+        sparql_endpoint,
+        headers=headers,
+        data=query,
+        stream=stream,
+        bulk=bulk,
+    )
+
+
+def _get(query: str, sparql_endpoint: str, accept: str) -> requests.Response:
+    headers = {
+        "accept": accept,
+    }
+    params = {"query": query}
+
+    return _send(client.get, sparql_endpoint, headers=headers, params=params)
+
+
+def _execute(request, query: str, sparql_endpoint: str, accept: str, ttl: int):
+    key = cache.make_key(query, sparql_endpoint, accept)
+
+    if ttl:
+        response = cache.get(key, ttl)
+        if response is not None:
+            accounting.record_cache_hit()
+            return response
+
+    def _request() -> requests.Response:
+        response = request(query, sparql_endpoint, accept)
+        cache.set(key, response, ttl, size=len(response.content))
+        return response
+
+    # Identical queries already in flight are waited on instead of being sent again.
+    return singleflight.do(key, _request, ttl)
+
+
+def post(
+    query: str,
+    sparql_endpoint: str,
+    accept: str = "application/sparql-results+json",
+    ttl: int = 0,
+) -> requests.Response:
+    """Make a SPARQL POST request
+
+    If the response is JSON, use `response.json()` to get the Python dict.
+
+    :param query: SPARQL query
+    :param sparql_endpoint: SPARQL endpoint to query
+    :param accept: The mimetype of the response value
+    :param ttl: Seconds to cache the response for. Use `data.cache.ttl()` to get the configured value for a class of query. Not cached if 0.
+    :return: Response object
+    :raises exceptions.RequestError: An error occurred and the response status code is not in the 200 range.
+    """
+    return _execute(_post, query, sparql_endpoint, accept, ttl)
+
+
 def get(
-    query: str, sparql_endpoint: str, accept: str = "application/sparql-results+json"
+    query: str,
+    sparql_endpoint: str,
+    accept: str = "application/sparql-results+json",
+    ttl: int = 0,
 ) -> requests.Response:
     """Make a SPARQL GET request
 
@@ -52,23 +169,77 @@ def get(
     :param query: SPARQL query
     :param sparql_endpoint: SPARQL endpoint to query
     :param accept: The mimetype of the response value
+    :param ttl: Seconds to cache the response for. Use `data.cache.ttl()` to get the configured value for a class of query. Not cached if 0.
     :return: Response object
     :raises exceptions.RequestError: An error occurred and the response status code is not in the 200 range.
     """
-    headers = {
-        "accept": accept,
-    }
-    params = {"query": query}
+    return _execute(_get, query, sparql_endpoint, accept, ttl)
 
-    response = requests.get(
-        url=sparql_endpoint, headers=headers, params=params, timeout=60
-    )
 
+def _iter_rows(
+    stream,
+    response: requests.Response,
+    sparql_endpoint: str,
+    start: Optional[float] = None,
+    bulk: bool = False,
+) -> Iterator[Row]:
     try:
-        response.raise_for_status()
-    except requests.exceptions.HTTPError as err:
-        raise exceptions.RequestError(err.response.text) from err
-
-    # TODO: raise empty response error here.
-
-    return response
+        yield from iter_rows(stream, response.headers.get("content-type", JSON))
+    except (ijson.JSONError, ValueError) as err:
+        raise exceptions.SPARQLResultJSONError(
+            f"Unexpected SPARQL result set.\n{err}"
+        ) from err
+    except (
+        urllib3.exceptions.HTTPError,
+        requests.exceptions.RequestException,
+    ) as err:
+        # The connection failed while the response was streamed, such as a read timeout.
+        if not bulk:
+            health.registry.get(sparql_endpoint).record_failure()
+        raise exceptions.RequestError(str(err)) from err
+    finally:
+        response.close()
+        if start is not None:
+            accounting.record_query(time.perf_counter() - start, _bytes_received(response))
+
+
+def _results_accept(sparql_endpoint: str) -> str:
+    results_format = dialects.get(sparql_endpoint).results_format
+    if results_format == JSON:
+        return JSON
+    # Fall back to JSON if the endpoint can't produce the preferred format.
+    return f"{results_format}, {JSON};q=0.9"
+
+
+def select(
+    query: str, sparql_endpoint: str, ttl: int = 0, bulk: bool = False
+) -> Iterator[Row]:
+    """Make a SPARQL SELECT request and iterate over the result rows
+
+    The request is sent before this returns. Rows are parsed one at a time as they are
+    iterated. Uncached results are parsed while they are read from the connection,
+    without holding the whole response in memory.
+
+    The result format is negotiated from the endpoint's dialect, see `data.dialects`.
+    Every format produces the same rows.
+
+    :param query: SPARQL SELECT query
+    :param sparql_endpoint: SPARQL endpoint to query
+    :param ttl: Seconds to cache the response for. Use `data.cache.ttl()` to get the configured value for a class of query. Not cached if 0.
+    :param bulk: The query reads a large part of the repository, such as a background load. It gets the client's full read timeout and is left out of the endpoint's health, see `_send`. Not cached.
+    :return: An iterator of rows, each a dict of variable names to `data.results.Term` objects
+    :raises exceptions.RequestError: An error occurred and the response status code is not in the 200 range, or the connection failed while the rows were read.
+    :raises exceptions.SPARQLResultJSONError: The response is not a SPARQL result set.
+    """
+    accept = _results_accept(sparql_endpoint)
+
+    if ttl and not bulk:
+        # Cached responses are shared, so read them from memory.
+        response = post(query, sparql_endpoint, accept, ttl)
+        return _iter_rows(io.BytesIO(response.content), response, sparql_endpoint)
+
+    start = time.perf_counter()
+    response = _post(query, sparql_endpoint, accept, stream=True, bulk=bulk)
+    # Decode any content-encoding while reading the raw stream.
+    response.raw.decode_content = True
+    return _iter_rows(response.raw, response, sparql_endpoint, start, bulk)
@@ -0,0 +1,115 @@
+"""Run independent SPARQL queries of a request concurrently.
+
+The SPARQL client is blocking, so the coroutines here run the blocking calls in a
+thread pool owned by the event loop. Views stay synchronous and use `gather` to
+wait for a group of queries, which takes roughly as long as the slowest query.
+
+    exists, label = sparql_async.gather(
+        sparql_async.post(ask_query, sparql_endpoint),
+        sparql_async.run(domain.label.get, uri, sparql_endpoint),
+    )
+"""
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Sequence, TypeVar
+
+import requests
+
+from . import sparql
+
+T = TypeVar("T")
+
+# Maximum number of blocking calls a single `gather` runs at the same time.
+max_workers = 8
+# Default number of items per call of `map_chunks`, e.g. URIs in the VALUES block of a query.
+chunk_size = 200
+
+
+async def run(func: Callable[..., T], *args, **kwargs) -> T:
+    """Run a blocking function in the event loop's thread pool.
+
+    The caller's context variables, such as the Flask app and request contexts,
+    are copied to the worker thread.
+
+    :param func: Blocking function to call
+    :return: The return value of `func`
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(
+        None, functools.partial(context.run, func, *args, **kwargs)
+    )
+
+
+async def post(
+    query: str,
+    sparql_endpoint: str,
+    accept: str = "application/sparql-results+json",
+    ttl: int = 0,
+) -> requests.Response:
+    """Async twin of `linkeddata_api.data.sparql.post`
+
+    :param query: SPARQL query
+    :param sparql_endpoint: SPARQL endpoint to query
+    :param accept: The mimetype of the response value
+    :param ttl: Seconds to cache the response for. Not cached if 0.
+    :return: Response object
+    :raises exceptions.RequestError: An error occurred and the response status code is not in the 200 range.
+    """
+    return await run(sparql.post, query, sparql_endpoint, accept, ttl)
+
+
+def gather(*aws: Awaitable[Any]) -> list[Any]:
+    """Run awaitables concurrently and block until all of them are done.
+
+    Each call runs its own event loop with a private thread pool, so a gathered
+    function can call `gather` again without waiting on its caller's workers.
+    Must not be called from a thread with a running event loop.
+
+    :return: The results in the same order as `aws`
+    :raises Exception: The first exception raised by any of the awaitables
+    """
+    if not aws:
+        return []
+
+    async def _gather() -> list[Any]:
+        loop = asyncio.get_running_loop()
+        loop.set_default_executor(
+            ThreadPoolExecutor(
+                max_workers=min(len(aws), max_workers),
+                thread_name_prefix="sparql",
+            )
+        )
+        return await asyncio.gather(*aws)
+
+    return asyncio.run(_gather())
+
+
+def map_chunks(
+    func: Callable[..., T], items: Sequence[Any], *args, size: int = 0
+) -> list[T]:
+    """Call a blocking function with consecutive chunks of `items` concurrently.
+
+    Splits large lookups, such as a query with a VALUES block of thousands of URIs,
+    into queries that stay under endpoint query size limits and run side by side.
+
+        results = sparql_async.map_chunks(_get_labels, uris, sparql_endpoint)
+
+    :param func: Blocking function called as `func(chunk, *args)`
+    :param items: Items to split
+    :param size: Items per chunk. Defaults to `chunk_size`.
+    :return: The result of each chunk in order. Empty if there are no items.
+    """
+    size = size or chunk_size
+    chunks = [items[i : i + size] for i in range(0, len(items), size)]
+    if len(chunks) <= 1:
+        return [func(chunk, *args) for chunk in chunks]
+    return gather(*[run(func, chunk, *args) for chunk in chunks])
+
+
+def init_app(app) -> None:
+    global max_workers, chunk_size
+    max_workers = app.config["SPARQL_ASYNC_MAX_WORKERS"]
+    chunk_size = app.config["SPARQL_VALUES_CHUNK_SIZE"]
@@ -5,4 +5,5 @@ from . import namespaces
 from . import label
 from . import internal_resource
 from . import curie
+from . import terms
 from . import pydantic_jsonify
@@ -1,24 +1,68 @@
+import atexit
 import logging
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable, Optional
+from urllib.parse import urlsplit
 
+import click
 import requests
+from flask.cli import AppGroup
+
+from linkeddata_api import data
+from linkeddata_api.data.cache import LRUCache
+from linkeddata_api.domain import curie_cache
+from linkeddata_api.domain.prefix_trie import PrefixTrie
 
 logger = logging.getLogger(__name__)
 
-# URIs that don't have curies in external service.
-not_found = {}
-
-# Predefined prefixes. New prefixes get added at runtime.
-prefixes = {
-    "http://purl.org/dc/terms/": "dcterms",
-    "http://www.w3.org/2004/02/skos/core#": "skos",
-    "http://www.w3.org/2000/01/rdf-schema#": "rdfs",
-    "https://schema.org/": "schema",
-    "https://w3id.org/tern/ontologies/tern/": "tern",
-    "http://www.w3.org/2002/07/owl#": "owl",
-    "http://www.w3.org/2001/XMLSchema#": "xsd",
-    "http://rdfs.org/ns/void#": "void",
-    "http://www.w3.org/ns/prov#": "prov",
-}
+# Predefined prefixes.
+prefixes = PrefixTrie(
+    {
+        "http://purl.org/dc/terms/": "dcterms",
+        "http://www.w3.org/2004/02/skos/core#": "skos",
+        "http://www.w3.org/2000/01/rdf-schema#": "rdfs",
+        "https://schema.org/": "schema",
+        "https://w3id.org/tern/ontologies/tern/": "tern",
+        "http://www.w3.org/2002/07/owl#": "owl",
+        "http://www.w3.org/2001/XMLSchema#": "xsd",
+        "http://rdfs.org/ns/void#": "void",
+        "http://www.w3.org/ns/prov#": "prov",
+    }
+)
+
+# Snapshot of a public prefix registry. Loaded into prefixes on first use,
+# without replacing the predefined prefixes. Refresh with `flask curie refresh-prefixes`.
+snapshot_path = Path(__file__).parent / "prefixes.tsv"
+_snapshot_loaded = False
+_snapshot_lock = threading.Lock()
+
+# External service settings. Configured by `init_app`.
+# Fetch unknown namespaces from the external service.
+# If False, URIs without a known namespace are returned as-is.
+external_lookup = True
+# Wait for the external service in the request instead of fetching in the background.
+blocking = False
+background_workers = 2
+# Namespaces waiting to be fetched in the background. More are not queued.
+max_pending = 1000
+
+# Prefixes fetched from the external service, and namespaces that don't have curies in it.
+# Bounded, and persisted to `cache_path` if set. Configured by `init_app`.
+fetched = curie_cache.FetchedPrefixes()
+not_found = LRUCache(maxsize=10000)
+not_found_ttl = 24 * 60 * 60
+cache_path: Optional[Path] = None
+# Seconds to wait before saving, to save the namespaces fetched meanwhile together.
+save_interval = 60.0
+_save_timer: Optional[threading.Timer] = None
+_save_lock = threading.Lock()
+
+_executor: Optional[ThreadPoolExecutor] = None
+_pending: set[str] = set()
+_pending_lock = threading.Lock()
 
 # Don't find curies for these - speeds up request processing.
 # TODO: these may no longer be needed since we don't fetch for subjects or objects of an RDF statement anymore.
@@ -37,45 +81,314 @@ def uri_in_skips(uri: str) -> bool:
     return False
 
 
-def get(uri: str):
-    """Get curie
+def read_snapshot(path: Path) -> dict[str, str]:
+    """Read a prefix snapshot file of tab-separated prefix and namespace lines.
 
-    1. Check if it exists in prefixes.
-    2. Check if it exists in cache.
-    3. Make an expensive request to an external service. Cache the result.
+    If a namespace has more than one prefix, the first one is used.
 
-    If all steps fail to find a curie, return the uri as-is.
+    :return: Namespace to prefix
     """
+    snapshot = {}
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            prefix, _, namespace = line.rstrip("\n").partition("\t")
+            if namespace:
+                snapshot.setdefault(namespace, prefix)
+    return snapshot
 
-    for key, val in prefixes.items():
-        if uri.startswith(key):
-            localname = uri.split("#")[-1].split("/")[-1]
-            curie = f"{val}:{localname}"
-            return curie
 
-    if uri in not_found:
-        return not_found.get(uri)
-    if uri_in_skips(uri):
-        return uri
+def _load_snapshot() -> None:
+    global _snapshot_loaded
+
+    with _snapshot_lock:
+        if _snapshot_loaded:
+            return
+        snapshot = read_snapshot(snapshot_path)
+        prefixes.update(snapshot, replace=False)
+        _snapshot_loaded = True
+        logger.info("Loaded %s prefixes from %s", len(snapshot), snapshot_path)
+
 
-    logger.info("Fetching curie from external service - %s", uri)
+def _split(uri: str) -> tuple[str, str]:
+    """Split a uri into its base uri and localname."""
     localname = uri.split("#")[-1].split("/")[-1]
     r_index = uri.rfind(localname)
-    base_uri = uri[:r_index]
+    return uri[:r_index], localname
 
+
+def _fetch_prefix(base_uri: str) -> Optional[str]:
+    """Fetch the prefix of a namespace from the external service and keep it in `fetched`.
+
+    Namespaces the service doesn't have are kept in `not_found`. Other error
+    responses, such as rate limits and outages, are not, so they're retried.
+
+    :return: The prefix, or None if the service doesn't have one or responded with an error.
+    :raises requests.exceptions.RequestException: The service could not be reached.
+    """
+    logger.info("Fetching curie from external service - %s", base_uri)
     response = requests.post(
         "https://prefix.zazuko.com/api/v1/shrink", params={"q": base_uri}, timeout=60
     )
 
     try:
         response.raise_for_status()
-    except requests.exceptions.HTTPError:
-        not_found[uri] = uri
+    except requests.exceptions.HTTPError as err:
+        if response.status_code == 404:
+            _set_not_found(base_uri)
+        else:
+            logger.warning("Curie fetch failed for %s: %s", base_uri, err)
+        return None
+
+    prefix = response.json().get("value", "")[:-1]
+    if not prefix:
+        _set_not_found(base_uri)
+        return None
+
+    fetched.add(base_uri, prefix)
+    _save()
+    logger.info("Curie fetch completed for %s, found %s", base_uri, prefix)
+    return prefix
+
+
+def _set_not_found(base_uri: str) -> None:
+    not_found.set(base_uri, True, not_found_ttl)
+    _save()
+
+
+def _save() -> None:
+    """Save the cache to `cache_path` within `save_interval` seconds.
+
+    Fetches in the meantime are saved together, so the file is written at most once
+    per interval.
+    """
+    global _save_timer
+
+    if cache_path is None:
+        return
+    with _save_lock:
+        if _save_timer is not None:
+            return
+        _save_timer = threading.Timer(save_interval, flush)
+        _save_timer.daemon = True
+        _save_timer.start()
+
+
+def flush() -> None:
+    """Save the cache to `cache_path` now if it has unsaved changes."""
+    global _save_timer
+
+    with _save_lock:
+        if _save_timer is None:
+            return
+        _save_timer.cancel()
+        _save_timer = None
+    try:
+        curie_cache.save(cache_path, fetched, not_found)
+    except OSError as err:
+        logger.warning("Could not save curie cache to %s: %s", cache_path, err)
+
+
+def _longest_match(uri: str) -> Optional[tuple[str, str]]:
+    match = prefixes.longest_match(uri)
+    fetched_match = fetched.longest_match(uri)
+    if fetched_match is not None and (
+        match is None or len(fetched_match[0]) > len(match[0])
+    ):
+        return fetched_match
+    return match
+
+
+def _fetch_in_background(base_uri: str) -> None:
+    try:
+        _fetch_prefix(base_uri)
+    except Exception as err:
+        # Not added to not_found, so it's retried when requested again.
+        logger.warning("Curie fetch failed for %s: %s", base_uri, err)
+    finally:
+        with _pending_lock:
+            _pending.discard(base_uri)
+
+
+def _enqueue(base_uri: str) -> None:
+    """Queue a namespace to be fetched by the background workers, once."""
+    global _executor
+
+    with _pending_lock:
+        if base_uri in _pending or len(_pending) >= max_pending:
+            return
+        _pending.add(base_uri)
+        # Created on first use, so each forked worker process has its own threads.
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=background_workers, thread_name_prefix="curie"
+            )
+        _executor.submit(_fetch_in_background, base_uri)
+
+
+def get(uri: str):
+    """Get curie
+
+    1. Check if it starts with a namespace in prefixes, the prefix snapshot or the fetched prefixes.
+       The longest namespace wins.
+    2. Check if its namespace is known to not have a curie.
+    3. If `external_lookup` is enabled, fetch the namespace's prefix from an external service and
+       add it to the fetched prefixes. Unless `blocking` is set, the fetch is queued for a background
+       worker and the uri is returned right away.
+
+    If all steps fail to find a curie, return the uri as-is.
+    """
+    if not _snapshot_loaded:
+        _load_snapshot()
+
+    match = _longest_match(uri)
+    if match is not None:
+        _, localname = _split(uri)
+        curie = f"{match[1]}:{localname}"
+        return curie
+
+    if uri_in_skips(uri) or not external_lookup:
+        return uri
+
+    base_uri, localname = _split(uri)
+    if not_found.get(base_uri) is not None:
+        return uri
+
+    if not blocking:
+        # Return the uri now, later requests get the curie once it's fetched.
+        _enqueue(base_uri)
+        return uri
+
+    prefix = _fetch_prefix(base_uri)
+    if prefix is None:
         return uri
+    return f"{prefix}:{localname}"
+
+
+def _try_fetch_prefix(base_uri: str) -> Optional[str]:
+    try:
+        return _fetch_prefix(base_uri)
+    except requests.exceptions.RequestException as err:
+        logger.warning("Curie fetch failed for %s: %s", base_uri, err)
+        return None
+
+
+def get_many(uris: Iterable[str]) -> dict[str, str]:
+    """Get the curies of many uris
+
+    Like `get()`, but each distinct namespace is looked up once, and in blocking mode
+    unknown namespaces are fetched from the external service concurrently. A namespace
+    that can't be fetched leaves its uris as-is instead of raising.
+
+    :return: Each uri to its curie, or to itself if it has none.
+    """
+    if not _snapshot_loaded:
+        _load_snapshot()
+
+    curies = {}
+    # Base uri to the (uri, localname) of uris without a known namespace.
+    unknown: dict[str, list[tuple[str, str]]] = defaultdict(list)
 
-    prefix = response.json()["value"][:-1]
-    prefixes[base_uri] = prefix
-    curie = f"{prefix}:{localname}"
-    logger.info("Curie fetch completed for %s, found %s", uri, curie)
+    for uri in uris:
+        if uri in curies:
+            continue
 
-    return curie
+        base_uri, localname = _split(uri)
+        match = _longest_match(uri)
+        if match is not None:
+            curies[uri] = f"{match[1]}:{localname}"
+            continue
+
+        curies[uri] = uri
+        if external_lookup and not uri_in_skips(uri):
+            unknown[base_uri].append((uri, localname))
+
+    base_uris = [
+        base_uri for base_uri in unknown if not_found.get(base_uri) is None
+    ]
+    if not base_uris:
+        return curies
+
+    if not blocking:
+        for base_uri in base_uris:
+            _enqueue(base_uri)
+        return curies
+
+    fetched_prefixes = data.sparql_async.gather(
+        *[data.sparql_async.run(_try_fetch_prefix, base_uri) for base_uri in base_uris]
+    )
+    for base_uri, prefix in zip(base_uris, fetched_prefixes):
+        if prefix is not None:
+            for uri, localname in unknown[base_uri]:
+                curies[uri] = f"{prefix}:{localname}"
+
+    return curies
+
+
+_example_hosts = {"example.org", "example.com", "example.net"}
+
+cli = AppGroup("curie", help="Manage the prefixes used to shorten URIs to curies.")
+
+
+@cli.command("refresh-prefixes")
+@click.option(
+    "--url",
+    default="https://prefix.cc/popular/all.file.json",
+    show_default=True,
+    help="JSON object of prefix to namespace, ordered by preference.",
+)
+@click.option(
+    "--output",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=snapshot_path,
+    show_default=True,
+)
+def refresh_prefixes(url: str, output: Path) -> None:
+    """Download a prefix registry and write it as the prefix snapshot."""
+    response = requests.get(url, timeout=60)
+    response.raise_for_status()
+
+    lines = [
+        f"{prefix}\t{namespace}\n"
+        for prefix, namespace in response.json().items()
+        if namespace.startswith(("http://", "https://"))
+        and not any(char in prefix + namespace for char in "\t\n\r")
+        # Placeholder namespaces used in examples.
+        and urlsplit(namespace).hostname not in _example_hosts
+    ]
+    output.write_text("".join(lines), encoding="utf-8")
+    click.echo(f"Wrote {len(lines)} prefixes to {output}")
+
+
+def stats() -> dict:
+    return {
+        "fetched_prefixes": fetched.stats(),
+        "not_found": not_found.stats(),
+        "pending": len(_pending),
+    }
+
+
+def init_app(app) -> None:
+    global external_lookup, blocking, background_workers, max_pending
+    global not_found_ttl, cache_path, save_interval
+
+    external_lookup = app.config["CURIE_EXTERNAL_LOOKUP"]
+    blocking = app.config["CURIE_EXTERNAL_LOOKUP_BLOCKING"]
+    background_workers = app.config["CURIE_EXTERNAL_LOOKUP_WORKERS"]
+    max_pending = app.config["CURIE_EXTERNAL_LOOKUP_MAX_PENDING"]
+
+    fetched.configure(
+        maxsize=app.config["CURIE_PREFIXES_MAXSIZE"],
+        ttl=app.config["CURIE_PREFIXES_TTL"],
+    )
+    not_found.maxsize = app.config["CURIE_NOT_FOUND_MAXSIZE"]
+    not_found_ttl = app.config["CURIE_NOT_FOUND_TTL"]
+    not_found.clear()
+    cache_path = (
+        Path(app.config["CURIE_CACHE_PATH"]) if app.config["CURIE_CACHE_PATH"] else None
+    )
+    save_interval = app.config["CURIE_CACHE_SAVE_INTERVAL"]
+    if cache_path is not None:
+        curie_cache.load(cache_path, fetched, not_found)
+        # Save what was fetched since the last save when the worker exits.
+        atexit.register(flush)
+    app.cli.add_command(cli)
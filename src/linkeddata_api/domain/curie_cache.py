@@ -0,0 +1,116 @@
+import fcntl
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from linkeddata_api.data.cache import LRUCache
+from linkeddata_api.domain.prefix_trie import PrefixTrie
+
+
+class FetchedPrefixes:
+    """Prefixes fetched from the external prefix service.
+
+    A bounded LRU cache where each namespace has a time-to-live, indexed by a `PrefixTrie`
+    for longest-prefix lookups. Evicted and expired namespaces are removed from the trie.
+    """
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 30 * 24 * 60 * 60) -> None:
+        self.ttl = ttl
+        self._trie = PrefixTrie()
+        self._cache = LRUCache(
+            maxsize, on_evict=lambda namespace, _: self._trie.remove(namespace)
+        )
+
+    def configure(self, maxsize: int, ttl: float) -> None:
+        self._cache.maxsize = maxsize
+        self.ttl = ttl
+        self.clear()
+
+    def longest_match(self, uri: str) -> Optional[tuple[str, str]]:
+        """The (namespace, prefix) of the longest namespace `uri` starts with that has
+        not expired, or None."""
+        for match in reversed(self._trie.matches(uri)):
+            # Also marks the namespace as recently used, or removes it if it expired.
+            if self._cache.get(match[0]) is not None:
+                return match
+        return None
+
+    def add(self, namespace: str, prefix: str, ttl: Optional[float] = None) -> None:
+        self._trie.add(namespace, prefix)
+        self._cache.set(namespace, prefix, self.ttl if ttl is None else ttl)
+
+    def items(self) -> list[tuple[str, str, float]]:
+        """Namespaces as (namespace, prefix, seconds to live)."""
+        return self._cache.items()
+
+    def clear(self) -> None:
+        self._cache.clear()
+        self._trie = PrefixTrie()
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def stats(self) -> dict[str, int]:
+        return self._cache.stats()
+
+
+_file_lock = threading.Lock()
+
+
+def load(path: Path, prefixes: FetchedPrefixes, not_found: LRUCache) -> None:
+    """Add the namespaces in a file written by `save` that have not expired."""
+    try:
+        with open(path, encoding="utf-8") as file:
+            content = json.load(file)
+    except FileNotFoundError:
+        return
+
+    now = time.time()
+    for namespace, (prefix, expires) in content.get("prefixes", {}).items():
+        if expires > now:
+            prefixes.add(namespace, prefix, expires - now)
+    for namespace, expires in content.get("not_found", {}).items():
+        if expires > now:
+            not_found.set(namespace, True, expires - now)
+
+
+def save(path: Path, prefixes: FetchedPrefixes, not_found: LRUCache) -> None:
+    """Write the fetched prefixes and the namespaces without a prefix to a file.
+
+    Namespaces already in the file that have not expired are kept, so worker processes
+    sharing the file don't drop each other's namespaces. Reading and replacing the file
+    is guarded by a lock file, `<path>.lock`, that the processes share. The file is
+    replaced atomically, so it's never read partly written.
+    """
+    now = time.time()
+    content = {
+        "prefixes": {
+            namespace: [prefix, now + ttl] for namespace, prefix, ttl in prefixes.items()
+        },
+        "not_found": {namespace: now + ttl for namespace, _, ttl in not_found.items()},
+    }
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with _file_lock, open(path.with_name(f"{path.name}.lock"), "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            with open(path, encoding="utf-8") as file:
+                existing = json.load(file)
+        except (FileNotFoundError, ValueError):
+            existing = {}
+
+        for namespace, (prefix, expires) in existing.get("prefixes", {}).items():
+            if expires > now:
+                content["prefixes"].setdefault(namespace, [prefix, expires])
+        for namespace, expires in existing.get("not_found", {}).items():
+            if expires > now:
+                content["not_found"].setdefault(namespace, expires)
+
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            json.dump(content, file)
+        os.replace(tmp_path, path)
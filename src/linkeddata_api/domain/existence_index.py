@@ -0,0 +1,172 @@
+import hashlib
+import logging
+import math
+import sys
+import threading
+import time
+from array import array
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Fetches a page of distinct subject IRIs from a SPARQL endpoint, given the endpoint,
+# the page size and the offset.
+FetchPage = Callable[[str, int, int], list[str]]
+
+
+def _hashes(item: str) -> tuple[int, int]:
+    digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+    return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little")
+
+
+class BloomFilter:
+    """A fixed-size set of strings that can only tell for sure that a string is not in it.
+
+    Sized for `capacity` strings with a false positive rate of `error_rate`.
+    Uses double hashing of one 128-bit digest per string.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01) -> None:
+        capacity = max(capacity, 1)
+        self.size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, h1: int, h2: int) -> list[int]:
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add_hashes(self, h1: int, h2: int) -> None:
+        for position in self._positions(h1, h2):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def add(self, item: str) -> None:
+        self.add_hashes(*_hashes(item))
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(*_hashes(item))
+        )
+
+    def false_positive_rate(self) -> float:
+        """Expected false positive rate for the strings added."""
+        return (1 - math.exp(-self.hash_count * self.count / self.size)) ** self.hash_count
+
+    def memory_bytes(self) -> int:
+        return sys.getsizeof(self._bits)
+
+
+class ExistenceIndex:
+    """Subjects of a repository, in a Bloom filter rebuilt in the background.
+
+    Built from pages of the distinct subject IRIs of the repository. The filter is
+    sized for the number of subjects once all pages are read, and then replaces the
+    previous filter. A URI not in the filter is not a subject of the repository as
+    of the last build. A URI in the filter may be a false positive.
+
+    Until the first build finishes, `loaded` is False and lookups must go to the repository.
+    """
+
+    def __init__(
+        self,
+        sparql_endpoint: str,
+        fetch_page: FetchPage,
+        page_size: int = 50000,
+        error_rate: float = 0.01,
+        rebuild_interval: float = 60 * 60,
+    ) -> None:
+        self.sparql_endpoint = sparql_endpoint
+        self.page_size = page_size
+        self.error_rate = error_rate
+        self.rebuild_interval = rebuild_interval
+        self.loaded = False
+        self.builds = 0
+        self.errors = 0
+        # Positives confirmed with a query, and how many of them were false.
+        self.checked_positives = 0
+        self.false_positives = 0
+        self._fetch_page = fetch_page
+        self._filter = BloomFilter(0, error_rate)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def __contains__(self, uri: str) -> bool:
+        return uri in self._filter
+
+    def build(self) -> None:
+        """Read all subjects and replace the filter."""
+        started = time.monotonic()
+        # 16 bytes per subject while building, instead of the subject strings.
+        first, second = array("Q"), array("Q")
+        offset = 0
+        while True:
+            page = self._fetch_page(self.sparql_endpoint, self.page_size, offset)
+            for uri in page:
+                h1, h2 = _hashes(uri)
+                first.append(h1)
+                second.append(h2)
+            if len(page) < self.page_size:
+                break
+            offset += self.page_size
+
+        bloom_filter = BloomFilter(len(first), self.error_rate)
+        for h1, h2 in zip(first, second):
+            bloom_filter.add_hashes(h1, h2)
+        self._filter = bloom_filter
+        self.loaded = True
+        self.builds += 1
+        logger.info(
+            "Built existence index of %s subjects of %s in %.1fs",
+            bloom_filter.count,
+            self.sparql_endpoint,
+            time.monotonic() - started,
+        )
+
+    def record_checked(self, positives: int, false_positives: int) -> None:
+        with self._lock:
+            self.checked_positives += positives
+            self.false_positives += false_positives
+
+    def start(self) -> None:
+        """Build and rebuild the filter in a background thread, once."""
+        with self._lock:
+            # Started on first use, so each forked worker process has its own thread.
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="existence-index", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            try:
+                self.build()
+            except Exception as err:
+                self.errors += 1
+                logger.warning(
+                    "Existence index build failed for %s: %s", self.sparql_endpoint, err
+                )
+            time.sleep(self.rebuild_interval)
+
+    def stats(self) -> dict:
+        bloom_filter = self._filter
+        return {
+            "loaded": self.loaded,
+            "size": bloom_filter.count,
+            "memory_bytes": bloom_filter.memory_bytes(),
+            "bits": bloom_filter.size,
+            "hashes": bloom_filter.hash_count,
+            "expected_false_positive_rate": bloom_filter.false_positive_rate(),
+            "checked_positives": self.checked_positives,
+            "false_positives": self.false_positives,
+            "observed_false_positive_rate": (
+                self.false_positives / self.checked_positives
+                if self.checked_positives
+                else 0.0
+            ),
+            "builds": self.builds,
+            "errors": self.errors,
+        }
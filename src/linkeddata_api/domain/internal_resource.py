@@ -1,6 +1,14 @@
+from typing import Iterable
+
 from jinja2 import Template
 
 from linkeddata_api import data
+from linkeddata_api.domain.existence_index import ExistenceIndex
+
+# Existence indexes by SPARQL endpoint. Configured by `init_app`.
+indexes: dict[str, ExistenceIndex] = {}
+# Confirm URIs found in an index with a query, since they may be false positives.
+confirm_positives = True
 
 
 def _get_from_list_query(uris: list[str]) -> str:
@@ -22,26 +30,153 @@ def _get_from_list_query(uris: list[str]) -> str:
     return template.render(uris=uris if uris else ["https://empty"])
 
 
+def _subjects_query(limit: int, offset: int) -> str:
+    # Ordered, since pages of an unordered query may overlap and skip subjects,
+    # which would then be missing from the existence index.
+    template = Template(
+        """
+        SELECT DISTINCT ?uri
+        WHERE {
+            ?uri ?p ?o .
+            FILTER(isIRI(?uri))
+        }
+        ORDER BY ?uri
+        LIMIT {{ limit }}
+        OFFSET {{ offset }}
+    """
+    )
+    return template.render(limit=limit, offset=offset)
+
+
+def _fetch_subjects(sparql_endpoint: str, limit: int, offset: int) -> list[str]:
+    query = _subjects_query(limit, offset)
+
+    rows = data.sparql.select(query, sparql_endpoint, bulk=True)
+
+    subjects = []
+
+    for row in rows:
+        # Some stores return a single empty row if nothing matched.
+        if not row:
+            continue
+
+        try:
+            subjects.append(row["uri"].value)
+        except KeyError as err:
+            raise data.exceptions.SPARQLResultJSONError(
+                f"Unexpected SPARQL result row.\n{row}\n{err}"
+            ) from err
+
+    return subjects
+
+
 def get_from_list(
     uris: list[str],
     sparql_endpoint: str,
-) -> dict[str, str]:
+    use_index: bool = False,
+) -> dict[str, bool]:
+    """Returns a dict of uri keys and whether the SPARQL endpoint has statements about them.
+
+    With `use_index`, if the SPARQL endpoint has a built existence index, URIs not in
+    it are answered without a query, and only the URIs in it are queried unless
+    `confirm_positives` is off. The index misses resources added since it was built,
+    so only use it where a wrong answer is acceptable, such as for the internal flags
+    of links.
+
+    Large lists are queried in chunks that run concurrently.
+    """
+    return_results, uris = get_known(uris, sparql_endpoint, use_index)
+
+    confirmed = {}
+    for chunk_results in data.sparql_async.map_chunks(_get_chunk, uris, sparql_endpoint):
+        confirmed.update(chunk_results)
+    remember(uris, sparql_endpoint, confirmed)
+
+    return_results.update(confirmed)
+    return return_results
+
+
+def get_known(
+    uris: Iterable[str],
+    sparql_endpoint: str,
+    use_index: bool = True,
+) -> tuple[dict[str, bool], list[str]]:
+    """Look up uris in the existence index of the SPARQL endpoint, without querying.
+
+    URIs not in the index are answered as not internal, although they may have been
+    added to the SPARQL endpoint since the index was built. Without `use_index`, all
+    uris are to be queried.
+
+    :return: The uris answered by the index, and the uris to query.
+    """
+    uris = list(dict.fromkeys(uris))
+
+    index = indexes.get(sparql_endpoint) if use_index else None
+    if index is None:
+        return {}, uris
+    index.start()
+    if not index.loaded:
+        return {}, uris
+
+    positives = [uri for uri in uris if uri in index]
+    return_results = dict.fromkeys(uris, False)
+    if not confirm_positives:
+        return_results.update(dict.fromkeys(positives, True))
+        return return_results, []
+    return return_results, positives
+
+
+def remember(uris: list[str], sparql_endpoint: str, results: dict[str, bool]) -> None:
+    """Record how many of the uris `get_known` found in the index were false positives."""
+    index = indexes.get(sparql_endpoint)
+    if index is None or not index.loaded:
+        return
+    # The index may have been built since `get_known`.
+    positives = [uri for uri in uris if uri in index]
+    if positives:
+        index.record_checked(
+            len(positives), sum(1 for uri in positives if not results.get(uri))
+        )
+
+
+def _get_chunk(
+    uris: list[str],
+    sparql_endpoint: str,
+) -> dict[str, bool]:
     query = _get_from_list_query(uris)
 
-    result = data.sparql.post(query, sparql_endpoint).json()
+    rows = data.sparql.select(query, sparql_endpoint, ttl=data.cache.ttl("exists"))
 
     return_results = {}
 
-    try:
-        rows = result["results"]["bindings"]
-        for row in rows:
-            uri = str(row["uri"]["value"])
-            internal = str(row["internal"]["value"])
-            return_results[uri] = True if internal == "true" else False
-
-    except KeyError as err:
-        raise data.exceptions.SPARQLResultJSONError(
-            f"Unexpected SPARQL result set.\n{result}\n{err}"
-        ) from err
+    for row in rows:
+        try:
+            return_results[row["uri"].value] = row["internal"].value == "true"
+        except KeyError as err:
+            raise data.exceptions.SPARQLResultJSONError(
+                f"Unexpected SPARQL result row.\n{row}\n{err}"
+            ) from err
 
     return return_results
+
+
+def stats() -> dict:
+    return {
+        sparql_endpoint: index.stats() for sparql_endpoint, index in indexes.items()
+    }
+
+
+def init_app(app) -> None:
+    global indexes, confirm_positives
+
+    confirm_positives = app.config["EXISTENCE_INDEX_CONFIRM_POSITIVES"]
+    indexes = {
+        sparql_endpoint: ExistenceIndex(
+            sparql_endpoint,
+            _fetch_subjects,
+            page_size=app.config["EXISTENCE_INDEX_PAGE_SIZE"],
+            error_rate=app.config["EXISTENCE_INDEX_ERROR_RATE"],
+            rebuild_interval=app.config["EXISTENCE_INDEX_REBUILD_INTERVAL"],
+        )
+        for sparql_endpoint in app.config["EXISTENCE_INDEX_REPOSITORIES"]
+    }
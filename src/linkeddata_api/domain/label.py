@@ -1,181 +1,380 @@
-from typing import Union
+from collections import defaultdict
+from typing import Iterable, Optional, Union
 
 from jinja2 import Template
 
 from linkeddata_api import data
+from linkeddata_api.data.cache import LRUCache
+from linkeddata_api.domain import resolution_context
+from linkeddata_api.domain.label_snapshot import LabelSnapshot
+from linkeddata_api.domain.prefix_trie import PrefixTrie
+
+# Namespace to the SPARQL endpoint of the repository with the labels of its URIs.
+# Labels of other URIs are looked up in the SPARQL endpoint of the request.
+# Configured by `init_app`.
+repositories = PrefixTrie(
+    {
+        "http://linked.data.gov.au/def/tern-cv/": "https://graphdb.tern.org.au/repositories/tern_vocabs_core",
+    }
+)
+
+# Preferred language tags of labels, most preferred first. Configured by `init_app`.
+default_languages = ["en"]
+# Labels are ranked by the two-digit property and language ranks the query prepends to them,
+# so the languages after the 88th are ignored.
+_rank_width = 4
+_max_languages = 88
+
+# Labels of all resources of the vocabulary repositories by SPARQL endpoint, for the
+# default languages. Configured by `init_app`.
+snapshots: dict[str, LabelSnapshot] = {}
+
+# Label cache settings. Configured by `init_app`.
+cache_enabled = True
+cache_ttl = 3600
+# Time-to-live of URIs without a label, so that labels added to the store show up sooner.
+cache_negative_ttl = 600
+# Labels by SPARQL endpoint and URI. URIs without a label are cached as "".
+_cache = LRUCache(maxsize=50000)
+
+
+def _cache_key(uri: str, sparql_endpoint: str, languages: list[str]) -> str:
+    return f"{sparql_endpoint} {','.join(languages)} {uri}"
+
+
+def _repository(uri: str, sparql_endpoint: str) -> str:
+    """The SPARQL endpoint to look up the label of `uri` in."""
+    match = repositories.longest_match(uri)
+    return match[1] if match is not None else sparql_endpoint
+
+
+def _cache_set(
+    uri: str, sparql_endpoint: str, languages: list[str], label: Union[str, None]
+) -> None:
+    key = _cache_key(uri, sparql_endpoint, languages)
+    if label:
+        _cache.set(key, label, cache_ttl)
+    else:
+        _cache.set(key, "", cache_negative_ttl)
 
 
 def get(
     uri: str,
     sparql_endpoint: str,
+    languages: Optional[list[str]] = None,
 ) -> Union[str, None]:
     """
     Returns a label or None if no label found.
+
+    URIs in a namespace of `repositories` are looked up in that repository instead.
+    See `get_from_list` for how the label is chosen.
     """
-    # TODO: Currently, we try and fetch from TERN's controlled vocabularies.
-    # We may want to also fetch with a SERVICE query from other repositories in the future.
-    template = Template(
-        """
-        PREFIX skos: <http://www.w3.org/2004/02/skos/core#>
-        PREFIX dcterms: <http://purl.org/dc/terms/>
-        PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-        PREFIX schema: <https://schema.org/>
-        PREFIX sdo: <http://schema.org/>
-
-        SELECT DISTINCT ?label
-        WHERE {
-            {% if uri.startswith('http://linked.data.gov.au/def/tern-cv/') %}
-            {
-                SERVICE <https://graphdb.tern.org.au/repositories/tern_vocabs_core> {
-                    BIND(<{{ uri }}> as ?uri)
-
-                    # Order from most preferred to least preferred
-                    VALUES (?labelProperty) {
-                        (skos:prefLabel)
-                        (rdfs:label)
-                        (dcterms:title)
-                        (schema:name)
-                        (sdo:name)
-                        (dcterms:identifier)
-                    }
-                    ?uri ?labelProperty ?label .
-                }
-            }
-            {% else %}
-            {
-                BIND(<{{ uri }}> as ?uri)
-
-                # Order from most preferred to least preferred
-                VALUES (?labelProperty) {
-                    (skos:prefLabel)
-                    (rdfs:label)
-                    (dcterms:title)
-                    (schema:name)
-                    (sdo:name)
-                    (dcterms:identifier)
-                }
-                ?uri ?labelProperty ?label .
-            }
-            {% endif %}
-        }
-        LIMIT 1
+    return get_from_list([uri], sparql_endpoint, languages).get(uri)
+
+
+_labels_template = Template(
     """
-    )
-    query = template.render(uri=uri)
-
-    result = data.sparql.post(query, sparql_endpoint).json()
-
-    try:
-        rows = result["results"]["bindings"]
-        for row in rows:
-            return row["label"]["value"]
-    except KeyError as err:
-        raise data.exceptions.SPARQLResultJSONError(
-            f"Unexpected SPARQL result set.\n{result}\n{err}"
-        ) from err
-
-
-def _get_from_list_query(uris: list[str]) -> str:
-    # TODO: Currently, we try and fetch from TERN's controlled vocabularies.
-    # We may want to also fetch with a SERVICE query from other repositories in the future.
-    tern_cv_uris = [uri for uri in uris if uri.startswith("http://linked.data.gov.au/def/tern-cv/")]
-    uris = [uri for uri in uris if not uri.startswith("http://linked.data.gov.au/def/tern-cv/")]
-
-    template = Template(
-        """
-        PREFIX skos: <http://www.w3.org/2004/02/skos/core#>
-        PREFIX dcterms: <http://purl.org/dc/terms/>
-        PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-        PREFIX schema: <https://schema.org/>
-        PREFIX sdo: <http://schema.org/>
-
-        SELECT DISTINCT ?uri ?label
-        WHERE {
-            {
-                SELECT DISTINCT ?uri ?label
-                WHERE {
-                    {
-                        VALUES (?uri) {
-                            {% for uri in uris %}
-                            (<{{ uri }}>)
-                            {% endfor %}
-                        }
-                        {
-                            # Order from least preferred to most preferred
-                            VALUES (?labelProperty) {
-                                (dcterms:identifier)
-                                (sdo:name)
-                                (schema:name)
-                                (dcterms:title)
-                                (rdfs:label)
-                                (skos:prefLabel)
-                            }
-                            ?uri ?labelProperty ?label .
-                        }
-                    }
-                }
-            }
-            UNION {
-                SELECT DISTINCT ?uri ?label
-                WHERE {
-                    VALUES (?uri) {
-                        {% for uri in tern_cv_uris %}
-                        (<{{ uri }}>)
-                        {% endfor %}
-                    }
-                    SERVICE <https://graphdb.tern.org.au/repositories/tern_vocabs_core> {
-                        # Order from least preferred to most preferred
-                        VALUES (?labelProperty) {
-                            (dcterms:identifier)
-                            (sdo:name)
-                            (schema:name)
-                            (dcterms:title)
-                            (rdfs:label)
-                            (skos:prefLabel)
-                        }
-                        ?uri ?labelProperty ?label .
-                    }
+    PREFIX skos: <http://www.w3.org/2004/02/skos/core#>
+    PREFIX dcterms: <http://purl.org/dc/terms/>
+    PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
+    PREFIX schema: <https://schema.org/>
+    PREFIX sdo: <http://schema.org/>
+
+    SELECT ?uri (MIN(?rankedLabel) AS ?label){% if snapshot %} (MAX(?modified) AS ?lastModified){% endif %}{% if exists %} ?internal{% endif %}
+    WHERE {
+        {% if exists %}
+        # In a subquery, as some stores drop the uris that don't match the OPTIONAL otherwise.
+        {
+            SELECT ?uri
+            WHERE {
+                VALUES (?uri) {
+                    {% for uri in uris %}
+                    (<{{ uri }}>)
+                    {% endfor %}
                 }
             }
         }
+        BIND(EXISTS { ?uri ?p ?o } AS ?internal)
+        OPTIONAL {
+        {% elif uris is not none %}
+        VALUES (?uri) {
+            {% for uri in uris %}
+            (<{{ uri }}>)
+            {% endfor %}
+        }
+        {% endif %}
+        # Order from most preferred to least preferred
+        VALUES (?labelProperty ?propertyRank) {
+            (skos:prefLabel "10")
+            (rdfs:label "11")
+            (dcterms:title "12")
+            (schema:name "13")
+            (sdo:name "14")
+            (dcterms:identifier "15")
+        }
+        ?uri ?labelProperty ?value .
+        {% if modified_since %}
+        ?uri dcterms:modified ?modified .
+        FILTER(STR(?modified) > "{{ modified_since }}")
+        {% elif snapshot %}
+        OPTIONAL { ?uri dcterms:modified ?modified }
+        {% endif %}
+        # Preferred languages in order, then no language tag, then other languages.
+        BIND(
+            {% for language in languages %}
+            IF(LANGMATCHES(LANG(?value), "{{ language }}"), "{{ 10 + loop.index0 }}",
+            {% endfor %}
+            IF(LANG(?value) = "", "98", "99")
+            {% for language in languages %}){% endfor %}
+            AS ?languageRank
+        )
+        # The lowest ranked label of each uri sorts first. Ties are broken by the label.
+        BIND(CONCAT(?propertyRank, ?languageRank, STR(?value)) AS ?rankedLabel)
+        {% if exists %}
+        }
+        {% endif %}
+    }
+    GROUP BY ?uri{% if exists %} ?internal{% endif %}
+"""
+)
+
+
+def get_from_list_query(
+    uris: list[str], languages: list[str], exists: bool = False
+) -> str:
+    """Query the label of each uri as ?label, to be read with `parse_label`.
+
+    :param exists: Also select whether the SPARQL endpoint has statements about
+        each uri as ?internal, like `internal_resource`.
     """
-    )
     # Virtuoso does not allow empty list in VALUES clase, so we fake a useless uri
-    query = template.render(
+    query = _labels_template.render(
         uris=uris if uris else ["https://empty"],
-        tern_cv_uris=tern_cv_uris if tern_cv_uris else ["https://empty"],
+        languages=languages[:_max_languages],
+        exists=exists,
     )
     return query
 
 
+def parse_label(value: str) -> str:
+    """The label in a ?label value selected by `get_from_list_query`, without its ranks."""
+    return value[_rank_width:]
+
+
+def _snapshot_query(languages: list[str], modified_since: Optional[str] = None) -> str:
+    """Query the labels of all resources, or of the resources modified after `modified_since`."""
+    return _labels_template.render(
+        uris=None,
+        languages=languages[:_max_languages],
+        snapshot=True,
+        modified_since=(modified_since or "").replace("\\", "\\\\").replace('"', '\\"'),
+    )
+
+
+def _fetch_snapshot(
+    sparql_endpoint: str, modified_since: Optional[str]
+) -> tuple[dict[str, str], Optional[str]]:
+    query = _snapshot_query(default_languages, modified_since)
+
+    rows = data.sparql.select(query, sparql_endpoint, bulk=True)
+
+    labels = {}
+    modified = None
+
+    for row in rows:
+        if not row:
+            continue
+
+        try:
+            labels[row["uri"].value] = parse_label(row["label"].value)
+        except KeyError as err:
+            raise data.exceptions.SPARQLResultJSONError(
+                f"Unexpected SPARQL result row.\n{row}\n{err}"
+            ) from err
+        # Unbound for resources without dcterms:modified.
+        if "lastModified" in row:
+            modified = max(modified or "", row["lastModified"].value)
+
+    return labels, modified
+
+
 def get_from_list(
     uris: list[str],
     sparql_endpoint: str,
+    languages: Optional[list[str]] = None,
 ) -> dict[str, str]:
     """Returns a dict of uri keys and label values.
 
-    In addition to the SPARQL endpoint provided, it also fetches labels
-    from TERN's controlled vocabularies via a federated SPARQL query.
+    The label of a uri is the value of its most preferred label property, in the
+    first of `languages` it has a value in. Values without a language tag come next,
+    then values in other languages. Ties are broken by the lowest value, so the
+    label is the same each time. The labels are chosen by the SPARQL endpoint,
+    which returns one row per uri.
+
+    URIs in a namespace of `repositories` are looked up in that repository, and
+    the others in the SPARQL endpoint provided. The repositories are queried
+    directly and concurrently.
+
+    Labels in the default languages are kept in the request's `resolution_context`,
+    and those from a repository in `snapshots` are looked up in its snapshot once
+    it's loaded. Other labels are cached per SPARQL endpoint and
+    URI, including URIs without a label, and only the URIs not in the cache are queried.
+
+    :param languages: Preferred language tags, most preferred first. Defaults to
+        `default_languages`.
+    """
+    if languages is None:
+        languages = default_languages
+
+    # Labels already looked up by this request.
+    context = resolution_context.current() if languages == default_languages else None
+    if context is not None:
+        labels, uris = context.get_labels(sparql_endpoint, list(dict.fromkeys(uris)))
+    else:
+        labels = {}
+
+    found, misses = get_known(uris, sparql_endpoint, languages)
+    found.update(fetch(misses, languages))
+    if context is not None:
+        context.set_labels(sparql_endpoint, uris, found)
+
+    labels.update(found)
+    return labels
+
+
+def get_known(
+    uris: Iterable[str],
+    sparql_endpoint: str,
+    languages: list[str],
+) -> tuple[dict[str, str], dict[str, list[str]]]:
+    """Look up labels in the snapshots and the cache, without querying.
+
+    :return: The labels found, and the SPARQL endpoint to the uris to query it for.
     """
-    query = _get_from_list_query(uris)
+    labels = {}
+    misses: dict[str, list[str]] = defaultdict(list)
+    for uri in dict.fromkeys(uris):
+        repository = _repository(uri, sparql_endpoint)
+        snapshot = snapshots.get(repository) if languages == default_languages else None
+        if snapshot is not None:
+            snapshot.start()
+            if snapshot.loaded:
+                label = snapshot.get(uri)
+                if label is not None:
+                    labels[uri] = label
+                continue
+
+        cached = (
+            _cache.get(_cache_key(uri, repository, languages)) if cache_enabled else None
+        )
+        if cached is None:
+            misses[repository].append(uri)
+        elif cached:
+            labels[uri] = cached
+
+    return labels, misses
+
+
+def fetch(misses: dict[str, list[str]], languages: list[str]) -> dict[str, str]:
+    """Query the labels of the uris `get_known` didn't find, each SPARQL endpoint concurrently."""
+    if len(misses) > 1:
+        results = data.sparql_async.gather(
+            *[
+                data.sparql_async.run(
+                    _get_from_list, repository_uris, repository, languages
+                )
+                for repository, repository_uris in misses.items()
+            ]
+        )
+    else:
+        results = [
+            _get_from_list(repository_uris, repository, languages)
+            for repository, repository_uris in misses.items()
+        ]
+
+    labels = {}
+    for (repository, repository_uris), fetched in zip(misses.items(), results):
+        remember(repository_uris, repository, languages, fetched)
+        labels.update(fetched)
+    return labels
+
 
-    result = data.sparql.post(query, sparql_endpoint).json()
+def remember(
+    uris: list[str], sparql_endpoint: str, languages: list[str], labels: dict[str, str]
+) -> None:
+    """Cache the labels queried for `uris`. The uris without a label are cached as such."""
+    if cache_enabled:
+        for uri in uris:
+            _cache_set(uri, sparql_endpoint, languages, labels.get(uri))
 
+
+def _get_from_list(
+    uris: list[str],
+    sparql_endpoint: str,
+    languages: list[str],
+) -> dict[str, str]:
+    """Query the labels of `uris` in chunks that run concurrently."""
     labels = {}
+    for chunk_labels in data.sparql_async.map_chunks(
+        _get_chunk, list(dict.fromkeys(uris)), sparql_endpoint, languages
+    ):
+        labels.update(chunk_labels)
+    return labels
+
+
+def _get_chunk(
+    uris: list[str],
+    sparql_endpoint: str,
+    languages: list[str],
+) -> dict[str, str]:
+    query = get_from_list_query(uris, languages)
 
-    try:
-        rows = result["results"]["bindings"]
-        for row in rows:
-            uri = str(row["uri"]["value"])
-            label = str(row["label"]["value"])
-            labels[uri] = label
+    rows = data.sparql.select(query, sparql_endpoint, ttl=data.cache.ttl("label"))
+
+    labels = {}
 
-    except KeyError as err:
-        if result["results"]["bindings"] == [{}]:
-            return {}
+    for row in rows:
+        # Some stores return a single empty row if nothing matched.
+        if not row:
+            continue
 
-        raise data.exceptions.SPARQLResultJSONError(
-            f"Unexpected SPARQL result set.\n{result}\n{err}"
-        ) from err
+        try:
+            labels[row["uri"].value] = parse_label(row["label"].value)
+        except KeyError as err:
+            raise data.exceptions.SPARQLResultJSONError(
+                f"Unexpected SPARQL result row.\n{row}\n{err}"
+            ) from err
 
     return labels
+
+
+def stats() -> dict:
+    return {
+        "cache": _cache.stats(),
+        "snapshots": {
+            sparql_endpoint: snapshot.stats()
+            for sparql_endpoint, snapshot in snapshots.items()
+        },
+    }
+
+
+def init_app(app) -> None:
+    global repositories, default_languages, snapshots
+    global cache_enabled, cache_ttl, cache_negative_ttl
+
+    repositories = PrefixTrie(app.config["LABEL_REPOSITORIES"])
+    default_languages = app.config["LABEL_LANGUAGES"]
+    snapshots = {
+        sparql_endpoint: LabelSnapshot(
+            sparql_endpoint,
+            _fetch_snapshot,
+            refresh_interval=app.config["LABEL_SNAPSHOT_REFRESH_INTERVAL"],
+            full_refresh_interval=app.config["LABEL_SNAPSHOT_FULL_REFRESH_INTERVAL"],
+        )
+        for sparql_endpoint in app.config["LABEL_SNAPSHOT_REPOSITORIES"]
+    }
+    cache_enabled = app.config["LABEL_CACHE_ENABLED"]
+    cache_ttl = app.config["LABEL_CACHE_TTL"]
+    cache_negative_ttl = app.config["LABEL_CACHE_NEGATIVE_TTL"]
+    _cache.maxsize = app.config["LABEL_CACHE_MAXSIZE"]
+    _cache.clear()
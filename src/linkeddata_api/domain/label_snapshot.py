@@ -0,0 +1,114 @@
+import logging
+import sys
+import threading
+import time
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Fetches labels from a SPARQL endpoint, optionally only of resources modified after a
+# dcterms:modified value. Returns them with the latest dcterms:modified value seen.
+Fetch = Callable[[str, Optional[str]], tuple[dict[str, str], Optional[str]]]
+
+
+class LabelSnapshot:
+    """Labels of all resources of a repository, kept in memory.
+
+    Loaded with one query for the whole repository, then refreshed in the background
+    with the labels of resources whose dcterms:modified is later than the latest one seen.
+    Changes that don't update dcterms:modified, such as deleted resources, are picked up
+    by a full reload every `full_refresh_interval` seconds.
+
+    Until the first load finishes, `loaded` is False and lookups must go to the repository.
+    """
+
+    def __init__(
+        self,
+        sparql_endpoint: str,
+        fetch: Fetch,
+        refresh_interval: float = 600,
+        full_refresh_interval: float = 24 * 60 * 60,
+    ) -> None:
+        self.sparql_endpoint = sparql_endpoint
+        self.refresh_interval = refresh_interval
+        self.full_refresh_interval = full_refresh_interval
+        self.loaded = False
+        self.modified: Optional[str] = None
+        self.memory_bytes = 0
+        self.refreshes = 0
+        self.errors = 0
+        self._fetch = fetch
+        self._labels: dict[str, str] = {}
+        self._loaded_at = 0.0
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def get(self, uri: str) -> Optional[str]:
+        """The label of `uri`, or None if the repository has no label for it."""
+        return self._labels.get(uri)
+
+    def refresh(self) -> None:
+        """Reload all labels, or only the labels of recently modified resources."""
+        if (
+            not self.loaded
+            or time.monotonic() - self._loaded_at > self.full_refresh_interval
+        ):
+            started = time.monotonic()
+            labels, modified = self._fetch(self.sparql_endpoint, None)
+            # Replaced at once, so lookups never see a partly loaded snapshot.
+            self._labels = labels
+            self.modified = modified
+            self._loaded_at = started
+            self.loaded = True
+            logger.info(
+                "Loaded %s labels of %s", len(labels), self.sparql_endpoint
+            )
+        else:
+            labels, modified = self._fetch(self.sparql_endpoint, self.modified)
+            self._labels.update(labels)
+            if modified is not None:
+                self.modified = max(modified, self.modified or modified)
+        self.memory_bytes = _dict_size(self._labels)
+        self.refreshes += 1
+
+    def start(self) -> None:
+        """Load and refresh the labels in a background thread, once."""
+        with self._lock:
+            # Started on first use, so each forked worker process has its own thread.
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="label-snapshot", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            try:
+                self.refresh()
+            except Exception as err:
+                self.errors += 1
+                logger.warning(
+                    "Label snapshot refresh failed for %s: %s", self.sparql_endpoint, err
+                )
+            time.sleep(self.refresh_interval)
+
+    def __len__(self) -> int:
+        return len(self._labels)
+
+    def stats(self) -> dict:
+        return {
+            "loaded": self.loaded,
+            "size": len(self._labels),
+            "memory_bytes": self.memory_bytes,
+            "modified": self.modified,
+            "refreshes": self.refreshes,
+            "errors": self.errors,
+        }
+
+
+def _dict_size(labels: dict[str, str]) -> int:
+    """Approximate bytes used by a dict of strings, including the strings."""
+    return sys.getsizeof(labels) + sum(
+        sys.getsizeof(uri) + sys.getsizeof(label) for uri, label in labels.items()
+    )
@@ -0,0 +1,118 @@
+import threading
+from typing import Iterator, Optional
+
+# Key of a node's (namespace, prefix) value. Never a key of a child, which are single characters.
+_VALUE = ""
+
+
+class PrefixTrie:
+    """A namespace to prefix index that finds the longest namespace a URI starts with.
+
+    Lookups walk one node per character of the URI, independent of the number of prefixes.
+
+    The trie is copy-on-write. Adding a prefix copies the nodes on the namespace's path and
+    then replaces the root, so threads can look up without locks while prefixes are added.
+    """
+
+    def __init__(self, prefixes: Optional[dict[str, str]] = None) -> None:
+        self._root: dict = {}
+        self._size = 0
+        self._lock = threading.Lock()
+        self.update(prefixes or {})
+
+    def add(self, namespace: str, prefix: str) -> None:
+        self.update({namespace: prefix})
+
+    def update(self, prefixes: dict[str, str], replace: bool = True) -> None:
+        """Add many prefixes, copying each node at most once.
+
+        :param prefixes: Namespace to prefix
+        :param replace: Replace the prefix of namespaces already in the trie
+        """
+        with self._lock:
+            root = dict(self._root)
+            # Nodes already copied for this update, which can be changed in place.
+            copied = {id(root)}
+            for namespace, prefix in prefixes.items():
+                node = root
+                for char in namespace:
+                    child = node.get(char)
+                    if child is None:
+                        child = {}
+                        copied.add(id(child))
+                    elif id(child) not in copied:
+                        child = dict(child)
+                        copied.add(id(child))
+                    node[char] = child
+                    node = child
+                if _VALUE not in node:
+                    self._size += 1
+                elif not replace:
+                    continue
+                node[_VALUE] = (namespace, prefix)
+            self._root = root
+
+    def remove(self, namespace: str) -> None:
+        """Remove a namespace, if it's in the trie."""
+        with self._lock:
+            path = [dict(self._root)]
+            for char in namespace:
+                child = path[-1].get(char)
+                if child is None:
+                    return
+                child = dict(child)
+                path[-1][char] = child
+                path.append(child)
+            if path[-1].pop(_VALUE, None) is None:
+                return
+            self._size -= 1
+
+            # Drop the nodes that no longer lead to a namespace.
+            for char, node, parent in zip(
+                reversed(namespace), reversed(path[1:]), reversed(path[:-1])
+            ):
+                if node:
+                    break
+                del parent[char]
+            self._root = path[0]
+
+    def longest_match(self, uri: str) -> Optional[tuple[str, str]]:
+        """The (namespace, prefix) of the longest namespace `uri` starts with, or None."""
+        matches = self.matches(uri)
+        return matches[-1] if matches else None
+
+    def matches(self, uri: str) -> list[tuple[str, str]]:
+        """The (namespace, prefix) of every namespace `uri` starts with, shortest first."""
+        matches = []
+        node = self._root
+        for char in uri:
+            node = node.get(char)
+            if node is None:
+                break
+            value = node.get(_VALUE)
+            if value is not None:
+                matches.append(value)
+        return matches
+
+    def get(self, namespace: str) -> Optional[str]:
+        """The prefix of exactly `namespace`, or None."""
+        match = self.longest_match(namespace)
+        if match is not None and match[0] == namespace:
+            return match[1]
+        return None
+
+    def items(self) -> Iterator[tuple[str, str]]:
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            for key, value in node.items():
+                if key == _VALUE:
+                    yield value
+                else:
+                    stack.append(value)
+
+    def __contains__(self, namespace: str) -> bool:
+        return self.get(namespace) is not None
+
+    def __len__(self) -> int:
+        return self._size
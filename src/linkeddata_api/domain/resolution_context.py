@@ -0,0 +1,100 @@
+import threading
+from typing import Optional
+
+from flask import g, has_app_context
+
+from linkeddata_api.data.results import Row
+
+_lock = threading.Lock()
+
+
+class ResolutionContext:
+    """What the domain layer looked up for one API request.
+
+    Views build a resource from several domain calls that ask about the same URIs,
+    such as the items of its RDF lists, which are needed both as rows and for their
+    labels. Each is looked up once per request and then read from here.
+
+    Lookups of a request can run concurrently in worker threads, see `data.sparql_async`,
+    so updates are guarded by a lock.
+    """
+
+    def __init__(self) -> None:
+        # Rows of the RDF list items of a resource by SPARQL endpoint and resource.
+        self.list_items: dict[tuple[str, str], list[Row]] = {}
+        # Labels (None if there is none) and internal flags by SPARQL endpoint and URI.
+        self.labels: dict[tuple[str, str], Optional[str]] = {}
+        self.internal: dict[tuple[str, str], bool] = {}
+        self.curies: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def get_list_items(self, sparql_endpoint: str, uri: str) -> Optional[list[Row]]:
+        """Copies of the rows, or None if they haven't been looked up."""
+        rows = self.list_items.get((sparql_endpoint, uri))
+        if rows is None:
+            return None
+        return [dict(row) for row in rows]
+
+    def set_list_items(self, sparql_endpoint: str, uri: str, rows: list[Row]) -> None:
+        with self._lock:
+            self.list_items[(sparql_endpoint, uri)] = [dict(row) for row in rows]
+
+    def get_labels(
+        self, sparql_endpoint: str, uris: list[str]
+    ) -> tuple[dict[str, str], list[str]]:
+        """The labels of uris that were looked up, and the uris that weren't."""
+        labels = {}
+        misses = []
+        for uri in uris:
+            key = (sparql_endpoint, uri)
+            if key not in self.labels:
+                misses.append(uri)
+            elif self.labels[key] is not None:
+                labels[uri] = self.labels[key]
+        return labels, misses
+
+    def set_labels(
+        self, sparql_endpoint: str, uris: list[str], labels: dict[str, str]
+    ) -> None:
+        """Keep the labels of uris. The uris without one are kept as None."""
+        with self._lock:
+            for uri in uris:
+                self.labels[(sparql_endpoint, uri)] = labels.get(uri)
+
+    def get_internal(
+        self, sparql_endpoint: str, uris: list[str]
+    ) -> tuple[dict[str, bool], list[str]]:
+        """The internal flags of uris that were looked up, and the uris that weren't."""
+        internal = {}
+        misses = []
+        for uri in uris:
+            key = (sparql_endpoint, uri)
+            if key in self.internal:
+                internal[uri] = self.internal[key]
+            else:
+                misses.append(uri)
+        return internal, misses
+
+    def set_internal(
+        self, sparql_endpoint: str, uris: list[str], internal: dict[str, bool]
+    ) -> None:
+        with self._lock:
+            for uri in uris:
+                self.internal[(sparql_endpoint, uri)] = internal.get(uri, False)
+
+    def set_curies(self, curies: dict[str, str]) -> None:
+        with self._lock:
+            self.curies.update(curies)
+
+
+def current() -> Optional[ResolutionContext]:
+    """The resolution context of the current request, or None outside of a request."""
+    if not has_app_context():
+        return None
+    context = g.get("resolution_context")
+    if context is None:
+        with _lock:
+            context = g.get("resolution_context")
+            if context is None:
+                context = g.resolution_context = ResolutionContext()
+    return context
@@ -0,0 +1,127 @@
+from typing import Iterable, NamedTuple
+
+from linkeddata_api import data
+from linkeddata_api.domain import curie, internal_resource, label, resolution_context
+
+
+class Resolution(NamedTuple):
+    """Labels, internal flags and curies of a batch of URIs."""
+
+    # URIs without a label are not in labels.
+    labels: dict[str, str]
+    internal: dict[str, bool]
+    curies: dict[str, str]
+
+
+def resolve(
+    uris: Iterable[str],
+    sparql_endpoint: str,
+    curie_uris: Iterable[str] = (),
+) -> Resolution:
+    """Get the labels of uris, whether the SPARQL endpoint has statements about them,
+    and the curies of curie_uris.
+
+    Gives the same labels as `label.get_from_list` and the same flags as
+    `internal_resource.get_from_list` with `use_index`, but the labels to look up in
+    the SPARQL endpoint and the uris to check in it are queried together, in one query
+    per chunk of uris. The flags are only fit for links, since URIs added after the
+    existence index of the SPARQL endpoint was built are flagged as not internal.
+    Labels in other repositories are queried at the same time. Results are kept in the
+    request's `resolution_context`, so each uri is resolved once per request.
+
+    :param uris: URIs to get the labels and internal flags of
+    :param sparql_endpoint: SPARQL endpoint of the resource the URIs are linked to
+    :param curie_uris: URIs to get the curies of
+    """
+    uris = list(dict.fromkeys(uris))
+    curie_uris = list(dict.fromkeys(curie_uris))
+    languages = label.default_languages
+
+    # Labels, internal flags and curies already resolved by this request.
+    context = resolution_context.current()
+    if context is not None:
+        labels, label_uris = context.get_labels(sparql_endpoint, uris)
+        internal, internal_uris = context.get_internal(sparql_endpoint, uris)
+        curies = {uri: context.curies[uri] for uri in curie_uris if uri in context.curies}
+    else:
+        labels, label_uris = {}, uris
+        internal, internal_uris = {}, uris
+        curies = {}
+
+    known_labels, label_misses = label.get_known(label_uris, sparql_endpoint, languages)
+    known_internal, exists_misses = internal_resource.get_known(
+        internal_uris, sparql_endpoint
+    )
+    local_label_misses = label_misses.pop(sparql_endpoint, [])
+    combined_uris = list(dict.fromkeys(local_label_misses + exists_misses))
+
+    chunks, other_labels = [], {}
+    if combined_uris or label_misses:
+        chunks, other_labels = data.sparql_async.gather(
+            data.sparql_async.run(
+                data.sparql_async.map_chunks,
+                _get_chunk,
+                combined_uris,
+                sparql_endpoint,
+                languages,
+            ),
+            data.sparql_async.run(label.fetch, label_misses, languages),
+        )
+
+    local_labels: dict[str, str] = {}
+    confirmed: dict[str, bool] = {}
+    for chunk_labels, chunk_internal in chunks:
+        local_labels.update(chunk_labels)
+        confirmed.update(chunk_internal)
+
+    label.remember(local_label_misses, sparql_endpoint, languages, local_labels)
+    internal_resource.remember(exists_misses, sparql_endpoint, confirmed)
+
+    new_labels = {**known_labels, **other_labels}
+    new_labels.update(
+        {uri: local_labels[uri] for uri in local_label_misses if uri in local_labels}
+    )
+    new_internal = {**known_internal}
+    new_internal.update({uri: confirmed.get(uri, False) for uri in exists_misses})
+    new_curies = curie.get_many(uri for uri in curie_uris if uri not in curies)
+
+    if context is not None:
+        context.set_labels(sparql_endpoint, label_uris, new_labels)
+        context.set_internal(sparql_endpoint, internal_uris, new_internal)
+        context.set_curies(new_curies)
+
+    labels.update(new_labels)
+    internal.update(new_internal)
+    curies.update(new_curies)
+    return Resolution(labels, internal, curies)
+
+
+def _get_chunk(
+    uris: list[str],
+    sparql_endpoint: str,
+    languages: list[str],
+) -> tuple[dict[str, str], dict[str, bool]]:
+    query = label.get_from_list_query(uris, languages, exists=True)
+
+    rows = data.sparql.select(query, sparql_endpoint, ttl=data.cache.ttl("exists"))
+
+    labels = {}
+    internal = {}
+
+    for row in rows:
+        # Some stores return a single empty row if nothing matched.
+        if not row:
+            continue
+
+        try:
+            uri = row["uri"].value
+            internal[uri] = row["internal"].value == "true"
+        except KeyError as err:
+            raise data.exceptions.SPARQLResultJSONError(
+                f"Unexpected SPARQL result row.\n{row}\n{err}"
+            ) from err
+        # Unbound for uris without a label.
+        if "label" in row:
+            labels[uri] = label.parse_label(row["label"].value)
+
+    return labels, internal
@@ -9,12 +9,15 @@ from linkeddata_api.domain.viewer.entrypoints.utils import (
 
 
 def get_count(sparql_endpoint: str) -> int:
-    query = """
+    query = Template(
+        """
         PREFIX skos: <http://www.w3.org/2004/02/skos/core#>
         PREFIX dcterms: <http://purl.org/dc/terms/>
         PREFIX reg: <http://purl.org/linked-data/registry/>
         SELECT (COUNT(*) AS ?count)
-        FROM <http://www.ontotext.com/explicit>
+        {% if explicit_graph %}
+        FROM <{{ explicit_graph }}>
+        {% endif %}
         FROM <https://linked.data.gov.au/def/nrm>
         WHERE { 
             <https://linked.data.gov.au/def/nrm> dcterms:hasPart ?uri .
@@ -34,8 +37,11 @@ def get_count(sparql_endpoint: str) -> int:
             }
         }
     """
+    ).render(explicit_graph=data.dialects.get(sparql_endpoint).explicit_graph)
 
-    result = data.sparql.post(query, sparql_endpoint).json()
+    result = data.sparql.post(
+        query, sparql_endpoint, ttl=data.cache.ttl("entrypoint")
+    ).json()
 
     return int(result["results"]["bindings"][0]["count"]["value"])
 
@@ -61,7 +67,9 @@ def get(
             (SAMPLE(?_description) as ?description)
             (SAMPLE(?_created) as ?created)
             (SAMPLE(?_modified) as ?modified)
-        FROM <http://www.ontotext.com/explicit>
+        {% if explicit_graph %}
+        FROM <{{ explicit_graph }}>
+        {% endif %}
         FROM <https://linked.data.gov.au/def/nrm>
         WHERE { 
             <https://linked.data.gov.au/def/nrm> dcterms:hasPart ?uri .
@@ -81,9 +89,15 @@ def get(
         LIMIT {{ limit }}
         OFFSET {{ offset }}
     """
-    ).render(limit=20, offset=(page - 1) * limit)
+    ).render(
+        limit=20,
+        offset=(page - 1) * limit,
+        explicit_graph=data.dialects.get(sparql_endpoint).explicit_graph,
+    )
 
-    result = data.sparql.post(query, sparql_endpoint).json()
+    result = data.sparql.post(
+        query, sparql_endpoint, ttl=data.cache.ttl("entrypoint")
+    ).json()
 
     count = get_count(sparql_endpoint)
     more_pages_exist = False
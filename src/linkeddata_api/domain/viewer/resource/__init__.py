@@ -23,7 +23,10 @@ def handle_rdf_response(
 ) -> str:
     try:
         response = data.sparql.post(
-            f"DESCRIBE <{uri}>", sparql_endpoint, accept=format_
+            f"DESCRIBE <{uri}>",
+            sparql_endpoint,
+            accept=format_,
+            ttl=data.cache.ttl("resource"),
         )
     except RequestError as err:
         raise err
@@ -1,10 +1,13 @@
 import logging
-from typing import Optional, Union
+from typing import Iterable, Optional, Union
 from collections import defaultdict
 
 from rdflib import RDF
 
 from linkeddata_api import data, domain
+from linkeddata_api.data.results import XSD, Row, Term
+from linkeddata_api.domain import resolution_context
+from linkeddata_api.domain.terms import Resolution, resolve
 from linkeddata_api.domain.viewer.resource.json.profiles import (
     get_profile,
 )
@@ -15,39 +18,80 @@ from linkeddata_api.domain.viewer.resource.json.sort_property_objects import (
 logger = logging.getLogger(__name__)
 
 
-def _get_uris_from_rdf_list(uri: str, rows: list, sparql_endpoint: str) -> list[str]:
-    new_uris = []
-    for row in rows:
-        if row["o"]["type"] == "bnode" and row["listItem"]["value"] == "true":
-            # TODO: error handling - move empty result exception to nrm.sparql.post/nrm.sparql.get
-            query = f"""
-                PREFIX skos: <http://www.w3.org/2004/02/skos/core#>
-                PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#>
-                SELECT DISTINCT ?p ?o
-                where {{
-                    BIND(<{row["p"]["value"]}> AS ?p)
-                    <{uri}> ?p ?list .
-                    ?list rdf:rest* ?rest .
-                    ?rest rdf:first ?o .
-                }}
-            """
-            result = data.sparql.post(
-                query,
-                sparql_endpoint,
-            ).json()
-
-            for result_row in result["results"]["bindings"]:
-                new_uris.append(result_row)
-
-    return new_uris
+def _get_uris_from_rdf_list(uri: str, rows: list[Row], sparql_endpoint: str) -> list[Row]:
+    """Get the items of the RDF lists that are objects of the resource
 
+    All the list cells of the resource are fetched with one query and each list is
+    reassembled by following rdf:rest from its head.
 
-def _get_uri_values_and_list_items(
-    result: dict, sparql_endpoint: str, uri: Optional[str] = None
-) -> tuple[list[str], list[str]]:
-    uri_values = filter(lambda x: x["o"]["type"] == "uri", result["results"]["bindings"])
+    :return: Rows of each item's predicate ?p, value ?o and position in its list
+        ?listItemNumber, in list order
+    """
+    if not any(row["o"].type == "bnode" and row["listItem"].value == "true" for row in rows):
+        return []
 
-    uri_values = [value["o"]["value"] for value in uri_values]
+    # The lists are expanded once per request.
+    context = resolution_context.current()
+    if context is not None:
+        items = context.get_list_items(sparql_endpoint, uri)
+        if items is not None:
+            return items
+
+    # TODO: error handling - move empty result exception to nrm.sparql.post/nrm.sparql.get
+    query = f"""
+        PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#>
+        SELECT DISTINCT ?p ?head ?node ?first ?rest
+        WHERE {{
+            <{uri}> ?p ?head .
+            FILTER(isBlank(?head))
+            ?head rdf:rest* ?node .
+            ?node rdf:first ?first ;
+                rdf:rest ?rest .
+        }}
+    """
+    result_rows = data.sparql.select(
+        query,
+        sparql_endpoint,
+        ttl=data.cache.ttl("resource"),
+    )
+
+    # The (first, rest) of each cell, by the predicate and head of its list.
+    cells: dict[tuple[str, str], dict[str, tuple[Term, Term]]] = defaultdict(dict)
+    for result_row in result_rows:
+        try:
+            key = (result_row["p"].value, result_row["head"].value)
+            cells[key][result_row["node"].value] = (result_row["first"], result_row["rest"])
+        except KeyError as err:
+            raise data.exceptions.SPARQLResultJSONError(
+                f"Unexpected SPARQL result row.\n{result_row}\n{err}"
+            ) from err
+
+    items = []
+    for (predicate, head), list_cells in cells.items():
+        node = head
+        position = 0
+        # Stops at rdf:nil, and at a malformed list's missing or repeated cell.
+        while node in list_cells:
+            first, rest = list_cells.pop(node)
+            items.append(
+                {
+                    "p": Term("uri", predicate),
+                    "o": first,
+                    "listItemNumber": Term("literal", str(position), XSD + "integer"),
+                }
+            )
+            node = rest.value
+            position += 1
+
+    if context is not None:
+        context.set_list_items(sparql_endpoint, uri, items)
+    return items
+
+
+def _get_uri_values_and_list_items(
+    rows: list[Row], sparql_endpoint: str, uri: Optional[str] = None
+) -> tuple[list[str], list[Row]]:
+    uri_values = [row["o"].value for row in rows if row["o"].type == "uri"]
 
     if uri is not None:
         uri_values.append(uri)
@@ -55,63 +99,49 @@ def _get_uri_values_and_list_items(
     # Replace value of blank node list head with items.
     list_items = []
     if uri is not None:
-        list_items = _get_uris_from_rdf_list(uri, result["results"]["bindings"], sparql_endpoint)
+        list_items = _get_uris_from_rdf_list(uri, rows, sparql_endpoint)
 
     for row in list_items:
-        uri_values.append(row["o"]["value"])
+        uri_values.append(row["o"].value)
 
     return uri_values, list_items
 
 
-def _add_rows_for_rdf_list_items(result: dict, uri: str, sparql_endpoint: str) -> dict:
-    """Add rdf:List items as new rows to the SPARQL result object
+def _add_rows_for_rdf_list_items(rows: list[Row], uri: str, sparql_endpoint: str) -> list[Row]:
+    """Add rdf:List items as new rows to the SPARQL result rows
 
-    :param result: The SPARQL result dict object
+    :param rows: The SPARQL result rows
     :param uri: URI of the resource
     :param sparql_endpoint: SPARQL endpoint to fetch the list items from
-    :return: An updated SPARQL result dict object
+    :return: The updated SPARQL result rows
     """
-    _, list_items = _get_uri_values_and_list_items(result, sparql_endpoint, uri)
-
-    # Add additional rows to the `result` representing the RDF List items.
-    for i, list_item in enumerate(list_items):
-        list_item.update(
-            {
-                "listItem": {
-                    "datatype": "http://www.w3.org/2001/XMLSchema#boolean",
-                    "type": "literal",
-                    "value": "true",
-                },
-                "listItemNumber": {
-                    "datatype": "http://www.w3.org/2001/XMLSchema#integer",
-                    "type": "literal",
-                    "value": str(i),
-                },
-            }
-        )
-        result["results"]["bindings"].append(list_item)
+    _, list_items = _get_uri_values_and_list_items(rows, sparql_endpoint, uri)
+
+    # Add additional rows representing the RDF List items.
+    # Each list item row already has its position in its list as listItemNumber.
+    for list_item in list_items:
+        list_item["listItem"] = Term("literal", "true", XSD + "boolean")
+        rows.append(list_item)
 
-    return result
+    return rows
 
 
-def get_uri_label_index(
-    result: dict, sparql_endpoint: str, uri: Optional[str] = None
-) -> dict[str, str]:
-    uri_values, _ = _get_uri_values_and_list_items(result, sparql_endpoint, uri)
-    uri_label_index = {}
-    if uri_values:
-        uri_label_index = domain.label.get_from_list(uri_values, sparql_endpoint)
-    return uri_label_index
+def resolve_uris(
+    rows: list[Row],
+    sparql_endpoint: str,
+    uri: Optional[str] = None,
+    curie_uris: Iterable[str] = (),
+) -> Resolution:
+    """Labels and internal flags of the URIs in the rows, and the curies of curie_uris.
 
+    :param uri: URI of the resource, whose RDF list items are included
+    """
+    uri_values, _ = _get_uri_values_and_list_items(rows, sparql_endpoint, uri)
+    return resolve(uri_values, sparql_endpoint, curie_uris)
 
-def get_uri_internal_index(
-    result: dict, sparql_endpoint: str, uri: Optional[str] = None
-) -> dict[str, str]:
-    uri_values, _ = _get_uri_values_and_list_items(result, sparql_endpoint, uri)
-    uri_internal_index = {}
-    if uri_values:
-        uri_internal_index = domain.internal_resource.get_from_list(uri_values, sparql_endpoint)
-    return uri_internal_index
+
+def _select_rows(query: str, sparql_endpoint: str) -> list[Row]:
+    return list(data.sparql.select(query, sparql_endpoint, ttl=data.cache.ttl("resource")))
 
 
 def get(uri: str, sparql_endpoint: str) -> domain.schema.Resource:
@@ -126,11 +156,20 @@ def get(uri: str, sparql_endpoint: str) -> domain.schema.Resource:
         }}
     """
 
-    result = data.sparql.post(query, sparql_endpoint).json()
+    rows, label = data.sparql_async.gather(
+        data.sparql_async.run(_select_rows, query, sparql_endpoint),
+        data.sparql_async.run(domain.label.get, uri, sparql_endpoint),
+    )
+    label = label or uri
 
-    result = _add_rows_for_rdf_list_items(result, uri, sparql_endpoint)
-    label = domain.label.get(uri, sparql_endpoint) or uri
-    types, properties = get_types_and_properties(result, sparql_endpoint, uri)
+    # Rows are the statements about the resource, so there are none if it doesn't exist.
+    # Checked before the URIs in them are resolved, and not from their internal flags,
+    # which may come from an out of date existence index.
+    if not rows:
+        raise data.exceptions.SPARQLNotFoundError(f"Resource with URI {uri} not found.")
+
+    rows = _add_rows_for_rdf_list_items(rows, uri, sparql_endpoint)
+    types, properties = get_types_and_properties(rows, sparql_endpoint, uri)
 
     profile_uri = ""
     ProfileClass = None
@@ -172,38 +211,36 @@ def _get_incoming_properties(uri: str, sparql_endpoint: str):
         }}
     """
 
-    result = data.sparql.post(
-        query,
-        sparql_endpoint,
-    ).json()
+    rows = _select_rows(query, sparql_endpoint)
 
-    uri_label_index = get_uri_label_index(result, sparql_endpoint, uri)
-    uri_internal_index = get_uri_internal_index(result, sparql_endpoint, uri)
+    uri_label_index, uri_internal_index, curie_index = resolve_uris(
+        rows, sparql_endpoint, uri, curie_uris=(row["p"].value for row in rows)
+    )
 
     incoming_properties = []
 
-    for row in result["results"]["bindings"]:
-        # subject_label = uri_label_index.get(row["o"]["value"]) or domain.curie.get(
-        #     row["o"]["value"]
+    for row in rows:
+        # subject_label = uri_label_index.get(row["o"].value) or domain.curie.get(
+        #     row["o"].value
         # )
-        subject_label = uri_label_index.get(row["o"]["value"]) or row["o"]["value"]
+        subject_label = uri_label_index.get(row["o"].value) or row["o"].value
         item = domain.schema.URI(
             label=subject_label,
-            value=row["o"]["value"],
-            internal=uri_internal_index.get(row["o"]["value"], False),
-            list_item=True if row["listItem"]["value"] == "true" else False,
-            list_item_number=row["listItemNumber"]["value"]
-            if row["listItem"]["value"] == "true"
+            value=row["o"].value,
+            internal=uri_internal_index.get(row["o"].value, False),
+            list_item=True if row["listItem"].value == "true" else False,
+            list_item_number=row["listItemNumber"].value
+            if row["listItem"].value == "true"
             else None,
         )
-        predicate_label = domain.curie.get(row["p"]["value"])
+        predicate_label = curie_index[row["p"].value]
         predicate = domain.schema.URI(
             label=predicate_label,
-            value=row["p"]["value"],
-            internal=uri_internal_index.get(row["p"]["value"], False),
-            list_item=True if row["listItem"]["value"] == "true" else False,
-            list_item_number=int(row["listItemNumber"]["value"])
-            if row["listItem"]["value"] == "true"
+            value=row["p"].value,
+            internal=uri_internal_index.get(row["p"].value, False),
+            list_item=True if row["listItem"].value == "true" else False,
+            list_item_number=int(row["listItemNumber"].value)
+            if row["listItem"].value == "true"
             else None,
         )
 
@@ -222,31 +259,36 @@ def _get_incoming_properties(uri: str, sparql_endpoint: str):
 
 
 def get_types_and_properties(
-    result: dict, sparql_endpoint: str, uri: Optional[str] = None
+    rows: list[Row], sparql_endpoint: str, uri: Optional[str] = None
 ) -> tuple[list[domain.schema.URI], list[domain.schema.PredicateObjects]]:
     types: list[domain.schema.URI] = []
     properties: dict[str, set[Union[domain.schema.URI, domain.schema.Literal]]] = defaultdict(set)
 
-    # An index of URIs with label values.
-    uri_label_index = get_uri_label_index(result, sparql_endpoint, uri)
-
-    # An index of all the URIs linked to and from this resource that are available internally.
-    uri_internal_index = get_uri_internal_index(result, sparql_endpoint, uri)
-
-    if not uri_internal_index.get(uri) and uri is not None:
-        raise data.exceptions.SPARQLNotFoundError(f"Resource with URI {uri} not found.")
+    # An index of URIs with label values,
+    # an index of all the URIs linked to and from this resource that are available internally,
+    # and the curies of the predicates, and of the types for when they have no label.
+    uri_label_index, uri_internal_index, curie_index = resolve_uris(
+        rows,
+        sparql_endpoint,
+        uri,
+        curie_uris=(
+            row["o"].value if row["p"].value == str(RDF.type) else row["p"].value
+            for row in rows
+            if row["o"].type != "bnode" or row["p"].value != str(RDF.type)
+        ),
+    )
 
-    for row in result["results"]["bindings"]:
-        if row["p"]["value"] == str(RDF.type):
-            if row["o"]["type"] != "bnode":
-                type_label = uri_label_index.get(row["o"]["value"]) or domain.curie.get(
-                    row["o"]["value"]
+    for row in rows:
+        if row["p"].value == str(RDF.type):
+            if row["o"].type != "bnode":
+                type_label = (
+                    uri_label_index.get(row["o"].value) or curie_index[row["o"].value]
                 )
                 types.append(
                     domain.schema.URI(
                         label=type_label,
-                        value=row["o"]["value"],
-                        internal=uri_internal_index.get(row["o"]["value"], False),
+                        value=row["o"].value,
+                        internal=uri_internal_index.get(row["o"].value, False),
                     )
                 )
             else:
@@ -254,57 +296,57 @@ def get_types_and_properties(
                 # E.g. /viewers/general?uri=http://linked.data.gov.au/dataset/ausplots/site-ntabrt0001&sparql_endpoint=https://graphdb.tern.org.au/repositories/knowledge_graph_core
                 continue
         else:
-            predicate_label = domain.curie.get(row["p"]["value"])
+            predicate_label = curie_index[row["p"].value]
             predicate = domain.schema.URI(
                 label=predicate_label,
-                value=row["p"]["value"],
-                internal=uri_internal_index.get(row["p"]["value"], False),
-                list_item=True if row["listItem"]["value"] == "true" else False,
+                value=row["p"].value,
+                internal=uri_internal_index.get(row["p"].value, False),
+                list_item=True if row["listItem"].value == "true" else False,
                 list_item_number=None,
             )
-            if row["o"]["type"] == "uri":
+            if row["o"].type == "uri":
                 # object_label = uri_label_index.get(
-                #     row["o"]["value"]
-                # ) or domain.curie.get(row["o"]["value"])
-                object_label = uri_label_index.get(row["o"]["value"]) or row["o"]["value"]
+                #     row["o"].value
+                # ) or domain.curie.get(row["o"].value)
+                object_label = uri_label_index.get(row["o"].value) or row["o"].value
                 item = domain.schema.URI(
                     label=object_label,
-                    value=row["o"]["value"],
-                    internal=uri_internal_index.get(row["o"]["value"], False),
-                    list_item=True if row["listItem"]["value"] == "true" else False,
-                    list_item_number=row["listItemNumber"]["value"]
-                    if row["listItem"]["value"] == "true"
+                    value=row["o"].value,
+                    internal=uri_internal_index.get(row["o"].value, False),
+                    list_item=True if row["listItem"].value == "true" else False,
+                    list_item_number=row["listItemNumber"].value
+                    if row["listItem"].value == "true"
                     else None,
                 )
-            elif row["o"]["type"] == "literal":
-                datatype = row["o"].get("datatype", "")
+            elif row["o"].type == "literal":
+                datatype = row["o"].datatype
                 if datatype:
                     datatype = domain.schema.URI(
                         label=datatype,
                         value=datatype,
                         internal=uri_internal_index.get(datatype, False),
-                        list_item=True if row["listItem"]["value"] == "true" else False,
-                        list_item_number=row["listItemNumber"]["value"]
-                        if row["listItem"]["value"] == "true"
+                        list_item=True if row["listItem"].value == "true" else False,
+                        list_item_number=row["listItemNumber"].value
+                        if row["listItem"].value == "true"
                         else None,
                     )
                 else:
                     datatype = None
 
                 item = domain.schema.Literal(
-                    value=row["o"]["value"],
+                    value=row["o"].value,
                     datatype=datatype,
-                    language=row["o"].get("xml:lang", ""),
-                    list_item=True if row["listItem"]["value"] == "true" else False,
-                    list_item_number=row["listItemNumber"]["value"]
-                    if row["listItem"]["value"] == "true"
+                    language=row["o"].language or "",
+                    list_item=True if row["listItem"].value == "true" else False,
+                    list_item_number=row["listItemNumber"].value
+                    if row["listItem"].value == "true"
                     else None,
                 )
-            elif row["o"]["type"] == "bnode":
+            elif row["o"].type == "bnode":
                 # TODO: Handle blank nodes.
                 pass
             else:
-                raise ValueError(f"Expected type to be uri or literal but got {row['o']['type']}")
+                raise ValueError(f"Expected type to be uri or literal but got {row['o'].type}")
 
             # Use dict and set for performance
             properties[predicate].add(item)
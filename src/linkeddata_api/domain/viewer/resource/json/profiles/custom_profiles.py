@@ -1,11 +1,16 @@
 from jinja2 import Template
 from rdflib import RDFS, SKOS, SDO, DCTERMS
 
-from linkeddata_api.data import sparql
+from linkeddata_api.data import cache, sparql
+from linkeddata_api.data.cache import LRUCache
+from linkeddata_api.data.results import Row
 from linkeddata_api.domain.namespaces import TERN
 from linkeddata_api.domain.viewer.resource.json.profiles import Profile
 from linkeddata_api.domain.schema import PredicateObjects
 
+# Additional properties of resources by SPARQL endpoint and URI. Configured by `init_app`.
+_additional_values = LRUCache(maxsize=256)
+
 
 class MethodCollectionProfile(Profile):
     def _uri(self) -> str:
@@ -44,65 +49,87 @@ class MethodCollectionProfile(Profile):
 
 
 class MethodProfile(MethodCollectionProfile):
+    sparql_endpoint = "https://graphdb.tern.org.au/repositories/dawe_vocabs_core"
+
+    # Predicate of the observable property metadata to the predicate it's shown as, in order.
+    metadata_predicates = {
+        "urn:property:observableProperty": "https://w3id.org/tern/ontologies/tern/hasObservableProperty",
+        "urn:property:featureType": "https://w3id.org/tern/ontologies/tern/hasFeatureType",
+        "urn:property:categoricalValuesCollection": "https://w3id.org/tern/ontologies/tern/hasCategoricalValuesCollection",
+    }
+
     def _uri(self) -> str:
         return "https://w3id.org/tern/ontologies/tern/Method"
 
-    @staticmethod
-    def _process_sparql_values(results: dict) -> list[PredicateObjects]:
+    def _process_sparql_values(self, rows: list[Row]) -> list[PredicateObjects]:
         from linkeddata_api.domain.viewer.resource.json import get_types_and_properties
 
-        _, properties = get_types_and_properties(
-            results,
-            "https://graphdb.tern.org.au/repositories/dawe_vocabs_core",
-        )
+        _, properties = get_types_and_properties(rows, self.sparql_endpoint)
 
+        order = list(self.metadata_predicates.values())
+        properties.sort(key=lambda property_: order.index(property_.predicate.value))
         return properties
 
-    def get_additional_values(self, metadata_predicate: str, predicate: str):
+    def get_additional_values(self) -> list[PredicateObjects]:
+        """Get the values of all the metadata predicates with one query
+
+        The labels and internal flags of the values are resolved together, and the
+        properties are cached per SPARQL endpoint and method for the "profile" time-to-live
+        of `data.cache`. The query itself is not cached, so the properties expire at once.
+        """
+        ttl = cache.ttl("profile")
+        key = f"{self.sparql_endpoint} {self.resource_uri}"
+        if ttl:
+            properties = _additional_values.get(key)
+            if properties is not None:
+                # Copies, since the properties of a resource are changed after.
+                return [property_.copy(deep=True) for property_ in properties]
+
         query = Template(
             """
             PREFIX tern: <https://w3id.org/tern/ontologies/tern/>
-            select *
-            where {
+            SELECT ?p ?o ?listItem ?listItemNumber
+            WHERE {
+                VALUES (?_metadata_predicate ?p) {
+                    {% for metadata_predicate, predicate in metadata_predicates.items() %}
+                    (<{{ metadata_predicate }}> <{{ predicate }}>)
+                    {% endfor %}
+                }
                 ?_observable_property_meta <urn:property:protocolModule> <{{ uri }}> ;
-                    <{{ metadata_predicate }}> ?_object_value .
-                BIND(<{{ predicate }}> AS ?p)
-                BIND(?_object_value AS ?o)
+                    ?_metadata_predicate ?o .
                 BIND(false AS ?listItem)
-                
+
                 # This gets set later with the listItemNumber value.
                 BIND(0 AS ?listItemNumber)
             }
         """
         ).render(
             uri=self.resource_uri,
-            metadata_predicate=metadata_predicate,
-            predicate=predicate,
+            metadata_predicates=self.metadata_predicates,
         )
 
-        response = sparql.post(
-            query=query,
-            sparql_endpoint="https://graphdb.tern.org.au/repositories/dawe_vocabs_core",
-        )
+        rows = sparql.select(query=query, sparql_endpoint=self.sparql_endpoint)
 
-        properties = self._process_sparql_values(response.json())
+        properties = self._process_sparql_values(list(rows))
 
-        self.properties += properties
+        if ttl:
+            _additional_values.set(
+                key,
+                [property_.copy(deep=True) for property_ in properties],
+                ttl,
+            )
+        return properties
 
     def add_and_remove(self):
         super().add_and_remove()
 
-        self.get_additional_values(
-            "urn:property:observableProperty",
-            "https://w3id.org/tern/ontologies/tern/hasObservableProperty",
-        )
+        self.properties += self.get_additional_values()
 
-        self.get_additional_values(
-            "urn:property:featureType",
-            "https://w3id.org/tern/ontologies/tern/hasFeatureType",
-        )
 
-        self.get_additional_values(
-            "urn:property:categoricalValuesCollection",
-            "https://w3id.org/tern/ontologies/tern/hasCategoricalValuesCollection",
-        )
+def stats() -> dict:
+    return _additional_values.stats()
+
+
+def init_app(app) -> None:
+    _additional_values.maxsize = app.config["PROFILE_CACHE_MAXSIZE"]
+    _additional_values.clear()
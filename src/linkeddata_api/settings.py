@@ -2,3 +2,159 @@
 #
 # This file is read before all other configuration sources
 #
+
+# SPARQL HTTP client
+# Maximum number of endpoint origins with a pooled session. Least recently used are closed.
+SPARQL_CLIENT_MAX_ENDPOINTS = 32
+# Maximum number of keep-alive connections kept per endpoint origin.
+# Should be at least the number of threads per worker.
+SPARQL_CLIENT_POOL_MAXSIZE = 10
+# Seconds to wait for a connection to be established and for the response to be read.
+SPARQL_CLIENT_CONNECT_TIMEOUT = 5
+SPARQL_CLIENT_READ_TIMEOUT = 60
+
+# Maximum number of independent SPARQL queries of a request that run concurrently.
+SPARQL_ASYNC_MAX_WORKERS = 8
+# Maximum number of URIs in the VALUES block of one label or existence query. Larger
+# lookups are split into queries of this size that run concurrently.
+# See benchmarks/values_chunk_size.py.
+SPARQL_VALUES_CHUNK_SIZE = 200
+
+# SPARQL result cache
+SPARQL_CACHE_ENABLED = True
+# Maximum number of results kept in each worker's in-process cache.
+SPARQL_CACHE_MAXSIZE = 1024
+# Responses larger than this many bytes are not cached.
+SPARQL_CACHE_MAX_ITEM_SIZE = 1024 * 1024
+# Also store results in the flask_tern cache backend (CACHE_TYPE) to share them between workers.
+SPARQL_CACHE_SHARED = False
+# Time-to-live in seconds per class of query. Unknown classes use "default".
+SPARQL_CACHE_TTL = {
+    "default": 300,
+    # Labels of vocabulary terms rarely change.
+    "label": 3600,
+    # Whether URIs exist in a repository.
+    "exists": 600,
+    # Entrypoint listings and counts.
+    "entrypoint": 600,
+    # Statements of the resource being viewed.
+    "resource": 120,
+    # Additional properties that profiles, such as the method profile, add to a resource.
+    "profile": 3600,
+}
+
+# Wait for an identical SPARQL query that is already in flight instead of sending it again.
+SPARQL_SINGLEFLIGHT_ENABLED = True
+# Also coalesce cached queries across workers. Requires SPARQL_CACHE_SHARED.
+SPARQL_SINGLEFLIGHT_SHARED = False
+# Seconds between checks for the result of a query another worker is running.
+SPARQL_SINGLEFLIGHT_POLL_INTERVAL = 0.05
+# Seconds before the cross-worker lock of a query expires.
+SPARQL_SINGLEFLIGHT_LOCK_TIMEOUT = 60
+
+# SPARQL endpoint health
+# Number of recent requests per endpoint used for latency percentiles and error rates.
+SPARQL_HEALTH_WINDOW = 100
+# Fail fast while an endpoint is unhealthy. The circuit breaker opens after this many
+# consecutive failures (5xx responses, connection errors and timeouts) ...
+SPARQL_BREAKER_FAILURE_THRESHOLD = 5
+# ... or when this fraction of the recent requests failed, once there are enough of them.
+SPARQL_BREAKER_ERROR_RATE = 0.5
+SPARQL_BREAKER_MIN_REQUESTS = 20
+# Seconds before a probe request is let through to an unhealthy endpoint.
+SPARQL_BREAKER_RESET_TIMEOUT = 30
+# Derive the read timeout from the endpoint's observed p99 latency times the multiplier,
+# bounded by SPARQL_ADAPTIVE_TIMEOUT_MIN and SPARQL_CLIENT_READ_TIMEOUT.
+SPARQL_ADAPTIVE_TIMEOUT = True
+SPARQL_ADAPTIVE_TIMEOUT_MULTIPLIER = 3
+SPARQL_ADAPTIVE_TIMEOUT_MIN = 10
+
+# SPARQL endpoint URL prefix to dialect, one of "generic", "graphdb", "virtuoso" or "fuseki".
+# Other endpoints are detected from their responses or guessed from their URL.
+SPARQL_DIALECTS = {
+    "https://graphdb.tern.org.au/": "graphdb",
+}
+
+# Add a Server-Timing header with the SPARQL query count, time, bytes and cache hits to
+# responses of requests that queried SPARQL. They are also logged per request.
+SPARQL_SERVER_TIMING = True
+
+# Look up namespaces that are not in the bundled prefix snapshot with the external
+# prefix.zazuko.com service. Needed until the snapshot has the whole prefix registry.
+CURIE_EXTERNAL_LOOKUP = True
+# Wait for the lookup in the request. Otherwise the URI is returned as-is and the
+# namespace is looked up by background threads for later requests.
+CURIE_EXTERNAL_LOOKUP_BLOCKING = False
+CURIE_EXTERNAL_LOOKUP_WORKERS = 2
+# Maximum number of namespaces waiting for a background lookup.
+CURIE_EXTERNAL_LOOKUP_MAX_PENDING = 1000
+# Maximum number and time-to-live in seconds of the prefixes found by the lookups
+# and of the namespaces the lookups found no prefix for.
+CURIE_PREFIXES_MAXSIZE = 10000
+CURIE_PREFIXES_TTL = 30 * 24 * 60 * 60
+CURIE_NOT_FOUND_MAXSIZE = 10000
+CURIE_NOT_FOUND_TTL = 24 * 60 * 60
+# File to keep them in across restarts, shared by the workers. Not kept if empty.
+CURIE_CACHE_PATH = ""
+# Seconds between writes of the file, which has the namespaces fetched in between.
+CURIE_CACHE_SAVE_INTERVAL = 60
+# Maximum number of URIs in one request to POST /api/v2.0/curies.
+CURIES_MAX_URIS = 1000
+
+# Namespace to the SPARQL endpoint of the repository that has the labels of its URIs.
+# They are queried directly instead of the SPARQL endpoint of the request.
+LABEL_REPOSITORIES = {
+    "http://linked.data.gov.au/def/tern-cv/": "https://graphdb.tern.org.au/repositories/tern_vocabs_core",
+}
+# Language tags of labels in order of preference. Labels without a language tag are
+# preferred over labels in other languages.
+LABEL_LANGUAGES = ["en"]
+# Repositories whose labels are all kept in memory in each worker, loaded in the background
+# on first use. Labels in LABEL_LANGUAGES are looked up there instead of with a query.
+LABEL_SNAPSHOT_REPOSITORIES = [
+    "https://graphdb.tern.org.au/repositories/tern_vocabs_core",
+    "https://graphdb.tern.org.au/repositories/dawe_vocabs_core",
+]
+# Seconds between refreshes with the labels of resources with a later dcterms:modified,
+# and between reloads of all labels, which also drop deleted resources.
+LABEL_SNAPSHOT_REFRESH_INTERVAL = 10 * 60
+LABEL_SNAPSHOT_FULL_REFRESH_INTERVAL = 24 * 60 * 60
+# Cache of resource labels per SPARQL endpoint and URI, kept in each worker.
+LABEL_CACHE_ENABLED = True
+LABEL_CACHE_MAXSIZE = 50000
+# Time-to-live in seconds of labels, and of URIs found to have no label.
+LABEL_CACHE_TTL = 60 * 60
+LABEL_CACHE_NEGATIVE_TTL = 10 * 60
+
+# Repositories with an index of their subjects, a Bloom filter in each worker built in the
+# background on first use. URIs that are not in it are known not to be resources of the
+# repository without a query.
+EXISTENCE_INDEX_REPOSITORIES = [
+    "https://graphdb.tern.org.au/repositories/tern_vocabs_core",
+    "https://graphdb.tern.org.au/repositories/dawe_vocabs_core",
+]
+# Subjects read per query while building.
+EXISTENCE_INDEX_PAGE_SIZE = 50000
+# Expected fraction of URIs that are wrongly found in the index.
+EXISTENCE_INDEX_ERROR_RATE = 0.01
+# Seconds between builds. Resources added since the last build are not in the index.
+EXISTENCE_INDEX_REBUILD_INTERVAL = 60 * 60
+# Confirm the URIs found in the index with a query. If off, they are taken as resources
+# of the repository, which is wrong for about EXISTENCE_INDEX_ERROR_RATE of them.
+EXISTENCE_INDEX_CONFIRM_POSITIVES = True
+
+# Maximum number of resources whose additional profile properties, such as the observable
+# properties of a method, are kept in each worker. Kept for SPARQL_CACHE_TTL["profile"].
+PROFILE_CACHE_MAXSIZE = 256
+
+# Compression of large API responses, with gzip or brotli if the "brotli" package is installed.
+RESPONSE_COMPRESSION_ENABLED = True
+# Responses smaller than this many bytes are not compressed.
+RESPONSE_COMPRESSION_MIN_SIZE = 1024
+# Low levels save most of the bytes of JSON and RDF for a fraction of the CPU of the highest.
+RESPONSE_COMPRESSION_GZIP_LEVEL = 6
+RESPONSE_COMPRESSION_BROTLI_QUALITY = 4
+# Maximum number of compressed bodies kept in each worker to serve repeated responses.
+RESPONSE_COMPRESSION_CACHE_MAXSIZE = 256
+# Compressed bodies larger than this many bytes are not kept.
+RESPONSE_COMPRESSION_CACHE_MAX_ITEM_SIZE = 1024 * 1024
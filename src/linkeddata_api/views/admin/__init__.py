@@ -0,0 +1,26 @@
+from flask import Blueprint, jsonify
+from flask_tern.auth import require_user
+
+from linkeddata_api import data, domain
+from linkeddata_api.domain.viewer.resource.json.profiles import custom_profiles
+from linkeddata_api.views import compression
+
+bp = Blueprint("admin", __name__)
+
+
+@bp.route("/metrics")
+@require_user
+def metrics():
+    """Health and circuit breaker state of the SPARQL endpoints, cache statistics, and the state of the label snapshots and existence indexes, and the profile cache."""
+    return jsonify(
+        {
+            "sparql_endpoints": data.health.registry.stats(),
+            "sparql_cache": data.cache.stats(),
+            "sparql_singleflight": data.singleflight.stats(),
+            "response_compression": compression.stats(),
+            "curie": domain.curie.stats(),
+            "labels": domain.label.stats(),
+            "existence_index": domain.internal_resource.stats(),
+            "profiles": custom_profiles.stats(),
+        }
+    )
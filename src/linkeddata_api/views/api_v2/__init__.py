@@ -3,5 +3,6 @@ from .blueprint import bp
 # import all sub modules with views registered with blueprint
 from . import ontology_viewer
 from . import version_info
+from . import curies
 from . import rdf_tools
 from . import viewer
@@ -0,0 +1,22 @@
+from flask import abort, current_app, jsonify, request
+from flask_tern import openapi
+
+from linkeddata_api import domain
+from linkeddata_api.views.api_v2.blueprint import bp
+from linkeddata_api.views.compression import compress
+
+
+@bp.route("/curies", methods=["POST"])
+@compress
+@openapi.validate(validate_request=False, validate_response=False)
+def post_curies():
+    uris = request.get_json(silent=True)
+
+    if not isinstance(uris, list) or not all(isinstance(uri, str) for uri in uris):
+        abort(400, "Expected a JSON array of URIs.")
+
+    max_uris = current_app.config["CURIES_MAX_URIS"]
+    if len(uris) > max_uris:
+        abort(400, f"Expected at most {max_uris} URIs but got {len(uris)}.")
+
+    return jsonify(domain.curie.get_many(uris))
@@ -1,11 +1,11 @@
 from typing import List
 
-import requests
 from jinja2 import Template
 from werkzeug.exceptions import HTTPException
 from werkzeug.wrappers import Response
 from flask_tern.cache import cache
 
+from linkeddata_api import data
 from . import schema
 
 
@@ -28,7 +28,9 @@ PREFIX sh: <http://www.w3.org/ns/shacl#>
 PREFIX skos: <http://www.w3.org/2004/02/skos/core#>
 
 SELECT distinct ?id (SAMPLE(?_label) as ?label)
-FROM <http://www.ontotext.com/explicit>
+{% if explicit_graph %}
+FROM <{{ explicit_graph }}>
+{% endif %}
 FROM <{{ named_graph }}>
 WHERE {
     {
@@ -61,22 +63,17 @@ def get(ontology_id: str) -> List[schema.ClassItem]:
             description=description, response=Response(description, status=404)
         ) from err
 
-    query = query_template.render(named_graph=mapping["named_graph"])
-    headers = {
-        "accept": "application/sparql-results+json",
-        "content-type": "application/sparql-query",
-    }
-
-    r = requests.post(
-        url=mapping["sparql_endpoint"], headers=headers, data=query, timeout=60
+    query = query_template.render(
+        named_graph=mapping["named_graph"],
+        explicit_graph=data.dialects.get(mapping["sparql_endpoint"]).explicit_graph,
     )
 
     try:
-        r.raise_for_status()
-    except requests.exceptions.HTTPError as err:
+        r = data.sparql.post(query, mapping["sparql_endpoint"])
+    except data.exceptions.RequestError as err:
         raise HTTPException(
-            description=err.response.text,
-            response=Response(err.response.text, status=502),
+            description=err.description,
+            response=Response(err.description, status=502),
         ) from err
 
     resultset = r.json()
@@ -6,10 +6,12 @@ from flask_tern.logging import create_audit_event, log_audit
 
 from linkeddata_api.domain.pydantic_jsonify import jsonify
 from linkeddata_api.views.api_v2.blueprint import bp
+from linkeddata_api.views.compression import compress
 from linkeddata_api import rdf
 
 
 @bp.route("/rdf_tools/convert", methods=["POST"])
+@compress
 @openapi.validate(validate_request=False, validate_response=False)
 def rdf_tools_convert():
     # TODO: add log audit.
@@ -2,7 +2,7 @@ from jinja2 import Template
 from rdflib import RDF
 
 from linkeddata_api import domain
-from linkeddata_api.data import sparql
+from linkeddata_api.data import cache, dialects, sparql, sparql_async
 from linkeddata_api.data.exceptions import SPARQLNotFoundError
 
 from .schema import URI, Resource, PredicateValues
@@ -20,7 +20,7 @@ def predicate_is_list_item(uri: str, predicate: str, sparql_endpoint: str) -> bo
     """
     ).render(uri=uri, predicate=predicate)
 
-    response = sparql.post(query, sparql_endpoint)
+    response = sparql.post(query, sparql_endpoint, ttl=cache.ttl("resource"))
     data = response.json()
 
     return data["boolean"]
@@ -58,7 +58,7 @@ def get_predicate_count_index(uri: str, predicate: str, sparql_endpoint: str, pr
                 """
             ).render(uri=uri, predicate=predicate)
 
-        response = sparql.post(query, sparql_endpoint)
+        response = sparql.post(query, sparql_endpoint, ttl=cache.ttl("resource"))
 
         count = int(response.json()["results"]["bindings"][0]["count"]["value"])
 
@@ -73,119 +73,80 @@ def get_predicate_values_query(
     page: int,
     profile: str = "",
 ) -> str:
-    is_virtuoso_endpoint = "virtuoso.tern" in sparql_endpoint
-
-    is_list_item = predicate_is_list_item(uri, predicate, sparql_endpoint)
-
     ProfileClass = get_profile(profile)
 
     if ProfileClass:
         profile_instance = ProfileClass(uri, [])
         query = profile_instance.get_predicate_values(predicate, limit, page)
+    elif predicate_is_list_item(uri, predicate, sparql_endpoint):
+        query = Template(
+            """
+            PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#>
+            PREFIX skos: <http://www.w3.org/2004/02/skos/core#>
+            SELECT ?p ?o ?listItem ?listItemNumber
+            WHERE {
+                {% if dialect.bind_predicate %}
+                BIND(<{{ predicate }}> AS ?p)
+                <{{ uri }}> ?p ?_o .
+                {% else %}
+                <{{ uri }}> ?p ?_o .
+                VALUES ?p { <{{ predicate }}> }
+                {% endif %}
+                ?_o rdf:rest* ?rest .
+                ?rest rdf:first ?o
+
+                BIND(EXISTS{?o rdf:rest ?rest} as ?listItem)
+
+                # This gets set later with the listItemNumber value.
+                BIND({{ dialect.list_item_number_placeholder }} AS ?listItemNumber)
+            }
+            GROUP BY ?p ?o ?listItem ?listItemNumber
+            LIMIT {{ limit }}
+            OFFSET {{ offset }}
+        """
+        ).render(
+            uri=uri,
+            predicate=predicate,
+            limit=limit,
+            offset=(page - 1) * limit,
+            dialect=dialects.get(sparql_endpoint),
+        )
     else:
-        if is_list_item:
-            if is_virtuoso_endpoint:
-                # Virtuoso does not work with the BIND clause for predicate, using VALUES instead.
-                # BIND 0 causes a "out of index error", so we start list with 1
-                query = Template(
-                    """
-                    PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#>
-                    PREFIX skos: <http://www.w3.org/2004/02/skos/core#>
-                    SELECT ?p ?o ?listItem ?listItemNumber
-                    WHERE {
-                        #BIND(<{{ predicate }}> AS ?p)
-                        <{{ uri }}> ?p ?_o .
-                        VALUES ?p { <{{ predicate }}> }
-                        ?_o rdf:rest* ?rest .
-                        ?rest rdf:first ?o
-
-                        BIND(EXISTS{?o rdf:rest ?rest} as ?listItem)
-
-                        # This gets set later with the listItemNumber value.
-                        BIND(1 AS ?listItemNumber)
-                    }
-                    GROUP BY ?p ?o ?listItem ?listItemNumber
-                    LIMIT {{ limit }}
-                    OFFSET {{ offset }}
-                """
-                ).render(uri=uri, predicate=predicate, limit=limit, offset=(page - 1) * limit)
-            else:
-                query = Template(
-                    """
-                    PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#>
-                    PREFIX skos: <http://www.w3.org/2004/02/skos/core#>
-                    SELECT ?p ?o ?listItem ?listItemNumber
-                    WHERE {
-                        BIND(<{{ predicate }}> AS ?p)
-                        <{{ uri }}> ?p ?_o .
-                        ?_o rdf:rest* ?rest .
-                        ?rest rdf:first ?o
-
-                        BIND(EXISTS{?o rdf:rest ?rest} as ?listItem)
-
-                        # This gets set later with the listItemNumber value.
-                        BIND(0 AS ?listItemNumber)
-                    }
-                    GROUP BY ?p ?o ?listItem ?listItemNumber
-                    LIMIT {{ limit }}
-                    OFFSET {{ offset }}
-                """
-                ).render(uri=uri, predicate=predicate, limit=limit, offset=(page - 1) * limit)
-        else:
-            if is_virtuoso_endpoint:
-                # Virtuoso does not work with the BIND clause for predicate, using VALUES instead.
-                # BIND 0 causes a "out of index error", so we start list with 1
-                # Also requires to have the ?label in the GROUP BY
-                query = Template(
-                    """
-                    PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#>
-                    PREFIX skos: <http://www.w3.org/2004/02/skos/core#>
-                    SELECT ?p ?o ?listItem ?listItemNumber (SAMPLE(?_label) AS ?label)
-                    WHERE {
-                        #BIND(<{{ predicate }}> AS ?p)
-                        <{{ uri }}> ?p ?o .
-                        VALUES ?p { <{{ predicate }}> }
-
-                        OPTIONAL{
-                            ?o skos:prefLabel ?_label .
-                        }
-
-                        BIND(EXISTS{?o rdf:rest ?rest} as ?listItem)
-
-                        # This gets set later with the listItemNumber value.
-                        BIND(1 AS ?listItemNumber)
-                    }
-                    GROUP BY ?p ?o ?listItem ?listItemNumber ?label
-                    ORDER BY ?label
-                    LIMIT {{ limit }}
-                    OFFSET {{ offset }}
-                """
-                ).render(uri=uri, predicate=predicate, limit=limit, offset=(page - 1) * limit)
-            else:
-                query = Template(
-                    """
-                    PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#>
-                    PREFIX skos: <http://www.w3.org/2004/02/skos/core#>
-                    SELECT ?p ?o ?listItem ?listItemNumber (SAMPLE(?_label) AS ?label)
-                    WHERE {
-                        BIND(<{{ predicate }}> AS ?p)
-                        <{{ uri }}> ?p ?o .
-
-                        OPTIONAL{
-                            ?o skos:prefLabel ?_label .
-                        }
-
-                        BIND(EXISTS{?o rdf:rest ?rest} as ?listItem)
-
-                        # This gets set later with the listItemNumber value.
-                        BIND(0 AS ?listItemNumber)
-                    }
-                    GROUP BY ?p ?o ?listItem ?listItemNumber
-                    ORDER BY ?label
-                    LIMIT {{ limit }}
-                    OFFSET {{ offset }}
-                """
-                ).render(uri=uri, predicate=predicate, limit=limit, offset=(page - 1) * limit)
+        query = Template(
+            """
+            PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#>
+            PREFIX skos: <http://www.w3.org/2004/02/skos/core#>
+            SELECT ?p ?o ?listItem ?listItemNumber (SAMPLE(?_label) AS ?label)
+            WHERE {
+                {% if dialect.bind_predicate %}
+                BIND(<{{ predicate }}> AS ?p)
+                <{{ uri }}> ?p ?o .
+                {% else %}
+                <{{ uri }}> ?p ?o .
+                VALUES ?p { <{{ predicate }}> }
+                {% endif %}
+
+                OPTIONAL{
+                    ?o skos:prefLabel ?_label .
+                }
+
+                BIND(EXISTS{?o rdf:rest ?rest} as ?listItem)
+
+                # This gets set later with the listItemNumber value.
+                BIND({{ dialect.list_item_number_placeholder }} AS ?listItemNumber)
+            }
+            GROUP BY ?p ?o ?listItem ?listItemNumber{% if dialect.group_by_aggregates %} ?label{% endif %}
+            ORDER BY ?label
+            LIMIT {{ limit }}
+            OFFSET {{ offset }}
+        """
+        ).render(
+            uri=uri,
+            predicate=predicate,
+            limit=limit,
+            offset=(page - 1) * limit,
+            dialect=dialects.get(sparql_endpoint),
+        )
 
     return query
 
@@ -196,64 +157,62 @@ def get_predicate_values(
     count = get_predicate_count_index(uri, predicate, sparql_endpoint, profile)
     query = get_predicate_values_query(uri, predicate, sparql_endpoint, limit, page, profile)
 
-    response = sparql.post(query, sparql_endpoint)
-
-    result = response.json()
-
-    # An index of URIs with label values.
-    uri_label_index = domain.viewer.resource.json.get_uri_label_index(result, sparql_endpoint)
+    rows = list(sparql.select(query, sparql_endpoint, ttl=cache.ttl("resource")))
 
-    # An index of all the URIs linked to and from this resource that are available internally.
-    uri_internal_index = domain.viewer.resource.json.get_uri_internal_index(result, sparql_endpoint)
+    # An index of URIs with label values and
+    # an index of all the URIs linked to and from this resource that are available internally.
+    uri_label_index, uri_internal_index, _ = domain.viewer.resource.json.resolve_uris(
+        rows, sparql_endpoint
+    )
 
     values = []
 
-    for row in result["results"]["bindings"]:
+    for row in rows:
         item = None
 
-        if row["p"]["value"] == str(RDF.type):
+        if row["p"].value == str(RDF.type):
             continue
         else:
-            if row["o"]["type"] == "uri":
-                object_label = uri_label_index.get(row["o"]["value"]) or row["o"]["value"]
+            if row["o"].type == "uri":
+                object_label = uri_label_index.get(row["o"].value) or row["o"].value
                 item = domain.schema.URI(
                     label=object_label,
-                    value=row["o"]["value"],
-                    internal=uri_internal_index.get(row["o"]["value"], False),
-                    list_item=True if row["listItem"]["value"] == "true" else False,
-                    list_item_number=row["listItemNumber"]["value"]
-                    if row["listItem"]["value"] == "true"
+                    value=row["o"].value,
+                    internal=uri_internal_index.get(row["o"].value, False),
+                    list_item=True if row["listItem"].value == "true" else False,
+                    list_item_number=row["listItemNumber"].value
+                    if row["listItem"].value == "true"
                     else None,
                 )
-            elif row["o"]["type"] == "literal" or row["o"]["type"] == "typed-literal":
-                datatype = row["o"].get("datatype", "")
+            elif row["o"].type == "literal":
+                datatype = row["o"].datatype
                 if datatype:
                     datatype = domain.schema.URI(
                         label=datatype,
                         value=datatype,
                         internal=uri_internal_index.get(datatype, False),
-                        list_item=True if row["listItem"]["value"] == "true" else False,
-                        list_item_number=row["listItemNumber"]["value"]
-                        if row["listItem"]["value"] == "true"
+                        list_item=True if row["listItem"].value == "true" else False,
+                        list_item_number=row["listItemNumber"].value
+                        if row["listItem"].value == "true"
                         else None,
                     )
                 else:
                     datatype = None
 
                 item = domain.schema.Literal(
-                    value=row["o"]["value"],
+                    value=row["o"].value,
                     datatype=datatype,
-                    language=row["o"].get("xml:lang", ""),
-                    list_item=True if row["listItem"]["value"] == "true" else False,
-                    list_item_number=row["listItemNumber"]["value"]
-                    if row["listItem"]["value"] == "true"
+                    language=row["o"].language or "",
+                    list_item=True if row["listItem"].value == "true" else False,
+                    list_item_number=row["listItemNumber"].value
+                    if row["listItem"].value == "true"
                     else None,
                 )
-            elif row["o"]["type"] == "bnode":
+            elif row["o"].type == "bnode":
                 # TODO: Handle blank nodes.
                 pass
             else:
-                raise ValueError(f"Expected type to be uri or literal but got {row['o']['type']}")
+                raise ValueError(f"Expected type to be uri or literal but got {row['o'].type}")
 
             if item:
                 values.append(item)
@@ -273,15 +232,19 @@ def get_predicates(uri: str, sparql_endpoint: str) -> list[URI]:
         """
     ).render(uri=uri)
 
-    response = sparql.post(query, sparql_endpoint)
+    predicate_uris = [
+        row["p"].value
+        for row in sparql.select(query, sparql_endpoint, ttl=cache.ttl("resource"))
+    ]
+    curies = domain.curie.get_many(predicate_uris)
 
     predicates = [
         URI(
-            label=domain.curie.get(row["p"]["value"]),
-            value=row["p"]["value"],
+            label=curies[predicate_uri],
+            value=predicate_uri,
             internal=False,
         )
-        for row in response.json()["results"]["bindings"]
+        for predicate_uri in predicate_uris
     ]
 
     return predicates
@@ -299,16 +262,19 @@ def _get_types(uri: str, sparql_endpoint: str) -> list[URI]:
         """
     ).render(uri=uri)
 
-    response = sparql.post(query, sparql_endpoint)
+    rows = sparql.select(query, sparql_endpoint, ttl=cache.ttl("resource"))
+    type_uris = [row["type"].value for row in rows]
+
+    labels = domain.label.get_from_list(type_uris, sparql_endpoint)
+    curies = domain.curie.get_many(type_uris)
 
     types = [
         URI(
-            label=domain.label.get(row["type"]["value"], sparql_endpoint)
-            or domain.curie.get(row["type"]["value"]),
-            value=row["type"]["value"],
+            label=labels.get(type_uri) or curies[type_uri],
+            value=type_uri,
             internal=False,
         )
-        for row in response.json()["results"]["bindings"]
+        for type_uri in type_uris
     ]
 
     return types
@@ -323,18 +289,23 @@ def _exists(uri: str, sparql_endpoint: str) -> bool:
         """
     ).render(uri=uri)
 
-    response = sparql.post(query, sparql_endpoint)
+    response = sparql.post(query, sparql_endpoint, ttl=cache.ttl("resource"))
 
     return response.json()["boolean"]
 
 
 def json_renderer(uri: str, sparql_endpoint: str) -> Resource:
-    if not _exists(uri, sparql_endpoint):
+    # These queries don't depend on each other, so run them concurrently.
+    exists, label, types, predicates = sparql_async.gather(
+        sparql_async.run(_exists, uri, sparql_endpoint),
+        sparql_async.run(domain.label.get, uri, sparql_endpoint),
+        sparql_async.run(_get_types, uri, sparql_endpoint),
+        sparql_async.run(get_predicates, uri, sparql_endpoint),
+    )
+
+    if not exists:
         raise SPARQLNotFoundError(f"Resource with URI {uri} not found.")
 
-    label = domain.label.get(uri, sparql_endpoint)
-    types = _get_types(uri, sparql_endpoint)
-    predicates = get_predicates(uri, sparql_endpoint)
     predicates = list(filter(lambda x: x.value != str(RDF.type), predicates))
 
     profile_uri = ""
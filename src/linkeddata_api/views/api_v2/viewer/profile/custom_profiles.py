@@ -1,7 +1,7 @@
 from jinja2 import Template
 from rdflib import RDFS, SKOS, SDO, DCTERMS
 
-from linkeddata_api.data import sparql
+from linkeddata_api.data import cache, sparql
 from linkeddata_api.domain.namespaces import TERN
 
 from .base_profile import Profile
@@ -107,7 +107,7 @@ class MethodProfile(MethodCollectionProfile):
             """
         ).render(uri=self.resource_uri, metadata_predicate=metadata_predicate)
 
-        response = sparql.post(query, sparql_endpoint)
+        response = sparql.post(query, sparql_endpoint, ttl=cache.ttl("resource"))
 
         count = int(response.json()["results"]["bindings"][0]["count"]["value"])
 
@@ -7,11 +7,13 @@ from linkeddata_api.domain.viewer.resource import (
     SPARQLResultJSONError,
 )
 from linkeddata_api.views.api_v2.blueprint import bp
+from linkeddata_api.views.compression import compress
 
 from .json_renderer import get_predicate_values
 
 
 @bp.get("/viewer/predicate-values")
+@compress
 @openapi.validate(validate_request=False, validate_response=False)
 def get_resource_predicate_values():
 
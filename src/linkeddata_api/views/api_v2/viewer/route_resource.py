@@ -8,11 +8,13 @@ from linkeddata_api.domain.viewer.resource import (
     SPARQLResultJSONError,
 )
 from linkeddata_api.views.api_v2.blueprint import bp
+from linkeddata_api.views.compression import compress
 
 from .json_renderer import json_renderer
 
 
 @bp.get("/viewer/resource")
+@compress
 @openapi.validate(validate_request=False, validate_response=False)
 def get_resource():
     sparql_endpoint = request.args.get("sparql_endpoint")
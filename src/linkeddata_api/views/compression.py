@@ -0,0 +1,97 @@
+import functools
+import gzip
+import hashlib
+
+from flask import make_response, request
+
+from linkeddata_api.data.cache import LRUCache
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+# Compression settings. Configured by `init_app`.
+enabled = True
+min_size = 1024
+gzip_level = 6
+brotli_quality = 4
+# Compressed bodies by content encoding and digest of the uncompressed body,
+# so a body served again, such as a cached resource, is not compressed again.
+_compressed = LRUCache(maxsize=256)
+_compressed_ttl = 3600
+max_item_size = 1024 * 1024
+
+
+def _encodings() -> list[str]:
+    return ["br", "gzip"] if brotli is not None else ["gzip"]
+
+
+def _compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=brotli_quality)
+    # A fixed mtime gives the same bytes for the same body.
+    return gzip.compress(body, compresslevel=gzip_level, mtime=0)
+
+
+def compress_response(response):
+    """Compress the body of a response with an encoding the client accepts.
+
+    Responses that are small, streamed, already encoded or not successful are returned unchanged.
+    """
+    response.vary.add("Accept-Encoding")
+
+    if (
+        not enabled
+        or response.status_code != 200
+        or response.direct_passthrough
+        or response.is_streamed
+        or "Content-Encoding" in response.headers
+    ):
+        return response
+
+    encoding = request.accept_encodings.best_match(_encodings())
+    if encoding is None:
+        return response
+
+    body = response.get_data()
+    if len(body) < min_size:
+        return response
+
+    key = f"{encoding}:{hashlib.sha256(body).hexdigest()}"
+    compressed = _compressed.get(key)
+    if compressed is None:
+        compressed = _compress(body, encoding)
+        if len(compressed) <= max_item_size:
+            _compressed.set(key, compressed, _compressed_ttl)
+
+    response.set_data(compressed)
+    response.headers["Content-Encoding"] = encoding
+    return response
+
+
+def compress(view):
+    """Decorate a view to compress its response, see `compress_response`."""
+
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        return compress_response(make_response(view(*args, **kwargs)))
+
+    return wrapper
+
+
+def stats() -> dict:
+    return _compressed.stats()
+
+
+def init_app(app) -> None:
+    global enabled, min_size, gzip_level, brotli_quality, max_item_size
+
+    enabled = app.config["RESPONSE_COMPRESSION_ENABLED"]
+    min_size = app.config["RESPONSE_COMPRESSION_MIN_SIZE"]
+    gzip_level = app.config["RESPONSE_COMPRESSION_GZIP_LEVEL"]
+    brotli_quality = app.config["RESPONSE_COMPRESSION_BROTLI_QUALITY"]
+    max_item_size = app.config["RESPONSE_COMPRESSION_CACHE_MAX_ITEM_SIZE"]
+    _compressed.maxsize = app.config["RESPONSE_COMPRESSION_CACHE_MAXSIZE"]
+    _compressed.clear()
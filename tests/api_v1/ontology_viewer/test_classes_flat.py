@@ -28,7 +28,7 @@ def test_classes_flat_request_error(
     mocked_response = requests.Response()
     mocked_response.status_code = 400
 
-    mocker.patch("requests.post", return_value=mocked_response)
+    mocker.patch("requests.Session.post", return_value=mocked_response)
 
     response = client.get(url, query_string={"ontology_id": "tern-ontology"})
     assert response.status_code == 502
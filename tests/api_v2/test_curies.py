@@ -0,0 +1,38 @@
+import pytest
+from flask.testing import FlaskClient
+
+
+@pytest.fixture
+def url() -> str:
+    return "/api/v2.0/curies"
+
+
+def test_curies(client: FlaskClient, url: str):
+    response = client.post(
+        url,
+        json=[
+            "http://www.w3.org/2004/02/skos/core#prefLabel",
+            "https://w3id.org/tern/ontologies/tern/Site",
+            "https://unknown.example.com/def/Thing",
+        ],
+    )
+
+    assert response.status_code == 200
+    assert response.json == {
+        "http://www.w3.org/2004/02/skos/core#prefLabel": "skos:prefLabel",
+        "https://w3id.org/tern/ontologies/tern/Site": "tern:Site",
+        "https://unknown.example.com/def/Thing": "https://unknown.example.com/def/Thing",
+    }
+
+
+def test_curies_invalid_body(client: FlaskClient, url: str):
+    response = client.post(url, json={"uris": []})
+    assert response.status_code == 400
+
+
+def test_curies_too_many(app, client: FlaskClient, url: str):
+    app.config["CURIES_MAX_URIS"] = 2
+    uris = [f"https://example.com/{i}" for i in range(3)]
+
+    assert client.post(url, json=uris[:2]).status_code == 200
+    assert client.post(url, json=uris).status_code == 400
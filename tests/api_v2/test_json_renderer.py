@@ -0,0 +1,24 @@
+from flask import Flask
+from pytest_mock import MockerFixture
+
+from linkeddata_api.data.results import Term
+from linkeddata_api.views.api_v2.viewer import json_renderer
+
+
+def test_get_types_labels_in_one_query(app: Flask, mocker: MockerFixture):
+    type_uris = [f"https://example.com/types/{i}" for i in range(3)]
+
+    def select(query, *args, **kwargs):
+        if "?type" in query:
+            return [{"type": Term("uri", type_uri)} for type_uri in type_uris]
+        return [
+            {"uri": Term("uri", type_uris[0]), "label": Term("literal", "1010Type")}
+        ]
+
+    select = mocker.patch("linkeddata_api.data.sparql.select", side_effect=select)
+
+    types = json_renderer._get_types("https://example.com/a", "https://sparql.example.com")
+
+    assert [type_.label for type_ in types] == ["Type", type_uris[1], type_uris[2]]
+    # The types, and the labels of all of them.
+    assert select.call_count == 2
@@ -23,6 +23,8 @@ def app():
             "OIDC_DISCOVERY_URL": "https://auth.example.com/.well-known/openid-configuration",
             "OIDC_CLIENT_ID": "oidc-test",
             "SESSION_TYPE": "null",
+            # Tests that look up curies externally enable it and mock the service.
+            "CURIE_EXTERNAL_LOOKUP": False,
         }
     )
     # setup db
@@ -0,0 +1,25 @@
+import requests
+from flask.testing import FlaskClient
+from pytest_mock import MockerFixture
+
+
+def test_server_timing(client: FlaskClient, mocker: MockerFixture):
+    mocked_response = requests.Response()
+    mocked_response.status_code = 400
+
+    mocker.patch("requests.Session.post", return_value=mocked_response)
+
+    response = client.get(
+        "/api/v1.0/ontology_viewer/classes/flat",
+        query_string={"ontology_id": "tern-ontology"},
+    )
+
+    assert response.status_code == 502
+    assert "sparql;dur=" in response.headers["Server-Timing"]
+    assert 'desc="1 queries"' in response.headers["Server-Timing"]
+
+
+def test_no_server_timing_without_queries(client: FlaskClient):
+    response = client.get("/api/")
+
+    assert "Server-Timing" not in response.headers
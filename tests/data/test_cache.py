@@ -0,0 +1,47 @@
+import time
+
+from linkeddata_api.data import cache
+
+
+def test_key_ignores_whitespace():
+    query = """
+        SELECT ?p ?o
+        WHERE {
+            <https://example.com> ?p ?o .
+        }
+    """
+
+    assert cache.make_key(
+        query, "https://example.com/sparql", "application/sparql-results+json"
+    ) == cache.make_key(
+        "SELECT ?p ?o WHERE { <https://example.com> ?p ?o . }",
+        "https://example.com/sparql",
+        "application/sparql-results+json",
+    )
+
+
+def test_key_differs_by_endpoint_and_accept():
+    query = "DESCRIBE <https://example.com>"
+    key = cache.make_key(query, "https://example.com/sparql", "text/turtle")
+
+    assert key != cache.make_key(query, "https://example.org/sparql", "text/turtle")
+    assert key != cache.make_key(
+        query, "https://example.com/sparql", "application/ld+json"
+    )
+
+
+def test_lru_cache_expires_and_evicts():
+    lru = cache.LRUCache(maxsize=2)
+
+    lru.set("a", 1, ttl=60)
+    lru.set("b", 2, ttl=0.01)
+    time.sleep(0.02)
+
+    assert lru.get("a") == 1
+    assert lru.get("b") is None
+
+    lru.set("c", 3, ttl=60)
+    lru.set("d", 4, ttl=60)
+
+    assert lru.get("a") is None
+    assert lru.stats()["evictions"] == 1
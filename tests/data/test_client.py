@@ -0,0 +1,25 @@
+from linkeddata_api.data.client import SPARQLClient
+
+
+def test_session_reused_per_origin():
+    client = SPARQLClient()
+
+    session = client.session("https://graphdb.tern.org.au/repositories/tern_vocabs_core")
+
+    assert session is client.session(
+        "https://graphdb.tern.org.au/repositories/dawe_vocabs_core"
+    )
+    assert session is not client.session("https://example.com/sparql")
+
+
+def test_least_recently_used_session_evicted():
+    client = SPARQLClient(max_endpoints=2)
+
+    first = client.session("https://a.example.com/sparql")
+    client.session("https://b.example.com/sparql")
+    client.session("https://a.example.com/sparql")
+    client.session("https://c.example.com/sparql")
+
+    assert first is client.session("https://a.example.com/sparql")
+    assert len(client._sessions) == 2
+    assert "https://b.example.com" not in client._sessions
@@ -0,0 +1,30 @@
+import requests
+
+from linkeddata_api.data import dialects
+
+
+def test_guess_from_url():
+    assert dialects.get("https://virtuoso.tern.org.au/sparql").name == "virtuoso"
+    assert (
+        dialects.get("https://graphdb.tern.org.au/repositories/tern_vocabs_core").name
+        == "graphdb"
+    )
+    assert dialects.get("https://example.com/sparql").name == "generic"
+
+
+def test_detect_from_server_header():
+    sparql_endpoint = "https://example.com/dataset/sparql"
+    response = requests.Response()
+    response.headers["Server"] = "Apache Jena Fuseki (4.7.0)"
+
+    dialects.detect(sparql_endpoint, response)
+
+    assert dialects.get(sparql_endpoint).name == "fuseki"
+
+
+def test_virtuoso_query_variants():
+    dialect = dialects.get("https://virtuoso.tern.org.au/sparql")
+
+    assert dialect.query_as_parameter
+    assert not dialect.bind_predicate
+    assert dialect.list_item_number_placeholder == 1
@@ -0,0 +1,49 @@
+from linkeddata_api.data.health import EndpointHealth
+
+
+def test_breaker_opens_after_consecutive_failures():
+    health = EndpointHealth(failure_threshold=3, reset_timeout=60)
+
+    for _ in range(3):
+        assert health.allow_request()
+        health.record_failure()
+
+    assert health.state == EndpointHealth.OPEN
+    assert not health.allow_request()
+    assert health.rejected == 1
+
+
+def test_breaker_half_open_probe():
+    health = EndpointHealth(failure_threshold=1, reset_timeout=0)
+    health.record_failure()
+
+    # Only one probe is let through while half-open.
+    assert health.allow_request()
+    assert health.state == EndpointHealth.HALF_OPEN
+    assert not health.allow_request()
+
+    health.record_success(0.1)
+    assert health.state == EndpointHealth.CLOSED
+    assert health.allow_request()
+
+
+def test_breaker_opens_on_error_rate():
+    health = EndpointHealth(
+        failure_threshold=100, error_rate_threshold=0.5, min_requests=10
+    )
+    for _ in range(5):
+        health.record_success(0.1)
+        health.record_failure()
+
+    assert health.state == EndpointHealth.OPEN
+
+
+def test_read_timeout_from_p99():
+    health = EndpointHealth(min_requests=10)
+    assert health.read_timeout(3, minimum=1, maximum=60) == 60
+
+    for _ in range(100):
+        health.record_success(2)
+
+    assert health.read_timeout(3, minimum=1, maximum=60) == 6
+    assert health.read_timeout(3, minimum=10, maximum=60) == 10
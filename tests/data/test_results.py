@@ -0,0 +1,73 @@
+import io
+import json
+
+import pytest
+
+from linkeddata_api.data.results import (
+    Term,
+    iter_json_rows,
+    iter_rows,
+    iter_tsv_rows,
+)
+
+
+def test_iter_json_rows():
+    result = {
+        "head": {"vars": ["o", "listItem"]},
+        "results": {
+            "bindings": [
+                {
+                    "o": {"type": "uri", "value": "https://example.com/a"},
+                    "listItem": {
+                        "type": "typed-literal",
+                        "datatype": "http://www.w3.org/2001/XMLSchema#boolean",
+                        "value": "false",
+                    },
+                },
+                {"o": {"type": "literal", "xml:lang": "en", "value": "A"}},
+            ]
+        },
+    }
+
+    rows = list(iter_json_rows(io.BytesIO(json.dumps(result).encode())))
+
+    assert rows == [
+        {
+            "o": Term("uri", "https://example.com/a"),
+            "listItem": Term(
+                "literal", "false", "http://www.w3.org/2001/XMLSchema#boolean"
+            ),
+        },
+        {"o": Term("literal", "A", language="en")},
+    ]
+
+
+def test_iter_tsv_rows():
+    result = (
+        "?o\t?listItem\t?label\n"
+        '<https://example.com/a>\t"false"^^<http://www.w3.org/2001/XMLSchema#boolean>\t"A\\tB"@en\n'
+        '_:b0\t\t5\n'
+    )
+
+    rows = list(iter_tsv_rows(io.BytesIO(result.encode())))
+
+    assert rows == [
+        {
+            "o": Term("uri", "https://example.com/a"),
+            "listItem": Term(
+                "literal", "false", "http://www.w3.org/2001/XMLSchema#boolean"
+            ),
+            "label": Term("literal", "A\tB", language="en"),
+        },
+        {
+            "o": Term("bnode", "b0"),
+            "label": Term(
+                "literal", "5", "http://www.w3.org/2001/XMLSchema#integer"
+            ),
+        },
+    ]
+
+
+def test_iter_rows_rejects_unsupported_format():
+    with pytest.raises(ValueError):
+        iter_rows(io.BytesIO(b""), "text/csv")
@@ -0,0 +1,43 @@
+import threading
+import time
+
+import pytest
+
+from linkeddata_api.data.singleflight import Group
+
+
+def test_concurrent_calls_coalesced():
+    group = Group()
+    calls = []
+    results = []
+
+    def query():
+        calls.append(1)
+        time.sleep(0.1)
+        return "result"
+
+    threads = [
+        threading.Thread(target=lambda: results.append(group.do("key", query)))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == ["result"] * 5
+    assert group.coalesced == 4
+    assert group.in_flight() == 0
+
+
+def test_error_raised_and_key_released():
+    group = Group()
+
+    def query():
+        raise ValueError("upstream error")
+
+    with pytest.raises(ValueError):
+        group.do("key", query)
+
+    assert group.do("key", lambda: "result") == "result"
@@ -0,0 +1,73 @@
+import io
+import json
+
+import pytest
+import urllib3
+from flask import Flask
+from pytest_mock import MockerFixture
+
+from linkeddata_api.data import exceptions, health, sparql
+from linkeddata_api.data.client import client
+
+RESULTS = json.dumps(
+    {
+        "head": {"vars": ["uri"]},
+        "results": {
+            "bindings": [{"uri": {"type": "uri", "value": "https://example.com/a"}}]
+        },
+    }
+).encode()
+
+
+class Response:
+    status_code = 200
+
+    def __init__(self, raw) -> None:
+        self.headers = {"content-type": sparql.JSON}
+        self.raw = raw
+
+    def raise_for_status(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+def test_bulk_select_bypasses_health(app: Flask, mocker: MockerFixture):
+    sparql_endpoint = "https://bulk.example.com/sparql"
+    endpoint_health = health.registry.get(sparql_endpoint)
+    for _ in range(endpoint_health.min_requests):
+        endpoint_health.record_success(0.01)
+    for _ in range(endpoint_health.failure_threshold):
+        endpoint_health.record_failure()
+    assert endpoint_health.state == endpoint_health.OPEN
+    requests = endpoint_health.requests
+    post = mocker.patch.object(
+        client, "post", side_effect=lambda *args, **kwargs: Response(io.BytesIO(RESULTS))
+    )
+
+    rows = list(sparql.select("SELECT ?uri {}", sparql_endpoint, bulk=True))
+
+    assert [row["uri"].value for row in rows] == ["https://example.com/a"]
+    # Sent with the full read timeout, despite the open breaker, and not recorded.
+    assert post.call_args.kwargs["timeout"] == (client.connect_timeout, client.read_timeout)
+    assert endpoint_health.state == endpoint_health.OPEN
+    assert endpoint_health.requests == requests
+
+
+class FailingStream(io.BytesIO):
+    def read(self, *args) -> bytes:
+        raise urllib3.exceptions.ReadTimeoutError(None, None, "Read timed out.")
+
+
+def test_select_stream_read_error(app: Flask, mocker: MockerFixture):
+    sparql_endpoint = "https://timeout.example.com/sparql"
+    mocker.patch.object(
+        client, "post", side_effect=lambda *args, **kwargs: Response(FailingStream())
+    )
+
+    with pytest.raises(exceptions.RequestError):
+        list(sparql.select("SELECT ?uri {}", sparql_endpoint))
+
+    endpoint_health = health.registry.get(sparql_endpoint)
+    assert endpoint_health.failures == 1
@@ -0,0 +1,167 @@
+import threading
+
+import requests
+from flask import Flask
+from pytest_mock import MockerFixture
+
+from linkeddata_api.data.cache import LRUCache
+from linkeddata_api.domain import curie, curie_cache
+
+
+def test_get_from_snapshot(app: Flask, mocker: MockerFixture):
+    post = mocker.patch("requests.post")
+
+    assert curie.get("http://www.w3.org/ns/dcat#Dataset") == "dcat:Dataset"
+    assert curie.get("https://unknown.example.com/def/Thing") == (
+        "https://unknown.example.com/def/Thing"
+    )
+    post.assert_not_called()
+
+
+def test_refresh_prefixes(app: Flask, mocker: MockerFixture, tmp_path):
+    response = mocker.Mock()
+    response.json.return_value = {
+        "dcat": "http://www.w3.org/ns/dcat#",
+        "dcat2": "http://www.w3.org/ns/dcat#",
+        "ex": "http://example.org/",
+        "bad": "urn:example:",
+    }
+    mocker.patch("requests.get", return_value=response)
+    output = tmp_path / "prefixes.tsv"
+
+    result = app.test_cli_runner().invoke(
+        args=["curie", "refresh-prefixes", "--output", str(output)]
+    )
+
+    assert result.exit_code == 0
+    assert curie.read_snapshot(output) == {"http://www.w3.org/ns/dcat#": "dcat"}
+
+
+def test_get_fetches_in_background(app: Flask, mocker: MockerFixture):
+    mocker.patch.object(curie, "external_lookup", True)
+    fetched = threading.Event()
+    response = mocker.Mock()
+    response.json.return_value = {"value": "ex:"}
+
+    def post(*args, **kwargs):
+        fetched.wait(5)
+        return response
+
+    post = mocker.patch("requests.post", side_effect=post)
+
+    # Both are returned as-is while their namespace is fetched once.
+    assert curie.get("https://example.com/def/a") == "https://example.com/def/a"
+    assert curie.get("https://example.com/def/b") == "https://example.com/def/b"
+    fetched.set()
+    curie._executor.shutdown(wait=True)
+    curie._executor = None
+
+    post.assert_called_once()
+    assert curie.get("https://example.com/def/c") == "ex:c"
+    assert curie.fetched.stats()["hits"] == 1
+
+
+def test_fetched_prefixes_are_bounded_and_persisted(tmp_path):
+    fetched = curie_cache.FetchedPrefixes(maxsize=2)
+    not_found = LRUCache()
+    fetched.add("https://example.com/a/", "a")
+    fetched.add("https://example.com/b/", "b")
+    fetched.add("https://example.com/c/", "c")
+    not_found.set("https://example.com/d/", True, 60)
+
+    assert fetched.longest_match("https://example.com/a/x") is None
+    assert fetched.longest_match("https://example.com/c/x") == (
+        "https://example.com/c/",
+        "c",
+    )
+
+    path = tmp_path / "curies.json"
+    curie_cache.save(path, fetched, not_found)
+    loaded, loaded_not_found = curie_cache.FetchedPrefixes(), LRUCache()
+    curie_cache.load(path, loaded, loaded_not_found)
+
+    assert sorted(namespace for namespace, _, _ in loaded.items()) == [
+        "https://example.com/b/",
+        "https://example.com/c/",
+    ]
+    assert loaded_not_found.get("https://example.com/d/") is True
+
+
+def test_get_many_fetches_each_namespace_once(app: Flask, mocker: MockerFixture):
+    mocker.patch.object(curie, "external_lookup", True)
+    mocker.patch.object(curie, "blocking", True)
+    response = mocker.Mock()
+    response.json.return_value = {"value": "many:"}
+    post = mocker.patch("requests.post", return_value=response)
+
+    with app.app_context():
+        curies = curie.get_many(
+            [
+                "https://many.example.com/a/x",
+                "https://many.example.com/a/y",
+                "https://many.example.com/b/z",
+                "http://www.w3.org/2004/02/skos/core#Concept",
+            ]
+        )
+
+    assert post.call_count == 2
+    assert curies == {
+        "https://many.example.com/a/x": "many:x",
+        "https://many.example.com/a/y": "many:y",
+        "https://many.example.com/b/z": "many:z",
+        "http://www.w3.org/2004/02/skos/core#Concept": "skos:Concept",
+    }
+
+
+def test_fetch_errors_not_cached(app: Flask, mocker: MockerFixture):
+    mocker.patch.object(curie, "external_lookup", True)
+    mocker.patch.object(curie, "blocking", True)
+    response = mocker.Mock()
+    response.status_code = 429
+    response.raise_for_status.side_effect = requests.exceptions.HTTPError("429")
+    post = mocker.patch("requests.post", return_value=response)
+
+    uri = "https://rate-limited.example.com/def/a"
+    assert curie.get(uri) == uri
+    assert curie.not_found.get("https://rate-limited.example.com/def/") is None
+
+    # Retried, and namespaces the service doesn't have are remembered.
+    response.status_code = 404
+    response.raise_for_status.side_effect = requests.exceptions.HTTPError("404")
+    assert curie.get(uri) == uri
+    assert curie.not_found.get("https://rate-limited.example.com/def/") is True
+    assert curie.get(uri) == uri
+    assert post.call_count == 2
+
+
+def test_fetched_prefixes_skip_expired_namespaces():
+    fetched = curie_cache.FetchedPrefixes()
+    fetched.add("https://example.com/", "ex")
+    fetched.add("https://example.com/def/", "def", ttl=-1)
+
+    assert fetched.longest_match("https://example.com/def/a") == (
+        "https://example.com/",
+        "ex",
+    )
+    assert len(fetched) == 1
+
+
+def test_saves_are_batched(app: Flask, mocker: MockerFixture, tmp_path):
+    path = tmp_path / "curies.json"
+    mocker.patch.object(curie, "cache_path", path)
+    mocker.patch.object(curie, "save_interval", 60)
+    save = mocker.spy(curie_cache, "save")
+
+    curie.fetched.add("https://example.com/a/", "a")
+    curie._save()
+    curie._set_not_found("https://example.com/b/")
+    assert not path.exists()
+
+    curie.flush()
+    curie.flush()
+
+    save.assert_called_once()
+    loaded, loaded_not_found = curie_cache.FetchedPrefixes(), LRUCache()
+    curie_cache.load(path, loaded, loaded_not_found)
+    assert loaded.longest_match("https://example.com/a/x") == ("https://example.com/a/", "a")
+    assert loaded_not_found.get("https://example.com/b/") is True
@@ -0,0 +1,70 @@
+from flask import Flask
+from pytest_mock import MockerFixture
+
+from linkeddata_api.data.results import Term
+from linkeddata_api.domain.viewer.resource.json.profiles.custom_profiles import (
+    MethodProfile,
+)
+
+TERN = "https://w3id.org/tern/ontologies/tern/"
+
+
+def _select(query: str, sparql_endpoint: str, ttl: int = 0):
+    if "urn:property:protocolModule" in query:
+        return [
+            {
+                "p": Term("uri", f"{TERN}{predicate}"),
+                "o": Term("uri", f"https://example.com/{value}"),
+                "listItem": Term("literal", "false"),
+                "listItemNumber": Term("literal", "0"),
+            }
+            for predicate, value in [
+                ("hasCategoricalValuesCollection", "collection"),
+                ("hasFeatureType", "plant-occurrence"),
+                ("hasObservableProperty", "height"),
+                ("hasObservableProperty", "cover"),
+            ]
+        ]
+    # Labels and internal flags of the values.
+    return [
+        {
+            "uri": Term("uri", f"https://example.com/{value}"),
+            "label": Term("literal", f"1010{value}"),
+            "internal": Term("literal", "true"),
+        }
+        for value in ["collection", "plant-occurrence", "height", "cover"]
+    ]
+
+
+def test_method_additional_values(app: Flask, mocker: MockerFixture):
+    # An endpoint without label snapshots or an existence index, which query in the background.
+    mocker.patch.object(MethodProfile, "sparql_endpoint", "https://sparql.example.com")
+    select = mocker.patch("linkeddata_api.data.sparql.select", side_effect=_select)
+
+    properties = MethodProfile(
+        "https://example.com/method", []
+    ).get_additional_values()
+
+    assert [property_.predicate.value for property_ in properties] == [
+        f"{TERN}hasObservableProperty",
+        f"{TERN}hasFeatureType",
+        f"{TERN}hasCategoricalValuesCollection",
+    ]
+    assert sorted(object_.label for object_ in properties[0].objects) == [
+        "cover",
+        "height",
+    ]
+    # One query for the values of all predicates, and one to resolve them.
+    assert select.call_count == 2
+    # Cached once, as properties, rather than also as SPARQL results.
+    assert not select.call_args_list[0].kwargs.get("ttl")
+
+    # Cached per method.
+    cached = MethodProfile("https://example.com/method", []).get_additional_values()
+    assert cached == properties
+    assert select.call_count == 2
+
+    # Not shared with the same method in another SPARQL endpoint.
+    mocker.patch.object(MethodProfile, "sparql_endpoint", "https://other.example.com")
+    MethodProfile("https://example.com/method", []).get_additional_values()
+    assert select.call_args_list[2].kwargs["sparql_endpoint"] == "https://other.example.com"
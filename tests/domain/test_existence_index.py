@@ -0,0 +1,113 @@
+from flask import Flask
+from pytest_mock import MockerFixture
+from rdflib import Graph, URIRef
+from rdflib.namespace import RDF, SKOS
+
+from linkeddata_api.data.results import Term
+from linkeddata_api.domain import internal_resource
+from linkeddata_api.domain.existence_index import BloomFilter, ExistenceIndex
+from linkeddata_api.domain.viewer.resource import json
+
+
+def test_bloom_filter():
+    bloom_filter = BloomFilter(1000, error_rate=0.01)
+    for i in range(1000):
+        bloom_filter.add(f"https://example.com/{i}")
+
+    assert all(f"https://example.com/{i}" in bloom_filter for i in range(1000))
+    false_positives = sum(
+        f"https://example.com/other/{i}" in bloom_filter for i in range(10000)
+    )
+    assert false_positives < 300
+    assert 0.005 < bloom_filter.false_positive_rate() < 0.02
+
+
+def test_build_reads_all_pages():
+    pages = []
+
+    def fetch_page(sparql_endpoint, limit, offset):
+        pages.append(offset)
+        return [f"https://example.com/{i}" for i in range(offset, min(offset + limit, 25))]
+
+    index = ExistenceIndex("https://sparql.example.com", fetch_page, page_size=10)
+    index.build()
+
+    assert pages == [0, 10, 20]
+    assert index.loaded
+    assert index.stats()["size"] == 25
+    assert all(f"https://example.com/{i}" in index for i in range(25))
+
+
+def test_get_from_list_queries_positives(app: Flask, mocker: MockerFixture):
+    index = ExistenceIndex(
+        "https://sparql.example.com",
+        lambda *args: ["https://example.com/a", "https://example.com/b"],
+    )
+    index.build()
+    mocker.patch.object(index, "start")
+    mocker.patch.object(internal_resource, "indexes", {index.sparql_endpoint: index})
+
+    def select(query, *args, **kwargs):
+        # b is no longer in the repository.
+        return [
+            {"uri": Term("uri", uri), "internal": Term("literal", str(uri.endswith("a")).lower())}
+            for uri in ["https://example.com/a", "https://example.com/b"]
+            if f"<{uri}>" in query
+        ]
+
+    select = mocker.patch("linkeddata_api.data.sparql.select", side_effect=select)
+
+    assert internal_resource.get_from_list(
+        ["https://example.com/a", "https://example.com/b", "https://example.com/c"],
+        index.sparql_endpoint,
+        use_index=True,
+    ) == {
+        "https://example.com/a": True,
+        "https://example.com/b": False,
+        "https://example.com/c": False,
+    }
+    select.assert_called_once()
+    assert "<https://example.com/c>" not in select.call_args.args[0]
+    assert index.stats()["observed_false_positive_rate"] == 0.5
+
+
+def test_resource_added_after_build(app: Flask, mocker: MockerFixture):
+    index = ExistenceIndex(
+        "https://sparql.example.com", lambda *args: ["https://example.com/a"]
+    )
+    index.build()
+    mocker.patch.object(index, "start")
+    mocker.patch.object(internal_resource, "indexes", {index.sparql_endpoint: index})
+
+    def select(query, *args, **kwargs):
+        # Statements of the resource, which is not in the index yet.
+        if "<https://example.com/new> ?p ?o" in query:
+            return [
+                {
+                    "p": Term("uri", str(RDF.type)),
+                    "o": Term("uri", str(SKOS.Concept)),
+                    "listItem": Term("literal", "false"),
+                    "listItemNumber": Term("literal", "0"),
+                }
+            ]
+        return []
+
+    mocker.patch("linkeddata_api.data.sparql.select", side_effect=select)
+
+    resource = json.get("https://example.com/new", index.sparql_endpoint)
+
+    assert resource.uri == "https://example.com/new"
+    assert [type_.value for type_ in resource.types] == [str(SKOS.Concept)]
+
+
+def test_subjects_query_pages():
+    graph = Graph()
+    for i in range(25):
+        graph.add((URIRef(f"https://example.com/{i}"), RDF.type, SKOS.Concept))
+
+    subjects = []
+    for offset in range(0, 25, 10):
+        query = internal_resource._subjects_query(10, offset)
+        subjects += [str(row.uri) for row in graph.query(query)]
+
+    assert sorted(subjects) == sorted(f"https://example.com/{i}" for i in range(25))
@@ -0,0 +1,176 @@
+from flask import Flask
+from pytest_mock import MockerFixture
+from rdflib import Graph, Literal, URIRef
+from rdflib.namespace import DCTERMS, RDFS, SKOS, XSD
+
+from linkeddata_api.data.results import Term
+from linkeddata_api.domain import label
+from linkeddata_api.domain.label_snapshot import LabelSnapshot
+
+
+def _rows(labels: dict[str, str]) -> list[dict[str, Term]]:
+    return [
+        # Labels ranked by the query start with their property and language ranks.
+        {"uri": Term("uri", uri), "label": Term("literal", f"1010{value}")}
+        for uri, value in labels.items()
+    ]
+
+
+def test_get_from_list_queries_misses(app: Flask, mocker: MockerFixture):
+    select = mocker.patch(
+        "linkeddata_api.data.sparql.select",
+        side_effect=[
+            _rows({"https://example.com/a": "A"}),
+            _rows({"https://example.com/c": "C"}),
+        ],
+    )
+
+    assert label.get_from_list(
+        ["https://example.com/a", "https://example.com/b"], "https://sparql.example.com"
+    ) == {"https://example.com/a": "A"}
+    # a is cached and b is cached as having no label, so only c is queried.
+    assert label.get_from_list(
+        ["https://example.com/a", "https://example.com/b", "https://example.com/c"],
+        "https://sparql.example.com",
+    ) == {"https://example.com/a": "A", "https://example.com/c": "C"}
+    assert label.get("https://example.com/b", "https://sparql.example.com") is None
+
+    assert select.call_count == 2
+    query = select.call_args.args[0]
+    assert "<https://example.com/c>" in query
+    assert "<https://example.com/a>" not in query
+
+
+def test_get_from_list_cached_per_endpoint(app: Flask, mocker: MockerFixture):
+    select = mocker.patch(
+        "linkeddata_api.data.sparql.select",
+        return_value=_rows({"https://example.com/a": "A"}),
+    )
+
+    label.get_from_list(["https://example.com/a"], "https://one.example.com")
+    label.get_from_list(["https://example.com/a"], "https://two.example.com")
+
+    assert select.call_count == 2
+
+
+def test_get_from_list_in_chunks(app: Flask, mocker: MockerFixture):
+    mocker.patch("linkeddata_api.data.sparql_async.chunk_size", 2)
+    uris = [f"https://example.com/{i}" for i in range(5)]
+
+    def select(query, *args, **kwargs):
+        return _rows({uri: uri[-1] for uri in uris if f"<{uri}>" in query})
+
+    select = mocker.patch("linkeddata_api.data.sparql.select", side_effect=select)
+
+    assert label.get_from_list(uris, "https://sparql.example.com") == {
+        uri: uri[-1] for uri in uris
+    }
+    assert select.call_count == 3
+
+
+def test_get_from_list_routes_to_repositories(app: Flask, mocker: MockerFixture):
+    mocker.patch.object(
+        label,
+        "repositories",
+        label.PrefixTrie({"https://vocab.example.com/": "https://vocab-sparql.example.com"}),
+    )
+
+    def select(query, sparql_endpoint, **kwargs):
+        if sparql_endpoint == "https://vocab-sparql.example.com":
+            return _rows({"https://vocab.example.com/a": "Vocab A"})
+        return _rows({"https://example.com/a": "A"})
+
+    select = mocker.patch("linkeddata_api.data.sparql.select", side_effect=select)
+
+    assert label.get_from_list(
+        ["https://example.com/a", "https://vocab.example.com/a"],
+        "https://sparql.example.com",
+    ) == {"https://example.com/a": "A", "https://vocab.example.com/a": "Vocab A"}
+    assert select.call_count == 2
+    assert "SERVICE" not in select.call_args.args[0]
+
+
+def test_get_from_list_ranks_labels():
+    graph = Graph()
+    concept = URIRef("https://example.com/concept")
+    graph.add((concept, RDFS.label, Literal("Label")))
+    graph.add((concept, SKOS.prefLabel, Literal("Concept", lang="fr")))
+    graph.add((concept, SKOS.prefLabel, Literal("Concept (no language)")))
+    graph.add((concept, SKOS.prefLabel, Literal("Concept B", lang="en")))
+    graph.add((concept, SKOS.prefLabel, Literal("Concept A", lang="en")))
+    other = URIRef("https://example.com/other")
+    graph.add((other, DCTERMS.identifier, Literal("other")))
+
+    def labels(languages):
+        query = label.get_from_list_query([str(concept), str(other)], languages)
+        return {str(row.uri): label.parse_label(str(row.label)) for row in graph.query(query)}
+
+    assert labels(["en"]) == {str(concept): "Concept A", str(other): "other"}
+    assert labels(["fr", "en"])[str(concept)] == "Concept"
+    assert labels(["de"])[str(concept)] == "Concept (no language)"
+
+
+def test_snapshot_query():
+    graph = Graph()
+    old = URIRef("https://example.com/old")
+    graph.add((old, SKOS.prefLabel, Literal("Old", lang="en")))
+    graph.add((old, DCTERMS.modified, Literal("2020-01-01", datatype=XSD.date)))
+    new = URIRef("https://example.com/new")
+    graph.add((new, SKOS.prefLabel, Literal("New", lang="en")))
+    graph.add((new, DCTERMS.modified, Literal("2024-01-01", datatype=XSD.date)))
+    unmodified = URIRef("https://example.com/unmodified")
+    graph.add((unmodified, RDFS.label, Literal("Unmodified")))
+
+    def labels(modified_since):
+        rows = graph.query(label._snapshot_query(["en"], modified_since))
+        return {
+            str(row.uri): (label.parse_label(str(row.label)), row.lastModified and str(row.lastModified))
+            for row in rows
+        }
+
+    assert labels(None) == {
+        str(old): ("Old", "2020-01-01"),
+        str(new): ("New", "2024-01-01"),
+        str(unmodified): ("Unmodified", None),
+    }
+    assert labels("2020-01-01") == {str(new): ("New", "2024-01-01")}
+
+
+def test_get_from_list_uses_snapshot(app: Flask, mocker: MockerFixture):
+    fetches = []
+
+    def fetch(sparql_endpoint, modified_since):
+        fetches.append(modified_since)
+        if modified_since is None:
+            return {"https://example.com/a": "A"}, "2020-01-01"
+        return {"https://example.com/b": "B"}, "2024-01-01"
+
+    snapshot = LabelSnapshot("https://vocab-sparql.example.com", fetch)
+    mocker.patch.object(snapshot, "start")
+    mocker.patch.object(label, "snapshots", {snapshot.sparql_endpoint: snapshot})
+    select = mocker.patch(
+        "linkeddata_api.data.sparql.select",
+        return_value=_rows({"https://example.com/b": "B from query"}),
+    )
+
+    # Queried until the snapshot is loaded.
+    uris = ["https://example.com/a", "https://example.com/b"]
+    assert label.get_from_list(uris, snapshot.sparql_endpoint) == {
+        "https://example.com/b": "B from query"
+    }
+    assert select.call_count == 1
+
+    snapshot.refresh()
+    snapshot.refresh()
+    label._cache.clear()
+
+    assert fetches == [None, "2020-01-01"]
+    assert snapshot.modified == "2024-01-01"
+    assert snapshot.stats()["memory_bytes"] > 0
+    assert label.get_from_list(uris, snapshot.sparql_endpoint) == {
+        "https://example.com/a": "A",
+        "https://example.com/b": "B",
+    }
+    # Other languages are not in the snapshot.
+    label.get_from_list(uris, snapshot.sparql_endpoint, ["fr"])
+    assert select.call_count == 2
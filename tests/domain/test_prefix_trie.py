@@ -0,0 +1,33 @@
+from linkeddata_api.domain.prefix_trie import PrefixTrie
+
+
+def test_longest_match():
+    trie = PrefixTrie(
+        {
+            "https://example.com/": "ex",
+            "https://example.com/def/": "exdef",
+        }
+    )
+
+    assert trie.longest_match("https://example.com/def/a") == (
+        "https://example.com/def/",
+        "exdef",
+    )
+    assert trie.longest_match("https://example.com/a") == ("https://example.com/", "ex")
+    assert trie.longest_match("https://example.org/a") is None
+
+
+def test_add_does_not_change_a_trie_being_read():
+    trie = PrefixTrie({"https://example.com/": "ex"})
+    root = trie._root
+
+    trie.add("https://example.com/def/", "exdef")
+    trie.add("https://example.com/", "example")
+
+    assert root["h"] is not trie._root["h"]
+    assert len(trie) == 2
+    assert trie.get("https://example.com/") == "example"
+    assert sorted(trie.items()) == [
+        ("https://example.com/", "example"),
+        ("https://example.com/def/", "exdef"),
+    ]
@@ -0,0 +1,90 @@
+import threading
+
+import pytest
+from flask import Flask
+from pytest_mock import MockerFixture
+from rdflib import BNode, Graph, Literal, URIRef
+from rdflib.collection import Collection
+from rdflib.namespace import RDF, SKOS
+
+from linkeddata_api.data.exceptions import SPARQLNotFoundError
+from linkeddata_api.data.results import Term
+from linkeddata_api.domain.viewer.resource import json as resource_json
+
+EX = "https://example.com/"
+
+
+def _term(node) -> Term:
+    if isinstance(node, URIRef):
+        return Term("uri", str(node))
+    if isinstance(node, BNode):
+        return Term("bnode", str(node))
+    return Term(
+        "literal",
+        str(node),
+        str(node.datatype) if node.datatype else None,
+        node.language,
+    )
+
+
+def _select(graph: Graph, queries: list[str]):
+    # rdflib's query parser is not thread safe, and lookups run concurrently.
+    lock = threading.Lock()
+
+    def select(query, *args, **kwargs):
+        with lock:
+            queries.append(query)
+            result = graph.query(query)
+            return [
+                {str(var): _term(row[var]) for var in result.vars if row[var] is not None}
+                for row in result
+            ]
+
+    return select
+
+
+def test_get_resource_with_lists(app: Flask, mocker: MockerFixture):
+    graph = Graph()
+    resource = URIRef(EX + "resource")
+    graph.add((resource, RDF.type, SKOS.Concept))
+    graph.add((resource, SKOS.prefLabel, Literal("Resource")))
+    for name in ["members", "steps"]:
+        items = [URIRef(f"{EX}{name}/{i}") for i in range(3)]
+        for item in items:
+            graph.add((item, SKOS.prefLabel, Literal(str(item)[-1])))
+        head = BNode()
+        Collection(graph, head, items)
+        graph.add((resource, URIRef(EX + name), head))
+
+    queries = []
+    mocker.patch("linkeddata_api.data.sparql.select", side_effect=_select(graph, queries))
+
+    with app.test_request_context():
+        result = resource_json.get(str(resource), "https://sparql.example.com")
+
+    for name in ["members", "steps"]:
+        objects = next(
+            p.objects for p in result.properties if p.predicate.value == EX + name
+        )
+        # Numbered by their position in their own list.
+        assert [(o.label, o.internal, o.list_item_number) for o in objects] == [
+            ("0", True, 0),
+            ("1", True, 1),
+            ("2", True, 2),
+        ]
+    # The statements, the resource's label, the cells of all lists, and the labels
+    # and internal flags of all linked URIs together.
+    assert len(queries) == 4
+
+
+def test_get_missing_resource(app: Flask, mocker: MockerFixture):
+    queries = []
+    mocker.patch(
+        "linkeddata_api.data.sparql.select", side_effect=_select(Graph(), queries)
+    )
+
+    with app.test_request_context(), pytest.raises(SPARQLNotFoundError):
+        resource_json.get(EX + "missing", "https://sparql.example.com")
+
+    # The statements and the label of the resource, and nothing is resolved.
+    assert len(queries) == 2
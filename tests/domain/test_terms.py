@@ -0,0 +1,70 @@
+from flask import Flask
+from pytest_mock import MockerFixture
+from rdflib import Graph, Literal, URIRef
+from rdflib.namespace import RDF, SKOS
+
+from linkeddata_api.data.results import Term
+from linkeddata_api.domain import label, terms
+
+
+def test_resolve_query():
+    graph = Graph()
+    concept = URIRef("https://example.com/concept")
+    graph.add((concept, RDF.type, SKOS.Concept))
+    graph.add((concept, SKOS.prefLabel, Literal("Concept", lang="en")))
+    unlabelled = URIRef("https://example.com/unlabelled")
+    graph.add((unlabelled, RDF.type, SKOS.Concept))
+    external = "https://example.com/external"
+
+    query = label.get_from_list_query(
+        [str(concept), str(unlabelled), external], ["en"], exists=True
+    )
+    rows = {
+        str(row.uri): (
+            row.label and label.parse_label(str(row.label)),
+            row.internal.toPython(),
+        )
+        for row in graph.query(query)
+    }
+
+    assert rows == {
+        str(concept): ("Concept", True),
+        str(unlabelled): (None, True),
+        external: (None, False),
+    }
+
+
+def test_resolve_in_one_query(app: Flask, mocker: MockerFixture):
+    select = mocker.patch(
+        "linkeddata_api.data.sparql.select",
+        return_value=[
+            {
+                "uri": Term("uri", "https://example.com/a"),
+                "label": Term("literal", "1010A"),
+                "internal": Term("literal", "true"),
+            },
+            {
+                "uri": Term("uri", "https://example.com/b"),
+                "internal": Term("literal", "false"),
+            },
+        ],
+    )
+
+    resolution = terms.resolve(
+        ["https://example.com/a", "https://example.com/b"],
+        "https://sparql.example.com",
+        curie_uris=["http://www.w3.org/2004/02/skos/core#Concept"],
+    )
+
+    assert resolution.labels == {"https://example.com/a": "A"}
+    assert resolution.internal == {
+        "https://example.com/a": True,
+        "https://example.com/b": False,
+    }
+    assert resolution.curies == {
+        "http://www.w3.org/2004/02/skos/core#Concept": "skos:Concept"
+    }
+    select.assert_called_once()
+    # The labels are cached, including b having none.
+    assert label.get("https://example.com/b", "https://sparql.example.com") is None
+    select.assert_called_once()
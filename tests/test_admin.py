@@ -0,0 +1,28 @@
+import base64
+
+
+def test_metrics_requires_user(client):
+    response = client.get("/api/admin/metrics")
+    assert response.status_code == 403
+
+
+def test_metrics(client):
+    response = client.get(
+        "/api/admin/metrics",
+        headers={
+            "Authorization": "Basic {}".format(
+                base64.b64encode(b"user:user").decode("ascii")
+            )
+        },
+    )
+    assert response.status_code == 200
+    assert set(response.json) == {
+        "sparql_endpoints",
+        "sparql_cache",
+        "sparql_singleflight",
+        "response_compression",
+        "curie",
+        "labels",
+        "existence_index",
+        "profiles",
+    }
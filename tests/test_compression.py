@@ -0,0 +1,44 @@
+import gzip
+
+TURTLE = "\n".join(
+    f'<https://example.com/{i}> <http://www.w3.org/2000/01/rdf-schema#label> "Label {i}" .'
+    for i in range(100)
+)
+
+
+def convert(client, data, accept_encoding):
+    return client.post(
+        "/api/v2.0/rdf_tools/convert",
+        data=data,
+        headers={
+            "content-type": "text/turtle",
+            "accept": "application/n-triples",
+            "accept-encoding": accept_encoding,
+        },
+    )
+
+
+def test_response_is_compressed(client):
+    response = convert(client, TURTLE, "gzip")
+
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+
+    uncompressed = convert(client, TURTLE, "identity")
+    assert "Content-Encoding" not in uncompressed.headers
+    assert gzip.decompress(response.data) == uncompressed.data
+
+    # Served again from the compressed body cache.
+    assert convert(client, TURTLE, "gzip").data == response.data
+
+
+def test_small_response_is_not_compressed(client):
+    response = convert(
+        client,
+        '<https://example.com/a> <http://www.w3.org/2000/01/rdf-schema#label> "A" .',
+        "gzip",
+    )
+
+    assert response.status_code == 200
+    assert "Content-Encoding" not in response.headers